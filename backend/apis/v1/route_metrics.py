@@ -0,0 +1,21 @@
+import secrets
+
+from fastapi import APIRouter, Request, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from backend.core.config import settings
+from backend.core.metrics import metrics_payload
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    # Like the health check this must not touch the database.
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(
+            request.headers.get("Authorization", ""), expected
+        ):
+            return Response(status_code=status.HTTP_403_FORBIDDEN)
+    return Response(metrics_payload(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,249 @@
+"""
+Endpoint benchmark: seeds a database at several scale factors, drives the
+real web app through TestClient and records latency percentiles and SQL
+statement counts per endpoint.
+
+    python -m backend.benchmarks.endpoints --scales 1,2,4 --output bench.json
+    python -m backend.benchmarks.endpoints --database-url postgresql://... \
+        --compare bench.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+import warnings
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.config import STATIC_DIR
+from backend.core.security import create_access_token
+from backend.db.base import Base
+from backend.db.models.player_request_status import PlayerRequestStatusEnum
+from backend.db.models.team_role import TeamRoleEnum
+from backend.db.session import get_db
+from backend.benchmarks.seed import SeedResult, SeedScale, seed_database
+from backend.webapps.base import api_router
+
+# name -> URL template filled from SeedResult
+ENDPOINTS = {
+    "get_game_table": "/game/{running_game_id}/table",
+    "team_view": "/team/{team_id}",
+    "team_stats": "/team/{team_id}/stats",
+    "player_stats_advanced": "/team/{team_id}/player/{player_id}/advanced",
+    "team_games_history": "/team/{team_id}/games",
+    "game_predictions": "/game/{running_game_id}/predictions",
+}
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class StatementCounter:
+    """Counts SQL statements executed on an engine."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def create_benchmark_engine(database_url: str):
+    if database_url.startswith("sqlite"):
+        return create_engine(database_url, connect_args={"check_same_thread": False})
+    return create_engine(database_url)
+
+
+def reset_schema(engine):
+    with warnings.catch_warnings():
+        # team <-> chip_structure foreign keys form a cycle SQLite can't sort
+        warnings.simplefilter("ignore", SAWarning)
+        Base.metadata.drop_all(bind=engine)
+    if engine.dialect.name == "postgresql":
+        PlayerRequestStatusEnum.create(bind=engine, checkfirst=True)
+        TeamRoleEnum.create(bind=engine, checkfirst=True)
+    Base.metadata.create_all(bind=engine)
+
+
+def build_app(session_factory) -> FastAPI:
+    app = FastAPI()
+    app.include_router(api_router)
+    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+    def _get_benchmark_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_benchmark_db
+    return app
+
+
+def measure_endpoint(
+    client: TestClient, counter: StatementCounter, url: str, warmup: int, iterations: int
+) -> Dict:
+    for _ in range(warmup):
+        client.get(url)
+
+    latencies_ms = []
+    statements = []
+    statuses = set()
+    for _ in range(iterations):
+        counter.count = 0
+        start = time.perf_counter()
+        response = client.get(url)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+        statements.append(counter.count)
+        statuses.add(response.status_code)
+
+    latencies = np.array(latencies_ms)
+    result = {
+        "url": url,
+        "iterations": iterations,
+        "status_codes": sorted(statuses),
+        "mean_ms": float(latencies.mean()),
+        "sql_statements": int(np.median(statements)),
+        "sql_statements_max": int(max(statements)),
+    }
+    for p in PERCENTILES:
+        result[f"p{p}_ms"] = float(np.percentile(latencies, p))
+    return result
+
+
+def run_scale(database_url: str, scale: SeedScale, args) -> Dict:
+    engine = create_benchmark_engine(database_url)
+    reset_schema(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    seed_start = time.perf_counter()
+    with session_factory() as db:
+        seeded: SeedResult = seed_database(db, scale, seed=args.seed)
+    seed_seconds = time.perf_counter() - seed_start
+
+    counter = StatementCounter(engine)
+    client = TestClient(build_app(session_factory))
+    token = create_access_token(data={"sub": seeded.user_email})
+    client.cookies.set("access_token", f"Bearer {token}")
+
+    endpoints = {}
+    for name, template in ENDPOINTS.items():
+        if args.endpoints and name not in args.endpoints:
+            continue
+        url = template.format(**asdict(seeded))
+        endpoints[name] = measure_endpoint(
+            client, counter, url, args.warmup, args.iterations
+        )
+        print(
+            f"  {name:<24} p50={endpoints[name]['p50_ms']:8.1f}ms "
+            f"p95={endpoints[name]['p95_ms']:8.1f}ms "
+            f"sql={endpoints[name]['sql_statements']}"
+        )
+
+    engine.dispose()
+    return {"scale": asdict(scale), "seed_seconds": seed_seconds, "endpoints": endpoints}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: Dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    old_runs = {run["factor"]: run for run in baseline["runs"]}
+    print(f"\nComparison against {baseline_path} ({baseline['meta']['revision']}):")
+    for run in results["runs"]:
+        old_run = old_runs.get(run["factor"])
+        if not old_run:
+            continue
+        for name, new in run["endpoints"].items():
+            old = old_run["endpoints"].get(name)
+            if not old:
+                continue
+            ratio = new["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+            print(
+                f"  x{run['factor']} {name:<24} p50 {old['p50_ms']:8.1f} -> "
+                f"{new['p50_ms']:8.1f}ms ({ratio:4.2f}x)  "
+                f"sql {old['sql_statements']} -> {new['sql_statements']}"
+            )
+
+
+def main(argv: List[str] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark web endpoints.")
+    parser.add_argument(
+        "--database-url",
+        help="Database to seed (default: a temporary SQLite file). "
+        "All tables in it are dropped!",
+    )
+    parser.add_argument("--scales", default="1,2,4", help="Comma separated scale factors")
+    parser.add_argument("--teams", type=int, default=1)
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--games-per-year", type=int, default=50)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--endpoints", type=lambda v: v.split(","), help="Only run these endpoints"
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    base_scale = SeedScale(args.teams, args.players, args.games_per_year, args.years)
+    tmp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        tmp_dir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(tmp_dir.name, 'benchmark.db')}"
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "database": database_url.split(":", 1)[0],
+            "iterations": args.iterations,
+            "seed": args.seed,
+        },
+        "runs": [],
+    }
+    for factor in [int(f) for f in args.scales.split(",")]:
+        scale = base_scale.scaled(factor)
+        print(f"Scale x{factor}: {scale}")
+        run = run_scale(database_url, scale, args)
+        run["factor"] = factor
+        results["runs"].append(run)
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return results
+
+
+if __name__ == "__main__":
+    main()
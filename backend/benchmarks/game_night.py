@@ -0,0 +1,389 @@
+"""
+Game-night load test: replays a busy evening against a running server.
+
+Every table is a running game with 8-12 seated players. Each player polls
+the game table and keeps the homepage long-poll open, sends the odd add-on
+request and cashes out with chip counts towards the end; the host adds
+buy-ins, approves requests found on the table and finishes the game.
+
+    python -m backend.benchmarks.game_night --base-url http://localhost:8000 \
+        --tables 20 --duration 300 --output night.json
+
+The tables are created in the server's database first (see --database-url),
+so the script must be able to reach it as well.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+from sqlalchemy import create_engine, select
+
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.game import Game
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.user import User
+from backend.db.models.user_game import UserGame
+from backend.db.models.user_team import UserTeam
+from backend.scripts.generate_synthetic_data import (
+    DEFAULT_PASSWORD,
+    GeneratorConfig,
+    generate_synthetic_data,
+)
+
+PERCENTILES = (50, 95, 99)
+
+_REQUEST_LINK = re.compile(r"/game/\d+/(add_on|cash_out)/(\d+)\"")
+_CHIP_VALUE = re.compile(r'data-value="([\d.]+)"')
+_CHIP_INPUT = re.compile(r'name="chip_(\d+)"')
+
+
+@dataclass
+class Table:
+    game_id: int
+    host_email: str
+    players: Dict[str, int]  # e-mail -> user id, without the host
+    default_buy_in: float
+
+
+@dataclass
+class LoadStats:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, name: str, latency: float, ok: bool) -> None:
+        self.latencies[name].append(latency)
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, elapsed: float) -> Dict:
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            latencies_ms = np.array(values) * 1000
+            endpoints[name] = {
+                "requests": len(values),
+                "rps": len(values) / elapsed,
+                "errors": self.errors[name],
+                "error_rate": self.errors[name] / len(values),
+                "max_ms": float(latencies_ms.max()),
+            }
+            for p in PERCENTILES:
+                endpoints[name][f"p{p}_ms"] = float(np.percentile(latencies_ms, p))
+
+        total = sum(e["requests"] for e in endpoints.values())
+        errors = sum(e["errors"] for e in endpoints.values())
+        return {
+            "elapsed_s": elapsed,
+            "requests": total,
+            "rps": total / elapsed if elapsed else 0.0,
+            "error_rate": errors / total if total else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def setup_tables(database_url: str, tables: int, seed: int) -> List[Table]:
+    """
+    Generates one team per table with a season of history. The generator
+    seats 4-10 players in the running game; more team members are seated
+    until each table has 8-12.
+    """
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    config = GeneratorConfig(
+        teams=tables,
+        players_per_team=16,
+        guests_per_team=0,
+        games_per_year=40,
+        years=1,
+        seed=seed,
+    )
+    result = []
+    with engine.begin() as conn:
+        summary = generate_synthetic_data(conn, config)
+        for team in summary.teams:
+            game = conn.execute(
+                select(Game.id, Game.owner_id, Game.default_buy_in, Game.start_time)
+                .where(Game.id == team.running_game_id)
+            ).one()
+            seated = set(
+                conn.execute(
+                    select(UserGame.user_id).where(UserGame.game_id == game.id)
+                ).scalars()
+            )
+            members = conn.execute(
+                select(UserTeam.user_id).where(UserTeam.team_id == team.team_id)
+            ).scalars().all()
+            free = [m for m in members if m not in seated]
+            rng.shuffle(free)
+            for user_id in free[: max(0, rng.randint(8, 12) - len(seated))]:
+                conn.execute(
+                    UserGame.__table__.insert().values(
+                        user_id=user_id,
+                        game_id=game.id,
+                        status=PlayerRequestStatus.APPROVED,
+                    )
+                )
+                conn.execute(
+                    BuyIn.__table__.insert().values(
+                        user_id=user_id,
+                        game_id=game.id,
+                        amount=game.default_buy_in,
+                        time=game.start_time,
+                    )
+                )
+                seated.add(user_id)
+
+            emails = dict(
+                conn.execute(select(User.id, User.email).where(User.id.in_(seated))).all()
+            )
+            result.append(
+                Table(
+                    game_id=game.id,
+                    host_email=emails[game.owner_id],
+                    players={emails[u]: u for u in seated if u != game.owner_id},
+                    default_buy_in=game.default_buy_in,
+                )
+            )
+    engine.dispose()
+    return result
+
+
+class GameNight:
+    def __init__(self, base_url: str, tables: List[Table], args):
+        self.base_url = base_url
+        self.tables = tables
+        self.args = args
+        self.stats = LoadStats()
+        self.rng = random.Random(args.seed)
+        self.deadline = 0.0
+
+    async def request(
+        self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(name, time.perf_counter() - start, ok=False)
+            return None
+        # The app redirects unauthenticated requests to the login page
+        ok = response.status_code < 400 and not response.headers.get(
+            "location", ""
+        ).startswith("/login")
+        self.stats.record(name, time.perf_counter() - start, ok)
+        return response
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=self.base_url, timeout=60)
+
+    async def login(self, client: httpx.AsyncClient, email: str) -> None:
+        response = await self.request(
+            client,
+            "login",
+            "POST",
+            "/login/token",
+            data={"username": email, "password": self.args.password},
+        )
+        if response is not None and response.status_code == 200:
+            token = response.json()["access_token"]
+            client.cookies.set("access_token", f"Bearer {token}")
+
+    def time_left(self) -> float:
+        return self.deadline - time.perf_counter()
+
+    async def sleep(self, seconds: float) -> None:
+        # +-20% jitter so the clients don't move in lockstep
+        await asyncio.sleep(seconds * self.rng.uniform(0.8, 1.2))
+
+    async def poll_table(self, client, table: Table, finished: asyncio.Event):
+        while not finished.is_set() and self.time_left() > 0:
+            await self.request(client, "game_table", "GET", f"/game/{table.game_id}/table")
+            await self.sleep(self.args.table_interval)
+
+    async def poll_homepage(self, client, finished: asyncio.Event):
+        cursor = 0
+        while not finished.is_set() and self.time_left() > 0:
+            response = await self.request(
+                client,
+                "check_update",
+                "GET",
+                "/game/api/check_update",
+                params={"cursor": cursor, "wait": self.args.long_poll_wait},
+            )
+            if response is not None and response.status_code == 200:
+                data = response.json()
+                if data["new_game"] and cursor:
+                    await self.request(client, "homepage", "GET", "/")
+                cursor = data["cursor"]
+            await self.sleep(1)
+
+    async def cash_out(self, client, table: Table, stack: float):
+        form_page = await self.request(
+            client, "cash_out_form", "GET", f"/game/{table.game_id}/cash_out"
+        )
+        if form_page is None or form_page.status_code != 200:
+            return
+        values = [float(v) for v in _CHIP_VALUE.findall(form_page.text)]
+        chip_ids = _CHIP_INPUT.findall(form_page.text)
+
+        # Anything from busted to tripled, in whole chips, largest first
+        remaining = int(stack * self.rng.uniform(0, 3))
+        form = {}
+        total = 0.0
+        for chip_id, value in sorted(zip(chip_ids, values), key=lambda c: -c[1]):
+            count, remaining = divmod(remaining, max(int(value), 1))
+            form[f"chip_{chip_id}"] = str(count)
+            total += count * value
+        form["totalValue"] = f"{total:.2f}"
+        await self.request(
+            client, "cash_out", "POST", f"/game/{table.game_id}/cash_out", data=form
+        )
+
+    async def player(self, email: str, table: Table, finished: asyncio.Event):
+        await self.sleep(self.rng.uniform(0, self.args.ramp_up))
+        async with self.client() as client:
+            await self.login(client, email)
+            pollers = [
+                asyncio.create_task(self.poll_table(client, table, finished)),
+                asyncio.create_task(self.poll_homepage(client, finished)),
+            ]
+            stack = table.default_buy_in
+            # Players leave during the last third of the night
+            leave_at = self.args.duration * self.rng.uniform(0.1, 0.3)
+            while not finished.is_set() and self.time_left() > 0:
+                if self.time_left() <= leave_at:
+                    await self.cash_out(client, table, stack)
+                    break
+                if self.rng.random() < self.args.add_on_rate / 60 * 5:
+                    await self.request(
+                        client,
+                        "add_on",
+                        "POST",
+                        f"/game/{table.game_id}/add_on",
+                        data={"add_on": str(table.default_buy_in)},
+                    )
+                    stack += table.default_buy_in
+                await self.sleep(5)
+            await asyncio.gather(*pollers)
+
+    async def host(self, table: Table, finished: asyncio.Event):
+        async with self.client() as client:
+            await self.login(client, table.host_email)
+            homepage = asyncio.create_task(self.poll_homepage(client, finished))
+            handled = set()
+            while self.time_left() > 0:
+                response = await self.request(
+                    client, "game_table", "GET", f"/game/{table.game_id}/table"
+                )
+                if response is not None:
+                    for kind, request_id in _REQUEST_LINK.findall(response.text):
+                        if (kind, request_id) in handled:
+                            continue
+                        handled.add((kind, request_id))
+                        await self.request(
+                            client,
+                            f"{kind}_approve",
+                            "POST",
+                            f"/game/{table.game_id}/{kind}/{request_id}/approve",
+                        )
+                if self.rng.random() < self.args.buy_in_rate / 60 * self.args.table_interval:
+                    await self.request(
+                        client,
+                        "buy_in",
+                        "POST",
+                        f"/game/{table.game_id}/buy_in/add",
+                        data={
+                            "player_id": self.rng.choice(list(table.players.values())),
+                            "amount": str(table.default_buy_in),
+                        },
+                    )
+                await self.sleep(self.args.table_interval)
+
+            await self.request(client, "finish_game", "POST", f"/game/{table.game_id}/finish")
+            finished.set()
+            await homepage
+
+    async def run(self) -> Dict:
+        self.deadline = time.perf_counter() + self.args.duration
+        tasks = []
+        for table in self.tables:
+            finished = asyncio.Event()
+            tasks.append(self.host(table, finished))
+            tasks.extend(self.player(email, table, finished) for email in table.players)
+        started = time.perf_counter()
+        await asyncio.gather(*tasks)
+        return self.stats.report(time.perf_counter() - started)
+
+
+def print_report(report: Dict) -> None:
+    print(
+        f"\n{report['requests']} requests in {report['elapsed_s']:.0f}s "
+        f"({report['rps']:.1f} req/s), error rate {report['error_rate']:.2%}"
+    )
+    print(f"  {'endpoint':<18}{'req':>7}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>7}")
+    for name, e in report["endpoints"].items():
+        print(
+            f"  {name:<18}{e['requests']:>7}{e['rps']:>8.1f}{e['p50_ms']:>8.0f}ms"
+            f"{e['p95_ms']:>7.0f}ms{e['p99_ms']:>7.0f}ms{e['errors']:>7}"
+        )
+
+
+def main(argv: List[str] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Game-night load test.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--database-url",
+        help="Database of the server, for creating the tables "
+        "(default: the app's configured database)",
+    )
+    parser.add_argument("--tables", type=int, default=10, help="Concurrent games")
+    parser.add_argument("--duration", type=float, default=300, help="Seconds")
+    parser.add_argument("--ramp-up", type=float, default=30, help="Seconds")
+    parser.add_argument("--table-interval", type=float, default=5)
+    parser.add_argument(
+        "--long-poll-wait", type=int, default=25, help="Homepage long-poll wait"
+    )
+    parser.add_argument(
+        "--add-on-rate", type=float, default=0.05, help="Add-ons per player per minute"
+    )
+    parser.add_argument(
+        "--buy-in-rate", type=float, default=0.2, help="Buy-ins per table per minute"
+    )
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url
+    if not database_url:
+        from backend.db.session import SQLALCHEMY_DATABASE_URL as database_url
+
+    print(f"Creating {args.tables} tables...")
+    tables = setup_tables(database_url, args.tables, args.seed)
+    night = GameNight(args.base_url, tables, args)
+    players = sum(len(t.players) + 1 for t in tables)
+    print(f"Running {players} players at {args.tables} tables for {args.duration:.0f}s")
+
+    report = asyncio.run(night.run())
+    report["config"] = {
+        "tables": args.tables,
+        "players": players,
+        "duration_s": args.duration,
+        "table_interval_s": args.table_interval,
+    }
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
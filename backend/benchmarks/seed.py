@@ -0,0 +1,67 @@
+"""
+Seeds a benchmark database with synthetic teams, players and games.
+"""
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from backend.scripts.generate_synthetic_data import (
+    GeneratorConfig,
+    generate_synthetic_data,
+)
+
+
+@dataclass
+class SeedScale:
+    teams: int = 1
+    players: int = 20
+    games_per_year: int = 50
+    years: int = 3
+
+    def scaled(self, factor: int) -> "SeedScale":
+        """Players and games grow with the factor, teams stay the same."""
+        return SeedScale(
+            teams=self.teams,
+            players=self.players * factor,
+            games_per_year=self.games_per_year * factor,
+            years=self.years,
+        )
+
+
+@dataclass
+class SeedResult:
+    """Ids of the rows the benchmarked endpoints are called with."""
+
+    user_email: str
+    team_id: int
+    player_id: int
+    running_game_id: int
+    finished_game_id: int
+
+
+def seed_database(db: Session, scale: SeedScale, seed: int = 0) -> SeedResult:
+    """
+    Generates the data set with the synthetic data generator; a quarter of
+    each team's players are guests. The benchmark logs in as the admin of
+    the first team.
+    """
+    guests = scale.players // 4
+    config = GeneratorConfig(
+        teams=scale.teams,
+        players_per_team=scale.players - guests,
+        guests_per_team=guests,
+        games_per_year=scale.games_per_year,
+        years=scale.years,
+        seed=seed,
+    )
+    summary = generate_synthetic_data(db.connection(), config)
+    db.commit()
+
+    team = summary.teams[0]
+    return SeedResult(
+        user_email=team.admin_email,
+        team_id=team.team_id,
+        player_id=team.admin_id,
+        running_game_id=team.running_game_id,
+        finished_game_id=team.finished_game_id,
+    )
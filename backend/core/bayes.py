@@ -1,12 +1,9 @@
 import math
 from collections import defaultdict
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from backend.core.time_weighting import get_team_decay_params, time_weighted_stats
 from backend.db.models.game import Game
-from backend.db.models.buy_in import BuyIn
-from backend.db.models.add_on import AddOn
-from backend.db.models.cash_out import CashOut
-from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.repository.game_result import get_team_results
 
 def get_bayes_predictions(game_id: int, db: Session):
     game = db.query(Game).filter(Game.id == game_id).first()
@@ -19,21 +16,18 @@ def get_bayes_predictions(game_id: int, db: Session):
     if num_players == 0:
         return []
     
-    # 1. Get all team games to calculate team-wide priors
-    all_team_games = db.query(Game.id, Game.start_time, Game.finish_time).filter(Game.team_id == team_id).all()
-    team_game_ids = [g.id for g in all_team_games]
-    
-    # 2. Get all historical transactions for the team to calculate per-player per-game stats
-    all_bis = db.query(BuyIn.user_id, BuyIn.game_id, BuyIn.amount).filter(BuyIn.game_id.in_(team_game_ids)).all()
-    all_aos = db.query(AddOn.user_id, AddOn.game_id, AddOn.amount).filter(AddOn.game_id.in_(team_game_ids), AddOn.status == PlayerRequestStatus.APPROVED).all()
-    all_cos = db.query(CashOut.user_id, CashOut.game_id, CashOut.amount).filter(CashOut.game_id.in_(team_game_ids)).all()
-    
-    player_game_net = defaultdict(lambda: defaultdict(float))
-    for u, g, a in all_bis: player_game_net[u][g] -= a
-    for u, g, a in all_aos: player_game_net[u][g] -= a
-    for u, g, a in all_cos: player_game_net[u][g] += a
+    grace_days, decay_rate = get_team_decay_params(game.team)
+
+    # 1-2. Per-player per-game results of the team's finished games
+    player_game_net = defaultdict(dict)
+    game_dates = {}
+    for r in get_team_results(team_id, db):
+        player_game_net[r.user_id][r.game_id] = r.net
+        game_dates[r.game_id] = r.played_at
     
     # 3. Calculate metrics for all players in the team
+    # Same time-decay weighting as the player page, so recent form counts more
+    # and "n" is the effective (weighted) number of games.
     team_metrics = []
     player_stats = {}
     
@@ -41,18 +35,22 @@ def get_bayes_predictions(game_id: int, db: Session):
         bals = list(g_map.values())
         if not bals: continue
         
-        n = len(bals)
-        avg = sum(bals) / n
-        var = sum((b - avg)**2 for b in bals) / n if n > 1 else 0
-        sd = math.sqrt(var)
+        n_played = len(bals)
+        weighted = time_weighted_stats(
+            bals,
+            [game_dates[gid] for gid in g_map.keys()],
+            grace_days=grace_days,
+            decay_rate=decay_rate,
+        )
         
         player_stats[uid] = {
-            "avg": avg,
-            "sd": sd,
-            "n": n
+            "avg": weighted.mean,
+            "sd": weighted.std_dev if n_played > 1 else 0,
+            "n": weighted.effective_n,
+            "n_played": n_played,
         }
-        if n >= 3: # Lower threshold for prior to include more context
-            team_metrics.append({"avg": avg, "sd": sd})
+        if n_played >= 3: # Lower threshold for prior to include more context
+            team_metrics.append({"avg": weighted.mean, "sd": weighted.std_dev})
             
     # Fallback priors
     prior_mean = sum(m["avg"] for m in team_metrics) / len(team_metrics) if team_metrics else 0
@@ -63,7 +61,7 @@ def get_bayes_predictions(game_id: int, db: Session):
     
     # 4. First pass: Calculate independent Bayesian posteriors
     for p in players:
-        stats = player_stats.get(p.id, {"avg": 0, "sd": 0, "n": 0})
+        stats = player_stats.get(p.id, {"avg": 0, "sd": 0, "n": 0, "n_played": 0})
         
         n_games = stats["n"]
 
@@ -71,7 +69,7 @@ def get_bayes_predictions(game_id: int, db: Session):
         lik_mean = stats["avg"]
         # Use population variance if sample size is too small to estimate player variance reliably
         # This prevents "unknown" players from having tiny curves just because their few games were similar
-        if n_games < 10 or stats["sd"] <= 0:
+        if stats["n_played"] < 10 or stats["sd"] <= 0:
             lik_sigma = avg_team_sd if avg_team_sd > 0 else 100
         else:
             lik_sigma = stats["sd"]
@@ -97,7 +95,8 @@ def get_bayes_predictions(game_id: int, db: Session):
             "player": p,
             "mu_raw": post_mean,
             "sigma": pred_sigma,
-            "n_games": n_games
+            "n_games": stats["n_played"],
+            "effective_n": n_games,
         })
 
     # 5. Second pass: Adjust for Zero-Sum (Competitive Adjustment)
@@ -117,9 +116,9 @@ def get_bayes_predictions(game_id: int, db: Session):
         else:
             win_prob = 1.0 if mu_adj > 0 else (0.5 if mu_adj == 0 else 0.0)
             
-        if ir["n_games"] < 5:
+        if ir["effective_n"] < 5:
             reliability = "Low (Need more games)"
-        elif ir["n_games"] < 15:
+        elif ir["effective_n"] < 15:
             reliability = "Moderate"
         else:
             reliability = "High"
@@ -130,6 +129,7 @@ def get_bayes_predictions(game_id: int, db: Session):
             "mu": mu_adj,
             "sigma": sigma,
             "n_games": ir["n_games"],
+            "effective_n": ir["effective_n"],
             "reliability": reliability
         })
         
@@ -0,0 +1,92 @@
+"""
+In-process caches that stay correct with several workers.
+
+Every entry is tagged with the invalidation keys of the data it was built
+from ("game:12", "team:3", ...) and dropped as soon as any of them is
+published by a commit in any worker (see backend/db/invalidation.py).
+
+    chip_structures = LocalCache("chip_structures")
+    structures = chip_structures.get(
+        team_id, [f"team:{team_id}"], lambda: list_team_chip_structures(team_id, db)
+    )
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Set
+
+from backend.core.config import settings
+from backend.core.metrics import record_cache_lookup
+from backend.db.invalidation import subscribe
+
+
+class LocalCache:
+    def __init__(self, name: str, max_entries: int = None):
+        self.name = name
+        self.max_entries = max_entries or settings.LOCAL_CACHE_MAX_ENTRIES
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.tags: Dict[str, Set[Hashable]] = {}
+        self.entry_tags: Dict[Hashable, Set[str]] = {}
+        # Bumped by every invalidation; a value loaded while it changed may
+        # already be stale and isn't stored
+        self.generation = 0
+        self.lock = threading.Lock()
+        subscribe(self.invalidate)
+
+    def get(self, key: Hashable, tags: Iterable[str], load: Callable[[], Any]) -> Any:
+        with self.lock:
+            hit = key in self.entries
+            if hit:
+                self.entries.move_to_end(key)
+                value = self.entries[key]
+            generation = self.generation
+        record_cache_lookup(self.name, hit)
+        if hit:
+            return value
+
+        value = load()
+        with self.lock:
+            if generation == self.generation:
+                self._store(key, set(tags), value)
+        return value
+
+    def _store(self, key: Hashable, tags: Set[str], value: Any) -> None:
+        self._drop(key)
+        self.entries[key] = value
+        self.entry_tags[key] = tags
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+
+    def _drop(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+        for tag in self.entry_tags.pop(key, ()):
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+
+    def invalidate(self, keys: Set[str]) -> None:
+        """Drops the entries tagged with any of keys; "*" drops everything."""
+        with self.lock:
+            self.generation += 1
+            if "*" in keys:
+                self._clear()
+                return
+            for tag in keys:
+                for key in list(self.tags.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.generation += 1
+            self._clear()
+
+    def _clear(self) -> None:
+        self.entries.clear()
+        self.tags.clear()
+        self.entry_tags.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -39,5 +39,72 @@ class Settings:
     PASSWORD_LENGTH = 4
     NICK_LENGTH = 1
 
+    # Homepage "new game" long-poll: max seconds a request may wait and how
+    # often the games cursor is re-read while waiting.
+    CHECK_UPDATE_MAX_WAIT = 25
+    CHECK_UPDATE_POLL_INTERVAL = 5
+
+    # Default time decay of game results in player statistics and predictions;
+    # teams can override both (see backend/core/time_weighting.py).
+    TIME_DECAY_GRACE_DAYS = 180
+    TIME_DECAY_RATE = 0.0018
+
+    # Teams with more games than this are deleted in the background, in
+    # batches of TEAM_DELETE_BATCH_SIZE games (see delete_team_in_batches).
+    TEAM_BACKGROUND_DELETE_MIN_GAMES = 1000
+    TEAM_DELETE_BATCH_SIZE = 200
+
+    # Who-pays-whom settlements are searched exactly up to this many players
+    # with open balances, greedily beyond (see backend/core/debt_settlement.py).
+    SETTLEMENT_EXACT_MAX_PLAYERS = 12
+
+    # Key of the permutation that turns team numbers into search codes (see
+    # backend/core/team_codes.py). Must never change once teams exist, so it
+    # is not derived from SECRET_KEY, which may be rotated. A code that is
+    # taken anyway is skipped, up to TEAM_CODE_ATTEMPTS times.
+    TEAM_CODE_KEY: str = os.getenv("TEAM_CODE_KEY", "cash-game-tracker-team-codes")
+    TEAM_CODE_ATTEMPTS = 10
+
+    # Committed changes are announced to every worker's in-process caches
+    # on this PostgreSQL NOTIFY channel (see backend/db/invalidation.py).
+    CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+    CACHE_INVALIDATION_RECONNECT_SECONDS = 5
+    LOCAL_CACHE_MAX_ENTRIES = 1024
+
+    # At most this many events per /game/{id}/events response; clients ask
+    # again from the last seq they got (see backend/db/game_events.py).
+    GAME_EVENTS_PAGE_SIZE = 500
+
+    # A statement shape executed this many times in one request is logged as
+    # a likely N+1 query (see backend/db/query_stats.py).
+    N_PLUS_ONE_THRESHOLD = 5
+
+    # /metrics requires "Authorization: Bearer <token>" when this is set.
+    # With several workers PROMETHEUS_MULTIPROC_DIR must point to an empty
+    # directory shared by them (gunicorn.conf.py sets it up).
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN")
+
+    # Request profiles taken by superusers with ?profile=1 (see
+    # backend/core/profiling.py); only the newest ones are kept.
+    PROFILES_DIR: str = os.getenv("PROFILES_DIR", "/tmp/cash_game_profiles")
+    PROFILES_MAX_STORED = 50
+
+    # Statements slower than this are logged and kept for /admin/slow-queries
+    # (see backend/db/slow_queries.py). SLOW_QUERY_EXPLAIN re-runs the first
+    # slow SELECT of each shape under EXPLAIN ANALYZE (PostgreSQL only).
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() == "true"
+    SLOW_QUERY_BUFFER_SIZE = 200
+
+    # Read replica for the stats and history pages (see backend/db/replica.py).
+    # Reads go to the primary while the replica lags more than
+    # REPLICA_MAX_LAG_SECONDS, and for READ_YOUR_WRITES_SECONDS after a
+    # user's own write.
+    REPLICA_DATABASE_URL: str = os.getenv("REPLICA_DATABASE_URL")
+    REPLICA_MAX_LAG_SECONDS = 5
+    REPLICA_LAG_CHECK_INTERVAL = 5
+    REPLICA_CONNECT_TIMEOUT_SECONDS = 2
+    READ_YOUR_WRITES_SECONDS = 30
+
 
 settings = Settings()
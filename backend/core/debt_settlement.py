@@ -0,0 +1,149 @@
+"""
+Who pays whom after one or more finished games.
+
+Given each player's net result, finds a set of transfers that settles every
+balance. Amounts are handled in cents so sums are exact.
+
+The number of transfers needed is the number of players with a non-zero
+balance minus the number of groups they can be split into whose balances sum
+to zero (each group of k players settles with k - 1 transfers). Up to
+SETTLEMENT_EXACT_MAX_PLAYERS players that maximal split is found exactly with
+a dynamic program over subsets; beyond that, largest debtor pays largest
+creditor, which needs at most one transfer less than the number of players.
+
+If the balances don't sum to zero (cash-outs don't match the pot) the
+difference is settled with the pot, a party with id None.
+"""
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+
+from backend.core.config import settings
+
+
+@dataclass(frozen=True)
+class Transfer:
+    payer_id: Optional[Hashable]  # None: paid out of the pot
+    payee_id: Optional[Hashable]  # None: paid into the pot
+    amount: float
+
+
+def _to_cents(balances: Dict[Hashable, float]) -> Dict[Optional[Hashable], int]:
+    cents = {}
+    for player_id, balance in balances.items():
+        amount = int(round(balance * 100))
+        if amount:
+            cents[player_id] = amount
+    difference = sum(cents.values())
+    if difference:
+        cents[None] = cents.get(None, 0) - difference
+    return cents
+
+
+def _settle_greedy(cents: Dict[Optional[Hashable], int]) -> List[tuple]:
+    """Largest debtor pays largest creditor until everyone is even."""
+    # The index breaks ties, so player ids (and None) are never compared
+    balances = list(enumerate(cents.items()))
+    creditors = [(-amount, i, p) for i, (p, amount) in balances if amount > 0]
+    debtors = [(amount, i, p) for i, (p, amount) in balances if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+    transfers = []
+    while creditors and debtors:
+        credit, ci, creditor = heapq.heappop(creditors)
+        debt, di, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, ci, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, di, debtor))
+    return transfers
+
+
+def _zero_sum_groups(players: List, amounts: List[int]) -> List[List]:
+    """
+    Splits the players into the largest number of groups with zero-sum
+    balances. best[mask] is the largest number of zero-sum groups the players
+    in mask can be split into; O(2^n * n).
+    """
+    n = len(amounts)
+    full = (1 << n) - 1
+    total = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        low = mask & -mask
+        total[mask] = total[mask ^ low] + amounts[low.bit_length() - 1]
+
+    best = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        rest = mask
+        most = 0
+        while rest:
+            low = rest & -rest
+            rest ^= low
+            most = max(most, best[mask ^ low])
+        best[mask] = most + (total[mask] == 0)
+
+    # Walk back down removing one player at a time without losing a group;
+    # every zero-sum mask on the way closes a group.
+    groups, group, mask = [], [], full
+    while mask:
+        rest = mask
+        while rest:
+            low = rest & -rest
+            rest ^= low
+            if best[mask ^ low] == best[mask] - (total[mask] == 0):
+                break
+        if total[mask] == 0 and group:
+            groups.append(group)
+            group = []
+        group.append(players[low.bit_length() - 1])
+        mask ^= low
+    groups.append(group)
+    return groups
+
+
+def _settle_exact(cents: Dict[Optional[Hashable], int]) -> List[tuple]:
+    players = list(cents)
+    transfers = []
+    for group in _zero_sum_groups(players, [cents[p] for p in players]):
+        transfers.extend(_settle_greedy({p: cents[p] for p in group}))
+    return transfers
+
+
+def _pair_opposites(cents: Dict[Optional[Hashable], int]) -> List[tuple]:
+    """
+    Settles players whose balances cancel out exactly with one transfer; such
+    a pair is always part of some minimal settlement. Removes them from cents.
+    """
+    debtors = {}
+    for player_id, amount in cents.items():
+        if amount < 0:
+            debtors.setdefault(-amount, []).append(player_id)
+    transfers = []
+    for player_id, amount in list(cents.items()):
+        if amount > 0 and debtors.get(amount):
+            debtor = debtors[amount].pop()
+            transfers.append((debtor, player_id, amount))
+            del cents[player_id], cents[debtor]
+    return transfers
+
+
+def minimal_transfers(
+    balances: Dict[Hashable, float], exact_max_players: Optional[int] = None
+) -> List[Transfer]:
+    """
+    Transfers settling the given net balances (positive: is owed money),
+    largest first. Minimal when at most exact_max_players players (default
+    SETTLEMENT_EXACT_MAX_PLAYERS) remain after pairing exact opposites.
+    """
+    if exact_max_players is None:
+        exact_max_players = settings.SETTLEMENT_EXACT_MAX_PLAYERS
+    cents = _to_cents(balances)
+    transfers = _pair_opposites(cents)
+    if len(cents) <= exact_max_players:
+        transfers.extend(_settle_exact(cents))
+    else:
+        transfers.extend(_settle_greedy(cents))
+    transfers.sort(key=lambda t: -t[2])
+    return [Transfer(payer, payee, amount / 100) for payer, payee, amount in transfers]
@@ -0,0 +1,57 @@
+"""
+Table state of a running game, kept up to date one event at a time.
+
+The state maps every seated player (user id as a string, since it is stored
+as JSON) to their totals. Every ledger event carries the amount and status
+of the entry before and after it, so applying it is the same for all kinds:
+take back what the entry counted for before, add what it counts for now.
+"""
+from typing import Dict, Optional
+
+LEDGERS = ("buy_in", "add_on", "cash_out")
+TOTALS = ("buy_in", "add_on", "add_on_requested", "cash_out", "cash_out_requested")
+
+PLAYER_JOINED = "player_joined"
+PLAYER_REMOVED = "player_removed"
+
+
+def event_kind(event_type: str) -> Optional[str]:
+    """The ledger an event is about (buy_in, add_on, cash_out), if any."""
+    for kind in LEDGERS:
+        if event_type.startswith(kind):
+            return kind
+    return None
+
+
+def _total(kind: str, status: Optional[str]) -> Optional[str]:
+    """The total an entry of this kind and status counts towards."""
+    if status is None:
+        return None
+    if kind == "buy_in" or status == "APPROVED":
+        return kind
+    if status == "REQUESTED":
+        return f"{kind}_requested"
+    return None  # declined
+
+
+def empty_totals() -> Dict[str, float]:
+    return {total: 0.0 for total in TOTALS}
+
+
+def apply_event(players: Dict[str, Dict[str, float]], event: Dict) -> None:
+    """Applies one event (a dict of GameEvent columns) to players in place."""
+    user = str(event["user_id"])
+    if event["type"] == PLAYER_REMOVED:
+        players.pop(user, None)
+        return
+    totals = players.setdefault(user, empty_totals())
+    kind = event_kind(event["type"])
+    if kind is None:
+        return
+
+    before = _total(kind, event.get("previous_status"))
+    if before is not None:
+        totals[before] -= event.get("previous_amount") or 0.0
+    after = _total(kind, event.get("status"))
+    if after is not None:
+        totals[after] += event.get("amount") or 0.0
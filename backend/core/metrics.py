@@ -0,0 +1,171 @@
+"""
+Prometheus metrics for routes, database and template rendering.
+
+With several gunicorn workers every worker has its own counters; when
+PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py does it), prometheus_client
+writes them to files in that directory and /metrics aggregates all workers.
+"""
+import os
+import time
+
+import jinja2
+from fastapi import FastAPI, Request
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.db.query_stats import track_queries
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request",
+    ["method", "route"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed")
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+TEMPLATE_RENDER = Histogram(
+    "template_render_seconds",
+    "Jinja template render time",
+    ["template"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result", ["cache", "result"]
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """To be called by cache layers on every lookup."""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+class TimedTemplate(jinja2.Template):
+    def render(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            TEMPLATE_RENDER.labels(template=self.name or "string").observe(
+                time.perf_counter() - start
+            )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    DB_STATEMENTS.inc()
+
+
+def instrument_engine(engine) -> None:
+    """Pool checkout counts, wait time and connections in use."""
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+def metrics_payload() -> bytes:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def route_template(request: Request) -> str:
+    """
+    The matched route with path parameters as placeholders
+    (/game/12/table -> /game/{game_id}/table), keeping label cardinality
+    bounded. Rebuilt from the path parameters because routes of included
+    routers don't carry their prefix.
+    """
+    if "endpoint" not in request.scope:
+        return "unmatched"
+    params = iter(request.path_params.items())
+    pending = next(params, None)
+    segments = []
+    for segment in request.url.path.split("/"):
+        if pending is not None and segment == str(pending[1]):
+            segment = "{%s}" % pending[0]
+            pending = next(params, None)
+        segments.append(segment)
+    return "/".join(segments)
+
+
+def install_metrics(app: FastAPI, engine) -> None:
+    # Templates are compiled through template_class when first loaded, so all
+    # Jinja2Templates environments render TimedTemplates from now on
+    jinja2.Environment.template_class = TimedTemplate
+    instrument_engine(engine)
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+        if request.url.path == "/metrics":
+            return await call_next(request)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method=request.method)
+        in_progress.inc()
+        start = time.perf_counter()
+        status = 500
+        try:
+            with track_queries() as stats:
+                response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            in_progress.dec()
+            route = route_template(request)
+            REQUEST_DURATION.labels(
+                method=request.method, route=route, status=str(status)
+            ).observe(time.perf_counter() - start)
+            REQUEST_DB_QUERIES.labels(method=request.method, route=route).observe(
+                stats.count
+            )
@@ -0,0 +1,159 @@
+"""
+On-demand profiling of single requests for superusers.
+
+Adding `?profile=1` to a URL (or sending `X-Profile: 1`) runs the request
+under cProfile and stores the stats in PROFILES_DIR; they are listed and
+downloadable on /admin/profiles. cProfile only sees the event loop thread,
+which is where the routes and their database calls run; sync dependencies
+executed in the threadpool don't show up. Other requests handled by the
+same worker at the same time end up in the profile too.
+"""
+import asyncio
+import cProfile
+import inspect
+import io
+import os
+import pstats
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.security.utils import get_authorization_scheme_param
+
+from backend.core.config import settings
+from backend.core.metrics import route_template
+from backend.db.session import get_db
+
+_PROFILE_NAME = re.compile(
+    r"^(?P<stamp>\d{8}-\d{6}-\d{6})_(?P<method>[A-Z]+)_(?P<ms>\d+)ms_(?P<route>[\w.{}-]*)\.prof$"
+)
+
+# cProfile can't run two profilers at once; a second request asking for a
+# profile while one is running is served without it.
+_profiling = asyncio.Lock()
+
+
+@dataclass
+class StoredProfile:
+    name: str
+    created_at: datetime
+    method: str
+    route: str
+    duration_ms: int
+    size: int
+
+
+def profile_requested(request: Request) -> bool:
+    return (
+        request.query_params.get("profile") == "1"
+        or request.headers.get("X-Profile") == "1"
+    )
+
+
+def _request_user(request: Request):
+    """User of the access token cookie, using the app's get_db override."""
+    from backend.apis.v1.route_login import get_current_user_from_token
+
+    token = request.cookies.get("access_token") or request.headers.get(
+        "Authorization"
+    )
+    _, param = get_authorization_scheme_param(token)
+    if not param:
+        return None
+
+    provider = request.app.dependency_overrides.get(get_db, get_db)
+    db = provider()
+    db_gen = db if inspect.isgenerator(db) else None
+    if db_gen is not None:
+        db = next(db_gen)
+    try:
+        return get_current_user_from_token(token=param, db=db)
+    except HTTPException:
+        return None
+    finally:
+        if db_gen is not None:
+            db_gen.close()
+
+
+def _file_name(method: str, route: str, duration_ms: int) -> str:
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    slug = re.sub(r"[^\w.{}-]+", "-", route).strip("-")
+    return f"{stamp}_{method}_{duration_ms}ms_{slug}.prof"
+
+
+def save_profile(
+    profiler: cProfile.Profile, method: str, route: str, duration_ms: int
+) -> str:
+    os.makedirs(settings.PROFILES_DIR, exist_ok=True)
+    name = _file_name(method, route, duration_ms)
+    profiler.dump_stats(os.path.join(settings.PROFILES_DIR, name))
+
+    for old in list_profiles()[settings.PROFILES_MAX_STORED :]:
+        os.remove(os.path.join(settings.PROFILES_DIR, old.name))
+    return name
+
+
+def list_profiles() -> List[StoredProfile]:
+    """Stored profiles, newest first."""
+    if not os.path.isdir(settings.PROFILES_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(settings.PROFILES_DIR):
+        match = _PROFILE_NAME.match(name)
+        if not match:
+            continue
+        profiles.append(
+            StoredProfile(
+                name=name,
+                created_at=datetime.strptime(match["stamp"], "%Y%m%d-%H%M%S-%f"),
+                method=match["method"],
+                route="/" + match["route"].replace("-", "/"),
+                duration_ms=int(match["ms"]),
+                size=os.path.getsize(os.path.join(settings.PROFILES_DIR, name)),
+            )
+        )
+    return sorted(profiles, key=lambda p: p.created_at, reverse=True)
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Path of a stored profile; None for unknown names (no path traversal)."""
+    if not _PROFILE_NAME.match(name):
+        return None
+    path = os.path.join(settings.PROFILES_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def profile_summary(path: str, limit: int = 40) -> str:
+    """Top functions by cumulative time, as printed by pstats."""
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def install_profiling_middleware(app: FastAPI) -> None:
+    @app.middleware("http")
+    async def profiling_middleware(request: Request, call_next):
+        if not profile_requested(request) or _profiling.locked():
+            return await call_next(request)
+        user = _request_user(request)
+        if user is None or not user.is_superuser:
+            return await call_next(request)
+
+        async with _profiling:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = await call_next(request)
+            finally:
+                profiler.disable()
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        name = save_profile(
+            profiler, request.method, route_template(request), duration_ms
+        )
+        response.headers["X-Profile-Id"] = name
+        return response
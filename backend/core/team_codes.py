@@ -0,0 +1,60 @@
+"""
+Team search codes from a sequence number.
+
+Code n is the n-th number of a keyed permutation, so consecutive teams get
+unrelated codes and codes can't be guessed from each other, yet two numbers
+never map to the same code and nothing has to be checked against the
+database. The first 10^4 numbers are 4-digit codes, the next 10^5 are
+5-digit codes, and so on.
+
+The permutation is a Feistel network over the smallest even number of bits
+covering 10^digits, cycle-walked until the result falls inside the range.
+TEAM_CODE_KEY must never change once teams exist, or new codes may collide
+with old ones.
+"""
+import hashlib
+import hmac
+
+from backend.core.config import settings
+
+MIN_DIGITS = 4
+_ROUNDS = 4
+
+
+def _round(key: bytes, digits: int, round_index: int, half: int, bits: int) -> int:
+    message = f"{digits}:{round_index}:{half}".encode()
+    digest = hmac.new(key, message, hashlib.sha256).digest()
+    return int.from_bytes(digest[:8], "big") & ((1 << bits) - 1)
+
+
+def _permute(value: int, digits: int, key: bytes) -> int:
+    size = 10**digits
+    half_bits = ((size - 1).bit_length() + 1) // 2
+    mask = (1 << half_bits) - 1
+    while True:
+        left, right = value >> half_bits, value & mask
+        for round_index in range(_ROUNDS):
+            mixed = _round(key, digits, round_index, right, half_bits)
+            left, right = right, left ^ mixed
+        value = (left << half_bits) | right
+        # Values past the range lead back into it, since the walk can only
+        # end at a value that's inside
+        if value < size:
+            return value
+
+
+def team_code(number: int, key: str = None) -> str:
+    """The zero-padded code of sequence number `number` (0, 1, 2, ...)."""
+    if number < 0:
+        raise ValueError("Team code numbers start at 0.")
+    key = (key or settings.TEAM_CODE_KEY or "").encode()
+    digits = MIN_DIGITS
+    while number >= 10**digits:
+        number -= 10**digits
+        digits += 1
+    return f"{_permute(number, digits, key):0{digits}d}"
+
+
+def first_number_with_digits(digits: int) -> int:
+    """The first sequence number whose code has `digits` digits."""
+    return sum(10**d for d in range(MIN_DIGITS, max(digits, MIN_DIGITS)))
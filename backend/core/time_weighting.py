@@ -0,0 +1,90 @@
+"""
+Time-decay weighting of game results.
+
+Recent games count (almost) fully, older games decay exponentially:
+within the grace period the weight falls linearly from 1.0 to 0.95, after it
+the weight is 0.95 * exp(-decay_rate * days_past_grace). With the default
+parameters a game from three years ago weighs about 5x less than a recent one.
+"""
+from datetime import date, datetime
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.core.config import settings
+
+
+class WeightedStats(NamedTuple):
+    weights: np.ndarray
+    mean: float
+    variance: float
+    std_dev: float
+    effective_n: float
+
+
+def get_team_decay_params(team) -> Tuple[int, float]:
+    """Returns (grace_days, decay_rate) for the team, falling back to defaults."""
+    grace_days = getattr(team, "time_decay_grace_days", None)
+    decay_rate = getattr(team, "time_decay_rate", None)
+    return (
+        settings.TIME_DECAY_GRACE_DAYS if grace_days is None else grace_days,
+        settings.TIME_DECAY_RATE if decay_rate is None else decay_rate,
+    )
+
+
+def time_weights(
+    game_dates: Sequence[date],
+    today: Optional[date] = None,
+    grace_days: int = settings.TIME_DECAY_GRACE_DAYS,
+    decay_rate: float = settings.TIME_DECAY_RATE,
+) -> np.ndarray:
+    """
+    Returns the decay weight of each game date (dates or datetimes).
+    """
+    if today is None:
+        today = datetime.now().date()
+    elif isinstance(today, datetime):
+        today = today.date()
+
+    days = np.array(
+        [d.date() if isinstance(d, datetime) else d for d in game_dates],
+        dtype="datetime64[D]",
+    )
+    days_ago = (np.datetime64(today, "D") - days).astype(np.float64)
+
+    if grace_days > 0:
+        recent = 1.0 - (days_ago / grace_days) * 0.05
+    else:
+        recent = np.ones_like(days_ago)
+    old = 0.95 * np.exp(-decay_rate * (days_ago - grace_days))
+    return np.where(days_ago <= grace_days, recent, old)
+
+
+def weighted_stats(values: Sequence[float], weights: np.ndarray) -> WeightedStats:
+    """
+    Weighted mean, (population) variance and effective sample size.
+
+    The effective sample size is the sum of the weights, which is what the
+    Bayesian update uses as the number of observed games.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    total_weight = float(weights.sum())
+    if total_weight <= 0:
+        return WeightedStats(weights, 0.0, 0.0, 0.0, 0.0)
+
+    mean = float(np.dot(weights, values) / total_weight)
+    variance = float(np.dot(weights, (values - mean) ** 2) / total_weight)
+    return WeightedStats(weights, mean, variance, float(np.sqrt(variance)), total_weight)
+
+
+def time_weighted_stats(
+    values: Sequence[float],
+    game_dates: Sequence[date],
+    today: Optional[date] = None,
+    grace_days: int = settings.TIME_DECAY_GRACE_DAYS,
+    decay_rate: float = settings.TIME_DECAY_RATE,
+) -> WeightedStats:
+    """Shortcut for weighted_stats(values, time_weights(game_dates, ...))."""
+    weights = time_weights(game_dates, today, grace_days, decay_rate)
+    return weighted_stats(values, weights)
@@ -13,6 +13,8 @@ from backend.db.models.add_on import AddOn  # noqa
 from backend.db.models.user_team import UserTeam  # noqa
 from backend.db.models.user_game import UserGame  # noqa
 from backend.db.models.user_verification import UserVerification  # noqa
+from backend.db.models.game_result import GameResult  # noqa
+from backend.db.models.game_event import GameEvent, GameSnapshot  # noqa
 
 # List of all models for metadata
 # models = (User, Team, Game, ChipStructure, Chip, BuyIn, CashOut, AddOn, ChipAmount)
@@ -0,0 +1,312 @@
+"""
+Append-only event log of every game's table, with a snapshot of its state.
+
+Every committed change to a game's buy-ins, add-ons, cash-outs and seats is
+appended to game_event with the next seq of that game and applied to the
+game's snapshot in the same transaction, so readers can take the snapshot
+and then follow "events since seq N" instead of recomputing the table.
+
+Events are derived from the objects each flush writes. Bulk statements
+bypass the unit of work, so code issuing them records its events with
+record_game_event. They are written when the transaction commits and
+dropped on rollback, like the keys in invalidation.py.
+
+Games started before the log existed get their snapshot rebuilt from the
+ledgers when their first event is written (or by
+backend/db/tools/backfill_game_snapshots.py).
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, func, insert, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.core.game_state import (
+    LEDGERS,
+    PLAYER_JOINED,
+    PLAYER_REMOVED,
+    apply_event,
+    empty_totals,
+)
+from backend.db.models.add_on import AddOn
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.cash_out import CashOut
+from backend.db.models.game import Game
+from backend.db.models.game_event import GameEvent, GameSnapshot
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.user_game import UserGame
+
+_EVENTS = "game_events"
+_NEW_GAMES = "new_game_ids"
+_DELETED_GAMES = "deleted_game_ids"
+_LEDGER_MODELS = {BuyIn: "buy_in", AddOn: "add_on", CashOut: "cash_out"}
+# Buy-ins have no status; they always count
+_BUY_IN_STATUS = PlayerRequestStatus.APPROVED.value
+_REQUESTED = PlayerRequestStatus.REQUESTED.value
+
+
+def _status_value(status) -> Optional[str]:
+    return getattr(status, "value", status)
+
+
+def _object_id(obj) -> int:
+    # New objects have no identity until the flush is over
+    state = inspect(obj)
+    return state.identity[0] if state.identity else obj.id
+
+
+def record_game_event(
+    db: Session,
+    game_id: int,
+    type: str,
+    user_id: int,
+    entity_id: Optional[int] = None,
+    amount: Optional[float] = None,
+    previous_amount: Optional[float] = None,
+    status=None,
+    previous_status=None,
+) -> None:
+    """Appends an event to the game's log when db's transaction commits."""
+    db.info.setdefault(_EVENTS, []).append(
+        {
+            "game_id": game_id,
+            "type": type,
+            "user_id": user_id,
+            "entity_id": entity_id,
+            "amount": amount,
+            "previous_amount": previous_amount,
+            "status": _status_value(status),
+            "previous_status": _status_value(previous_status),
+        }
+    )
+
+
+def _ledger_event(db: Session, obj, change: str) -> None:
+    kind = _LEDGER_MODELS[type(obj)]
+    state = inspect(obj)
+    values = state.dict
+    if kind == "buy_in":
+        status = _BUY_IN_STATUS
+    else:
+        status = _status_value(values.get("status")) or _REQUESTED
+    game_id, user_id = values.get("game_id"), values.get("user_id")
+
+    if change == "new":
+        event_type = kind if kind == "buy_in" else f"{kind}_{status.lower()}"
+        record_game_event(
+            db, game_id, event_type, user_id, obj.id, obj.amount, status=status
+        )
+        return
+    if change == "deleted":
+        record_game_event(
+            db,
+            game_id,
+            f"{kind}_deleted",
+            user_id,
+            _object_id(obj),
+            previous_amount=values.get("amount"),
+            previous_status=status,
+        )
+        return
+
+    amount = state.attrs.amount.history
+    histories = [amount, state.attrs.time.history]
+    previous_status = status
+    if kind != "buy_in":
+        status_history = state.attrs.status.history
+        histories.append(status_history)
+        if status_history.deleted:
+            previous_status = _status_value(status_history.deleted[0])
+    if not any(history.has_changes() for history in histories):
+        return  # e.g. only a relationship changed
+    event_type = f"{kind}_edited"
+    if previous_status != status:
+        event_type = f"{kind}_{status.lower()}"
+    record_game_event(
+        db,
+        game_id,
+        event_type,
+        user_id,
+        obj.id,
+        obj.amount,
+        amount.deleted[0] if amount.deleted else obj.amount,
+        status,
+        previous_status,
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted_rows(session, flush_context, instances):
+    # Deleted rows are logged with their values after the flush, when an
+    # expired one can no longer be loaded
+    for obj in session.deleted:
+        if type(obj) in _LEDGER_MODELS or isinstance(obj, UserGame):
+            unloaded = inspect(obj).unloaded
+            for key in ("game_id", "user_id", "amount", "status"):
+                if key in unloaded:
+                    getattr(obj, key)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_events(session, flush_context):
+    for key, objects in (
+        (_NEW_GAMES, session.new),
+        (_DELETED_GAMES, session.deleted),
+    ):
+        game_ids = {_object_id(obj) for obj in objects if isinstance(obj, Game)}
+        if game_ids:
+            session.info.setdefault(key, set()).update(game_ids)
+
+    # Seats first, so a player joining with a buy-in is seated before it
+    for obj in session.new:
+        if isinstance(obj, UserGame):
+            record_game_event(session, obj.game_id, PLAYER_JOINED, obj.user_id)
+    for change, objects in (
+        ("new", session.new),
+        ("dirty", session.dirty),
+        ("deleted", session.deleted),
+    ):
+        rows = [obj for obj in objects if type(obj) in _LEDGER_MODELS]
+        rows.sort(key=lambda o: (LEDGERS.index(_LEDGER_MODELS[type(o)]), o.id))
+        for obj in rows:
+            _ledger_event(session, obj, change)
+    for obj in session.deleted:
+        if isinstance(obj, UserGame):
+            values = inspect(obj).dict
+            record_game_event(
+                session, values.get("game_id"), PLAYER_REMOVED, values.get("user_id")
+            )
+
+
+def rebuild_players(connection: Connection, game_id: int) -> Dict[str, Dict]:
+    """A game's table state computed from its seats and ledgers."""
+    players = {}
+    seated = select(UserGame.user_id).where(UserGame.game_id == game_id)
+    for (user_id,) in connection.execute(seated):
+        players[str(user_id)] = empty_totals()
+
+    buy_ins = (
+        select(BuyIn.user_id, func.sum(BuyIn.amount))
+        .where(BuyIn.game_id == game_id)
+        .group_by(BuyIn.user_id)
+    )
+    for user_id, amount in connection.execute(buy_ins):
+        apply_event(
+            players,
+            {
+                "type": "buy_in",
+                "user_id": user_id,
+                "amount": amount,
+                "status": _BUY_IN_STATUS,
+            },
+        )
+    for model, kind in ((AddOn, "add_on"), (CashOut, "cash_out")):
+        totals = (
+            select(model.user_id, model.status, func.sum(model.amount))
+            .where(model.game_id == game_id)
+            .group_by(model.user_id, model.status)
+        )
+        for user_id, status, amount in connection.execute(totals):
+            apply_event(
+                players,
+                {
+                    "type": kind,
+                    "user_id": user_id,
+                    "amount": amount,
+                    "status": _status_value(status),
+                },
+            )
+    return players
+
+
+def _append(connection: Connection, game_id: int, events: List[Dict], new: bool):
+    now = datetime.now()
+    snapshot = None
+    if not new:
+        # The row lock orders concurrent writers of the game
+        snapshot = connection.execute(
+            select(GameSnapshot.seq, GameSnapshot.players)
+            .where(GameSnapshot.game_id == game_id)
+            .with_for_update()
+        ).one_or_none()
+
+    rebuilt = False
+    if snapshot is not None:
+        seq, players = snapshot.seq, dict(snapshot.players)
+    elif new:
+        seq, players = 0, {}
+    else:
+        # Started before the log existed. The ledgers already include these
+        # events, so the rebuilt state is the one after them.
+        seq = connection.execute(
+            select(func.coalesce(func.max(GameEvent.seq), 0)).where(
+                GameEvent.game_id == game_id
+            )
+        ).scalar()
+        players = rebuild_players(connection, game_id)
+        rebuilt = True
+
+    for game_event in events:
+        seq += 1
+        game_event.update(seq=seq, created_at=now)
+        if not rebuilt:
+            apply_event(players, game_event)
+    if events:
+        connection.execute(insert(GameEvent), events)
+
+    values = {"seq": seq, "players": players, "updated_at": now}
+    if snapshot is not None:
+        connection.execute(
+            update(GameSnapshot).where(GameSnapshot.game_id == game_id).values(values)
+        )
+    else:
+        connection.execute(insert(GameSnapshot).values(game_id=game_id, **values))
+
+
+def backfill_snapshots(db: Session, batch_size: int = 500) -> int:
+    """
+    Writes the snapshot of every running game that has none yet, committing
+    every batch_size games. Returns the number of snapshots written.
+    """
+    with_snapshot = select(GameSnapshot.game_id)
+    done = 0
+    while True:
+        game_ids = db.scalars(
+            select(Game.id)
+            .where(Game.running == True, Game.id.not_in(with_snapshot))  # noqa
+            .order_by(Game.id)
+            .limit(batch_size)
+        ).all()
+        if not game_ids:
+            return done
+        connection = db.connection()
+        for game_id in game_ids:
+            _append(connection, game_id, [], new=False)
+        db.commit()
+        done += len(game_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_events(session):
+    # Flush first: the commit's own flush would run after this hook
+    session.flush()
+    events = session.info.pop(_EVENTS, [])
+    new_games = session.info.pop(_NEW_GAMES, set())
+    deleted_games = session.info.pop(_DELETED_GAMES, set())
+    by_game = {game_id: [] for game_id in sorted(new_games)}
+    for game_event in events:
+        by_game.setdefault(game_event["game_id"], []).append(game_event)
+    for game_id in deleted_games:
+        by_game.pop(game_id, None)  # its log is deleted with it
+    if not by_game:
+        return
+    connection = session.connection()
+    for game_id, game_events in by_game.items():
+        _append(connection, game_id, game_events, new=game_id in new_games)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session):
+    for key in (_EVENTS, _NEW_GAMES, _DELETED_GAMES):
+        session.info.pop(key, None)
@@ -0,0 +1,186 @@
+"""
+Cache invalidation across gunicorn workers.
+
+Every committed change to games, teams, users and chip structures publishes
+invalidation keys ("game:12", "team:3", "user:5", "chip_structure:7") to all
+workers, so in-process caches (see backend/core/cache.py) can drop what the
+change made stale, whichever worker made it.
+
+Keys are collected from the objects each flush writes. Bulk statements
+(query.update/delete, insert()) bypass the unit of work, so code issuing
+them adds its keys with invalidate(). The keys are published on commit and
+dropped on rollback:
+- on PostgreSQL with one NOTIFY sent in the committing transaction, so it is
+  delivered if and only if the commit succeeds; every worker LISTENs on a
+  dedicated connection (start_listener),
+- always in the committing process right after the commit, so the worker
+  that wrote never serves its own stale data, and in SQLite mode (a single
+  process) that is all that is needed.
+"""
+import logging
+import select
+import threading
+from typing import Callable, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEYS = "invalidation_keys"
+# Objects of these tables are keyed by their own id ...
+_KEYED_TABLES = {"game", "team", "user", "chip_structure"}
+# ... and every row is keyed by what it references
+_REFERENCES = {
+    "game_id": "game",
+    "team_id": "team",
+    "user_id": "user",
+    "chip_structure_id": "chip_structure",
+}
+# NOTIFY payloads must be shorter than 8000 bytes
+_MAX_PAYLOAD = 7900
+
+_subscribers: List[Callable[[Set[str]], None]] = []
+
+
+def subscribe(callback: Callable[[Set[str]], None]) -> None:
+    """Calls callback with every published set of keys, in every worker."""
+    _subscribers.append(callback)
+
+
+def _deliver(keys: Set[str]) -> None:
+    for callback in list(_subscribers):
+        try:
+            callback(keys)
+        except Exception:
+            logger.exception("Cache invalidation subscriber failed")
+
+
+def invalidate(db: Session, *keys: str) -> None:
+    """Publishes keys when db's transaction commits."""
+    db.info.setdefault(_KEYS, set()).update(keys)
+
+
+def object_keys(obj) -> Set[str]:
+    state = inspect(obj)
+    table = getattr(state.mapper.local_table, "name", None)
+    keys = set()
+    if table in _KEYED_TABLES and state.identity:
+        keys.add(f"{table}:{state.identity[0]}")
+    # Loaded values only, expired ones would be loaded mid-flush; the
+    # committed value is the previous one (e.g. moved to another game) or a
+    # placeholder for new objects
+    for column, prefix in _REFERENCES.items():
+        for value in (state.dict.get(column), state.committed_state.get(column)):
+            if isinstance(value, int):
+                keys.add(f"{prefix}:{value}")
+    return keys
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_keys(session, flush_context):
+    keys = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        keys |= object_keys(obj)
+    if keys:
+        session.info.setdefault(_KEYS, set()).update(keys)
+
+
+def _payloads(keys: Iterable[str]) -> List[str]:
+    payloads, current = [], ""
+    for key in sorted(keys):
+        if current and len(current) + len(key) + 1 > _MAX_PAYLOAD:
+            payloads.append(current)
+            current = ""
+        current = f"{current} {key}" if current else key
+    if current:
+        payloads.append(current)
+    return payloads
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_other_workers(session):
+    # Flush first: the commit's own flush would run after this hook
+    session.flush()
+    keys = session.info.get(_KEYS)
+    if not keys:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    for payload in _payloads(keys):
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": settings.CACHE_INVALIDATION_CHANNEL, "payload": payload},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_this_worker(session):
+    keys = session.info.pop(_KEYS, None)
+    if keys:
+        _deliver(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_keys(session):
+    session.info.pop(_KEYS, None)
+
+
+class InvalidationListener(threading.Thread):
+    """
+    LISTENs for the keys published by other workers on a connection of its
+    own. After losing the connection everything is invalidated (key "*"),
+    since notifications sent in the meantime are lost.
+    """
+
+    def __init__(self, engine):
+        super().__init__(name="cache-invalidation-listener", daemon=True)
+        self.engine = engine
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Cache invalidation listener lost its connection")
+            _deliver({"*"})
+            self.stopped.wait(settings.CACHE_INVALIDATION_RECONNECT_SECONDS)
+
+    def _listen(self):
+        raw = self.engine.raw_connection()
+        raw.detach()  # held for good, so not taken from the pool's budget
+        connection = raw.driver_connection
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{settings.CACHE_INVALIDATION_CHANNEL}"')
+            while not self.stopped.is_set():
+                if select.select([connection], [], [], 5) == ([], [], []):
+                    continue
+                connection.poll()
+                keys = set()
+                while connection.notifies:
+                    keys.update(connection.notifies.pop(0).payload.split())
+                if keys:
+                    _deliver(keys)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+
+
+def start_listener(engine) -> Optional[InvalidationListener]:
+    """
+    Starts listening for other workers' keys; call once per worker process,
+    after the fork. Nothing to do without PostgreSQL.
+    """
+    if engine.dialect.name != "postgresql":
+        return None
+    listener = InvalidationListener(engine)
+    listener.start()
+    return listener
@@ -0,0 +1,77 @@
+"""
+Keyset (cursor) pagination. A page continues after the sort value and id
+of the last row shown, instead of skipping OFFSET rows, so every page costs
+one index range scan however deep into the list it is.
+
+Cursors are opaque to clients: the last row's (sort value, id) as
+URL-safe base64 JSON. A cursor that doesn't decode starts from the top.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str]  # None on the last page
+
+
+def encode_cursor(value, row_id: int) -> str:
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort_column) -> Optional[Tuple[Any, int]]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        python_type = sort_column.type.python_type
+        if python_type is date:
+            value = date.fromisoformat(value)
+        elif python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif value is not None:
+            value = python_type(value)
+        return value, int(row_id)
+    except (ValueError, TypeError, NotImplementedError):
+        return None
+
+
+def paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    key: Callable[[Any], Tuple[Any, int]],
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    limit: int = 50,
+) -> Page:
+    """
+    One page of `query` ordered by (sort_column, id_column). `key` returns the
+    (sort value, id) of a result row, used for the next cursor. The sort
+    column must not be NULL, or rows would be skipped.
+    """
+    after = decode_cursor(cursor, sort_column)
+    if after is not None:
+        position = tuple_(sort_column, id_column)
+        query = query.filter(position < after if descending else position > after)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(items=rows, next_cursor=None)
+    rows = rows[:limit]
+    return Page(items=rows, next_cursor=encode_cursor(*key(rows[-1])))
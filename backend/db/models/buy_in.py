@@ -1,5 +1,5 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, Integer, Float, DateTime
+from sqlalchemy.orm import column_property, relationship
 
 from backend.db.base_class import Base
 
@@ -8,9 +8,11 @@ class BuyIn(Base):
     __tablename__ = "buy_in"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"))
-    game_id = Column(Integer, ForeignKey("game.id"))
-    time = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
+    game_id = Column(Integer, ForeignKey("game.id", ondelete="CASCADE"), index=True)
+    time = Column(DateTime, nullable=False)
+    # The values before an edit are loaded even when the object was expired,
+    # for the game's event log (see backend/db/game_events.py)
+    amount = column_property(Column(Float, nullable=False), active_history=True)
 
     user = relationship("User", back_populates="buy_ins")
     game = relationship("Game", back_populates="buy_ins")
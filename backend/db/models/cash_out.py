@@ -1,5 +1,5 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Float, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, Integer, Float, Enum, DateTime
+from sqlalchemy.orm import column_property, relationship
 
 from backend.db.base_class import Base
 from backend.db.models.player_request_status import (
@@ -12,15 +12,25 @@ class CashOut(Base):
     __tablename__ = "cash_out"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"))
-    game_id = Column(Integer, ForeignKey("game.id"))
-    time = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
-    status = Column(
-        PlayerRequestStatusEnum, default=PlayerRequestStatus.REQUESTED, nullable=False
+    game_id = Column(Integer, ForeignKey("game.id", ondelete="CASCADE"), index=True)
+    time = Column(DateTime, nullable=False)
+    # The values before an edit are loaded even when the object was expired,
+    # for the game's event log (see backend/db/game_events.py)
+    amount = column_property(Column(Float, nullable=False), active_history=True)
+    status = column_property(
+        Column(
+            PlayerRequestStatusEnum,
+            default=PlayerRequestStatus.REQUESTED,
+            nullable=False,
+        ),
+        active_history=True,
     )
 
     chip_amounts = relationship(
-        "ChipAmount", back_populates="cash_out", cascade="all, delete-orphan"
+        "ChipAmount",
+        back_populates="cash_out",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     user = relationship("User", back_populates="cash_outs")
     game = relationship("Game", back_populates="cash_outs")
@@ -11,7 +11,9 @@ class ChipAmount(Base):
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Integer, nullable=False)
     chip_id = Column(Integer, ForeignKey("chip.id"))
-    cash_out_id = Column(Integer, ForeignKey("cash_out.id"))
+    cash_out_id = Column(
+        Integer, ForeignKey("cash_out.id", ondelete="CASCADE"), index=True
+    )
 
     cash_out = relationship("CashOut", back_populates="chip_amounts")
     chip = relationship("Chip")
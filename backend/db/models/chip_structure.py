@@ -8,7 +8,7 @@ class ChipStructure(Base):
     __tablename__ = "chip_structure"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    team_id = Column(Integer, ForeignKey("team.id"))
+    team_id = Column(Integer, ForeignKey("team.id", ondelete="SET NULL"))
 
     team = relationship("Team", back_populates="chip_structure", foreign_keys=[team_id])
     games = relationship("Game", back_populates="chip_structure")
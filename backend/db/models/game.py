@@ -1,5 +1,5 @@
 from ecdsa.curves import Curve
-from sqlalchemy import Column, ForeignKey, Integer, String, Float, Boolean, DateTime
+from sqlalchemy import Column, ForeignKey, Integer, Float, Boolean, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from backend.db.base_class import Base
@@ -9,14 +9,17 @@ from backend.db.models.chip_structure import ChipStructure  # direct import for
 class Game(Base):
     __tablename__ = "game"
     id = Column(Integer, primary_key=True, index=True)
-    date = Column(
-        String, nullable=False
-    )  # Consider using Date or DateTime type instead of String
+    date = Column(Date, nullable=False)
     start_time = Column(DateTime, nullable=True)
     finish_time = Column(DateTime, nullable=True)
     default_buy_in = Column(Float, nullable=False)
     running = Column(Boolean, nullable=False)
 
+    # Written with the game's results when it is finished, so game lists can
+    # be sorted and paged on them in the database. 0 while running.
+    pot = Column(Float, nullable=False, default=0.0, server_default="0")
+    player_count = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Owner (Many-to-One: Many games owned by one user)
     owner_id = Column(Integer, ForeignKey("user.id"))
     owner = relationship("User", back_populates="games_owned", foreign_keys=[owner_id])
@@ -24,22 +27,59 @@ class Game(Base):
     book_keeper_id = Column(Integer, ForeignKey("user.id"), nullable=True)
     book_keeper = relationship("User", foreign_keys=[book_keeper_id])
 
-    team_id = Column(Integer, ForeignKey("team.id"))
+    team_id = Column(Integer, ForeignKey("team.id", ondelete="CASCADE"))
     team = relationship("Team", back_populates="games")
 
     chip_structure_id = Column(Integer, ForeignKey("chip_structure.id"))
     chip_structure = relationship("ChipStructure", back_populates="games")
 
     # Players in this team (Many-to-Many)
+    # The ledger rows are removed by ON DELETE CASCADE in the database;
+    # passive_deletes keeps the ORM from loading them just to delete them.
     user_associations = relationship(
         "UserGame",
         back_populates="game",
         cascade="all, delete-orphan",  # Recommended for Association Objects
+        passive_deletes=True,
+    )
+    buy_ins = relationship(
+        "BuyIn",
+        back_populates="game",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    add_ons = relationship(
+        "AddOn",
+        back_populates="game",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
-    buy_ins = relationship("BuyIn", back_populates="game", cascade="all, delete-orphan")
-    add_ons = relationship("AddOn", back_populates="game", cascade="all, delete-orphan")
     cash_outs = relationship(
-        "CashOut", back_populates="game", cascade="all, delete-orphan"
+        "CashOut",
+        back_populates="game",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    results = relationship(
+        "GameResult",
+        back_populates="game",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        # Partial index: the home page only ever looks for running games
+        Index(
+            "ix_game_running_team_id",
+            team_id,
+            postgresql_where=(running == True),
+            sqlite_where=(running == True),
+        ),
+        # Year-filtered team stats scan this as a range
+        Index("ix_game_team_id_date", team_id, date),
+        # Keyset pages of a team's games sorted by pot or players
+        Index("ix_game_team_id_pot", team_id, pot, id),
+        Index("ix_game_team_id_player_count", team_id, player_count, id),
     )
 
     @property
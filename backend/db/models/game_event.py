@@ -0,0 +1,60 @@
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+
+from backend.db.base_class import Base
+
+
+class GameEvent(Base):
+    """
+    One change to a game's table, in the order they happened: seq counts
+    1, 2, 3, ... per game. Only ever appended (see backend/db/game_events.py).
+
+    Ledger events (buy_in, add_on_requested, add_on_approved, cash_out_edited,
+    ...) carry the entry's amount and status before and after the change;
+    player_joined and player_removed only the player.
+    """
+
+    __tablename__ = "game_event"
+    id = Column(Integer, primary_key=True)
+    game_id = Column(
+        Integer, ForeignKey("game.id", ondelete="CASCADE"), nullable=False
+    )
+    seq = Column(Integer, nullable=False)
+    type = Column(String(32), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    # Id of the buy-in, add-on or cash-out; NULL for player events
+    entity_id = Column(Integer, nullable=True)
+    amount = Column(Float, nullable=True)
+    previous_amount = Column(Float, nullable=True)
+    status = Column(String(16), nullable=True)
+    previous_status = Column(String(16), nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Also the index for reading a game's events since a seq
+        UniqueConstraint("game_id", "seq", name="uq_game_event_game_seq"),
+    )
+
+
+class GameSnapshot(Base):
+    """
+    A game's table state after event seq: players' totals as built by
+    backend/core/game_state.py. Updated in the transaction appending the
+    events, with its row lock ordering concurrent writers of one game.
+    """
+
+    __tablename__ = "game_snapshot"
+    game_id = Column(
+        Integer, ForeignKey("game.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq = Column(Integer, nullable=False, default=0)
+    players = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
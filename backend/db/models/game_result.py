@@ -0,0 +1,67 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+
+from backend.db.base_class import Base
+
+
+class GameResult(Base):
+    """
+    One player's result in a finished game. Written when the game is
+    finished and rewritten as a whole when its history is edited; never
+    updated row by row. Statistics read these instead of the ledger tables.
+    """
+
+    __tablename__ = "game_result"
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(
+        Integer, ForeignKey("game.id", ondelete="CASCADE"), nullable=False
+    )
+    team_id = Column(
+        Integer, ForeignKey("team.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+
+    # Copied from the game, so results can be filtered and weighted by time
+    # without a join
+    game_date = Column(Date, nullable=False)
+    played_at = Column(DateTime, nullable=False)
+    duration_hours = Column(Float, nullable=False, default=0.0)
+
+    buy_in = Column(Float, nullable=False, default=0.0)
+    add_on = Column(Float, nullable=False, default=0.0)  # approved only
+    investment = Column(Float, nullable=False, default=0.0)
+    cash_out = Column(Float, nullable=False, default=0.0)  # approved only
+    net = Column(Float, nullable=False, default=0.0)
+
+    # Game-wide values, the same on every row of the game
+    player_count = Column(Integer, nullable=False)
+    pot = Column(Float, nullable=False)
+    # 1 = biggest winner; equal results share a position
+    position = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime, nullable=False)
+
+    game = relationship("Game", back_populates="results")
+    user = relationship("User")
+
+    __table_args__ = (
+        UniqueConstraint("game_id", "user_id", name="uq_game_result_game_user"),
+        Index("ix_game_result_team_id_game_date", team_id, game_date),
+        # A player's history in a team, paged by date
+        Index(
+            "ix_game_result_user_id_team_id_played_at",
+            user_id,
+            team_id,
+            played_at,
+            id,
+        ),
+    )
@@ -1,25 +1,76 @@
-from sqlalchemy import Column, Enum, ForeignKey, Integer, String, Boolean
+from sqlalchemy import (
+    Column,
+    Enum,
+    ForeignKey,
+    Integer,
+    Sequence,
+    String,
+    Boolean,
+    Float,
+)
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import false
 
 from backend.db.base_class import Base
 
+# Numbers handed out as team search codes (see backend/core/team_codes.py).
+# Not created on SQLite, where the next team id is used instead.
+TEAM_CODE_SEQUENCE = Sequence(
+    "team_search_code_seq", start=0, minvalue=0, metadata=Base.metadata
+)
+
 
 class Team(Base):
     __tablename__ = "team"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
-    search_code = Column(String(200), nullable=False)
+    # Unique, so joining by code is a point lookup and a duplicate can't be
+    # inserted even if the allocator were misconfigured
+    search_code = Column(String(200), nullable=False, unique=True, index=True)
+    # Bumped whenever a game of this team is created, finished or deleted,
+    # so pollers can detect changes without reading the games themselves.
+    games_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Time decay of results in player stats; NULL means the global default.
+    time_decay_grace_days = Column(Integer, nullable=True)
+    time_decay_rate = Column(Float, nullable=True)
+    # Set when the team is hidden from its members to be deleted in the
+    # background; teams left marked by a failed or interrupted delete are
+    # finished off by backend/db/tools/delete_hidden_teams.py.
+    deleting = Column(Boolean, nullable=False, default=False, server_default=false())
 
     # Players in this team (Many-to-Many)
     user_associations = relationship(
         "UserTeam",
         back_populates="team",
         cascade="all, delete-orphan",  # Recommended for Association Objects
+        passive_deletes=True,
     )
 
-    games = relationship("Game", back_populates="team", cascade="all, delete-orphan")
-    chip_structure = relationship("ChipStructure", back_populates="team", foreign_keys="ChipStructure.team_id")
-    default_chip_structure_id = Column(Integer, ForeignKey("chip_structure.id"), nullable=True)
+    # Deleted (games) or detached (chip structures) by the database, see
+    # ON DELETE on their foreign keys
+    games = relationship(
+        "Game",
+        back_populates="team",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    chip_structure = relationship(
+        "ChipStructure",
+        back_populates="team",
+        foreign_keys="ChipStructure.team_id",
+        passive_deletes=True,
+    )
+    # chip_structure references team too; use_alter breaks the cycle so the
+    # tables can be created and dropped in order
+    default_chip_structure_id = Column(
+        Integer,
+        ForeignKey(
+            "chip_structure.id",
+            use_alter=True,
+            name="team_default_chip_structure_id_fkey",
+        ),
+        nullable=True,
+    )
     default_chip_structure = relationship("ChipStructure", foreign_keys=[default_chip_structure_id])
 
     @property
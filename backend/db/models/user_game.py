@@ -14,7 +14,9 @@ class UserGame(Base):
     __tablename__ = "user_game_association"
 
     user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
-    game_id = Column(Integer, ForeignKey("game.id"), primary_key=True)
+    game_id = Column(
+        Integer, ForeignKey("game.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
 
     status = Column(
         PlayerRequestStatusEnum, default=PlayerRequestStatus.REQUESTED, nullable=False
@@ -16,7 +16,9 @@ class UserTeam(Base):
     __tablename__ = "user_team_association"
 
     user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
-    team_id = Column(Integer, ForeignKey("team.id"), primary_key=True)
+    team_id = Column(
+        Integer, ForeignKey("team.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
 
     status = Column(
         PlayerRequestStatusEnum, default=PlayerRequestStatus.REQUESTED, nullable=False
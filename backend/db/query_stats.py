@@ -0,0 +1,123 @@
+"""
+Per-request SQL statistics: statement count, total DB time and statements
+repeated with the same shape (the usual sign of an N+1 loop).
+
+Engine events record into the QueryStats of the current context, which the
+HTTP middleware sets up for every request and reports as `Server-Timing` /
+`X-DB-Queries` headers and a structured log line.
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar(
+    "query_stats", default=None
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"IN \((?:[^()]*)\)", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with whitespace and IN (...) lists collapsed."""
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+        self.parent = parent
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement_shape(statement)] += 1
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+    def repeated(self, threshold: int = None) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times, most frequent first."""
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return [(s, n) for s, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.total_time * 1000:.1f}ms"]
+        for shape, count in self.shapes.most_common():
+            lines.append(f"  {count}x {shape}")
+        return "\n".join(lines)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None or not conn.info.get("query_start_time"):
+        return
+    stats.record(statement, time.perf_counter() - conn.info["query_start_time"].pop())
+
+
+@contextmanager
+def track_queries():
+    """
+    Collects the statements executed in this context (and its threadpool
+    calls). Nested trackers also report to the enclosing one.
+    """
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def install_query_stats_middleware(app: FastAPI) -> None:
+    @app.middleware("http")
+    async def query_stats_middleware(request: Request, call_next):
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = await call_next(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = stats.total_time * 1000
+
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries", total;dur={total_ms:.1f}'
+        )
+
+        repeated = stats.repeated()
+        log = {
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 1),
+            "db_queries": stats.count,
+            "db_time_ms": round(db_ms, 1),
+        }
+        if repeated:
+            log["repeated_queries"] = [
+                {"count": count, "statement": shape} for shape, count in repeated
+            ]
+            logger.warning(json.dumps(log))
+        else:
+            logger.info(json.dumps(log))
+        return response
@@ -0,0 +1,120 @@
+"""
+Routing of read-only requests to a PostgreSQL read replica.
+
+Heavy read-only routes (stats, history, predictions) depend on get_read_db
+instead of get_db. They are served from REPLICA_DATABASE_URL unless:
+- no replica is configured,
+- the replica is unreachable or more than REPLICA_MAX_LAG_SECONDS behind,
+- the user wrote something in the last READ_YOUR_WRITES_SECONDS (tracked
+  with a cookie set on every successful write request), so they always see
+  their own changes.
+"""
+import threading
+import time
+from typing import Generator, Optional
+
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings
+from backend.db.session import ReplicaSessionLocal, get_db
+
+LAST_WRITE_COOKIE = "last_write"
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Zero while the replica has replayed everything it received; otherwise the
+# age of the last replayed transaction.
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaLagMonitor:
+    """Replica lag, checked at most every REPLICA_LAG_CHECK_INTERVAL seconds."""
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+        self.lag: Optional[float] = None  # None: unknown or unreachable
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def current_lag(self) -> Optional[float]:
+        # The lock only claims the check; requests arriving while the replica
+        # is queried get the previous value instead of waiting for it
+        with self.lock:
+            now = time.monotonic()
+            due = now - self.checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL
+            if due:
+                self.checked_at = now
+            else:
+                return self.lag
+        lag = self._measure()
+        with self.lock:
+            self.lag = lag
+        return lag
+
+    def _measure(self) -> Optional[float]:
+        try:
+            with self.session_factory() as db:
+                return float(db.execute(_LAG_QUERY).scalar())
+        except Exception:
+            return None
+
+    def healthy(self) -> bool:
+        lag = self.current_lag()
+        return lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+lag_monitor = (
+    ReplicaLagMonitor(ReplicaSessionLocal) if ReplicaSessionLocal is not None else None
+)
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+
+def use_replica(request: Request) -> bool:
+    return (
+        lag_monitor is not None
+        and not wrote_recently(request)
+        and lag_monitor.healthy()
+    )
+
+
+def get_read_db(
+    request: Request, db: Session = Depends(get_db)
+) -> Generator:
+    """
+    Session for read-only routes: the replica when it can be used, the
+    primary session from get_db otherwise.
+    """
+    if not use_replica(request):
+        yield db
+        return
+    replica_db = ReplicaSessionLocal()
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+def install_read_your_writes_middleware(app: FastAPI) -> None:
+    @app.middleware("http")
+    async def read_your_writes_middleware(request: Request, call_next):
+        response = await call_next(request)
+        if request.method in _WRITE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                LAST_WRITE_COOKIE,
+                str(int(time.time())),
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="lax",
+            )
+        return response
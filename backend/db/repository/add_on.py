@@ -10,6 +10,7 @@ from backend.db.models.add_on import AddOn
 from backend.db.models.game import Game
 from backend.db.models.player_request_status import PlayerRequestStatus
 from backend.db.models.user import User
+from backend.db.repository.game_result import write_game_results
 
 
 def get_player_game_addons(user: User, game: Game, db: Session) -> List[AddOn]:
@@ -53,7 +54,7 @@ def create_add_on_request(
     new_addon = AddOn(
         user_id=user.id,
         game_id=game.id,
-        time=datetime.today().isoformat(),
+        time=datetime.now(),
         amount=amount,
         status=PlayerRequestStatus.REQUESTED,
     )
@@ -85,6 +86,7 @@ def update_add_on_status(
     """
     add_on.status = new_status
     db.add(add_on)
+    write_game_results([add_on.game], db)  # no-op while the game is running
     db.commit()
     db.refresh(add_on)
     return add_on
@@ -1,16 +1,20 @@
 from datetime import datetime
-from typing import List
+from typing import List, Tuple
 
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert
 
 from backend.apis.v1.route_login import get_current_user_from_token
+from backend.db.game_events import record_game_event
+from backend.db.invalidation import invalidate
 from backend.db.models.cash_out import CashOut
 from backend.db.models.chip_amount import ChipAmount
 from backend.db.models.game import Game
 from backend.db.models.player_request_status import PlayerRequestStatus
 from backend.db.models.user import User
+from backend.db.repository.game_result import write_game_results
+from backend.schemas.chip_amount import ChipAmountCreate
 
 
 def get_player_game_cash_out(user: User, game: Game, db: Session) -> List[CashOut]:
@@ -36,7 +40,7 @@ def create_cash_out_request(
     new_cash_out = CashOut(
         user_id=user.id,
         game_id=game.id,
-        time=datetime.now().isoformat(),
+        time=datetime.now(),
         amount=amount,
         status=PlayerRequestStatus.REQUESTED,
     )
@@ -55,6 +59,55 @@ def create_cash_out_request(
     return new_cash_out
 
 
+def create_cash_outs(
+    game: Game,
+    rows: List[Tuple[int, float, List[ChipAmountCreate]]],
+    status: PlayerRequestStatus,
+    db: Session,
+) -> List[int]:
+    """
+    Creates a cash-out for every (user_id, amount, chip amounts) row with two
+    multi-row INSERTs, one for the cash-outs and one for all their chip
+    amounts. Doesn't commit. Returns the new cash-out ids in row order.
+    """
+    if not rows:
+        return []
+    now = datetime.now()
+    cash_out_ids = db.scalars(
+        insert(CashOut).returning(CashOut.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": user_id,
+                "game_id": game.id,
+                "time": now,
+                "amount": amount,
+                "status": status,
+            }
+            for user_id, amount, _ in rows
+        ],
+    ).all()
+    for cash_out_id, (user_id, amount, _) in zip(cash_out_ids, rows):
+        record_game_event(
+            db,
+            game.id,
+            f"cash_out_{status.value.lower()}",
+            user_id,
+            cash_out_id,
+            amount,
+            status=status,
+        )
+    chip_amounts = [
+        {"cash_out_id": cash_out_id, "chip_id": chip.chip_id, "amount": chip.amount}
+        for cash_out_id, (_, _, chips) in zip(cash_out_ids, rows)
+        for chip in chips
+    ]
+    if chip_amounts:
+        db.execute(insert(ChipAmount), chip_amounts)
+    db.expire(game, ["cash_outs"])
+    invalidate(db, f"game:{game.id}", *(f"user:{user_id}" for user_id, _, _ in rows))
+    return cash_out_ids
+
+
 def get_cash_out_by_id(cash_out_id: int, db: Session) -> CashOut | None:
     """
     Retrieve a single CashOut entry by its ID.
@@ -75,6 +128,7 @@ def update_cash_out_status(
     """
     cash_out.status = new_status
     db.add(cash_out)
+    write_game_results([cash_out.game], db)  # no-op while the game is running
     db.commit()
     db.refresh(cash_out)
     return cash_out
@@ -2,9 +2,11 @@ from sqlite3 import IntegrityError
 from typing import List, Type, Optional
 
 from fastapi import Depends
+from sqlalchemy import and_, extract, false, func
 from sqlalchemy.orm import Session
 
 from backend.apis.v1.route_login import get_current_user_from_token
+from backend.db.keyset import Page, paginate
 from backend.db.models.game import Game
 from backend.db.models.player_request_status import PlayerRequestStatus
 from backend.db.models.user import User
@@ -12,6 +14,7 @@ from backend.db.models.user_game import UserGame
 from backend.db.repository.add_on import get_player_game_addons
 from backend.db.repository.buy_in import get_player_game_buy_ins
 from backend.db.repository.cash_out import get_player_game_cash_out
+from backend.db.repository.team import bump_team_games_version
 from backend.db.session import get_db
 from backend.schemas.games import GameCreate
 from datetime import date
@@ -28,6 +31,8 @@ def create_new_game_db(
         **game.model_dump(),
     )
     db.add(new_game)
+    db.flush()
+    bump_team_games_version(new_game.team_id, db)
     db.commit()
     db.refresh(new_game)
 
@@ -106,19 +111,19 @@ def finish_the_game(
 ):
     """
     Mark a game as finished (running = False). Only an admin can finish the game.
+    Open requests are declined and the game's result rows written in the same
+    transaction.
     """
+    from backend.db.repository.game_result import write_game_results
+    from backend.db.repository.settlement import decline_pending_requests
     from backend.db.repository.team import is_user_admin
 
     if not (is_user_admin(user.id, game.team_id, db) or user.id == game.owner_id):
         raise PermissionError("Only an admin or the game owner can finish the game.")
 
-    add_ons = get_game_add_on_requests(game, db)
-    cash_outs = get_game_cash_out_requests(game, db)
-    for request in add_ons + cash_outs:
-        request.status = PlayerRequestStatus.DECLINED
-        db.add(request)
-
+    decline_pending_requests(game, db)
     game.running = False
+    bump_team_games_version(game.team_id, db)
 
     if finish_time:
         try:
@@ -132,11 +137,66 @@ def finish_the_game(
             pass  # ignore invalid time formats, keep default (or none)
 
     db.add(game)
+    write_game_results([game], db)
     db.commit()
     db.refresh(game)
     return game
 
 
+def game_year_filter(year):
+    """
+    Range predicate on Game.date for games played in the given year, so the
+    (team_id, date) index can be used instead of a pattern match.
+    """
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return false()
+    return and_(Game.date >= date(year, 1, 1), Game.date < date(year + 1, 1, 1))
+
+
+def get_team_game_years(team_id: int, db: Session) -> List[int]:
+    """
+    Returns the distinct years the team played in, newest first.
+    """
+    year = extract("year", Game.date)
+    rows = (
+        db.query(year)
+        .filter(Game.team_id == team_id)
+        .distinct()
+        .order_by(year.desc())
+        .all()
+    )
+    return [int(row[0]) for row in rows if row[0] is not None]
+
+
+def get_user_running_games(user_id: int, db: Session):
+    """
+    Returns running games of all teams the user belongs to, as lightweight rows
+    (id, date, start_time, running, team_id, is_player) in a single query.
+    """
+    from backend.db.models.user_team import UserTeam
+
+    return (
+        db.query(
+            Game.id,
+            Game.date,
+            Game.start_time,
+            Game.running,
+            Game.team_id,
+            UserGame.user_id.isnot(None).label("is_player"),
+        )
+        .join(UserTeam, UserTeam.team_id == Game.team_id)
+        .outerjoin(
+            UserGame,
+            (UserGame.game_id == Game.id) & (UserGame.user_id == user_id),
+        )
+        .filter(UserTeam.user_id == user_id, Game.running == True)
+        .order_by(Game.start_time.desc(), Game.id.desc())
+        .all()
+    )
+
+
 def get_user_games_count(user: User, db: Session) -> int:
     return len(user.games_played)
 
@@ -198,51 +258,95 @@ def delete_game_by_id(game_id: int, db: Session) -> bool:
     if not game:
         return False
 
+    bump_team_games_version(game.team_id, db)
     db.delete(game)
     db.commit()
     return True
 
 
-def get_user_past_games(user: User, db: Session, limit: int = None) -> List[Game]:
+def get_user_past_games_count(user: User, db: Session) -> int:
     """
-    Returns list of past (not running) games for all teams the user belongs to.
+    Returns count of past games the user played in, over all their teams.
     """
+    from backend.db.models.game_result import GameResult
+
     team_ids = [team.id for team in user.teams]
     if not team_ids:
-        return []
+        return 0
 
-    query = (
-        db.query(Game)
-        .join(UserGame)
-        .filter(Game.team_id.in_(team_ids))
-        .filter(UserGame.user_id == user.id)
-        .filter(Game.running == False)
-        .order_by(Game.date.desc())
+    return (
+        db.query(func.count(GameResult.id))
+        .filter(GameResult.user_id == user.id, GameResult.team_id.in_(team_ids))
+        .scalar()
     )
 
-    if limit:
-        query = query.limit(limit)
 
-    return query.all()
+PAST_GAMES_PAGE_SIZE = 50
 
+# sort name -> attribute of the page rows holding the sort value
+PAST_GAMES_SORTS = {
+    "date": "date",
+    "players": "players_count",
+    "pot": "total_pot",
+    "balance": "my_balance",
+}
 
-def get_user_past_games_count(user: User, db: Session) -> int:
+
+def get_past_games_page(
+    team_ids: List[int],
+    user_id: int,
+    db: Session,
+    sort: str = "date",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    played_only: bool = False,
+    limit: int = PAST_GAMES_PAGE_SIZE,
+) -> Page:
     """
-    Returns count of past (not running) games for all teams the user belongs to.
+    One keyset page of the finished games of the given teams, sorted in the
+    database. Rows have id, date, start_time, players_count, total_pot and
+    my_balance (the user's net, joined from their result row).
+    With played_only, only games the user has a result in are listed.
     """
-    team_ids = [team.id for team in user.teams]
-    if not team_ids:
-        return 0
-
-    return (
-        db.query(Game)
-        .filter(Game.team_id.in_(team_ids))
-        .filter(Game.running == False)
-        .count()
+    from backend.db.models.game_result import GameResult
+
+    if sort not in PAST_GAMES_SORTS:
+        sort = "date"
+    balance = func.coalesce(GameResult.net, 0.0)
+    sort_column = {
+        "date": Game.date,
+        "players": Game.player_count,
+        "pot": Game.pot,
+        "balance": balance,
+    }[sort]
+
+    query = db.query(
+        Game.id,
+        Game.date,
+        Game.start_time,
+        Game.player_count.label("players_count"),
+        Game.pot.label("total_pot"),
+        balance.label("my_balance"),
+    )
+    own_result = and_(GameResult.game_id == Game.id, GameResult.user_id == user_id)
+    if played_only:
+        query = query.join(GameResult, own_result)
+    else:
+        query = query.outerjoin(GameResult, own_result)
+    query = query.filter(Game.team_id.in_(team_ids), Game.running == False)
+
+    attribute = PAST_GAMES_SORTS[sort]
+    return paginate(
+        query,
+        sort_column,
+        Game.id,
+        key=lambda row: (getattr(row, attribute), row.id),
+        cursor=cursor,
+        descending=order == "desc",
+        limit=limit,
     )
 
 
-from sqlalchemy import func
 from collections import defaultdict
 from typing import Dict, Any
 from backend.db.models.buy_in import BuyIn
@@ -363,99 +467,3 @@ def get_player_games_stats_bulk(
         stats[gid]["balance"] = money_out[gid] - money_in[gid]
 
     return stats
-
-
-def get_user_past_games_stats_bulk(
-    user_id: int, game_ids: List[int], db: Session
-) -> Dict[int, Dict[str, Any]]:
-    """
-    Returns aggregated stats for a specific list of games (past games view).
-    Key: game_id
-    Value: { "my_balance": float, "total_pot": float, "players_count": int }
-    """
-    stats = defaultdict(
-        lambda: {"my_balance": 0.0, "total_pot": 0.0, "players_count": 0}
-    )
-    if not game_ids:
-        return stats
-
-    # 1. Total Pot per Game
-    buy_ins_pot = (
-        db.query(BuyIn.game_id, func.sum(BuyIn.amount))
-        .filter(BuyIn.game_id.in_(game_ids))
-        .group_by(BuyIn.game_id)
-        .all()
-    )
-    for gid, total in buy_ins_pot:
-        if total:
-            stats[gid]["total_pot"] += total
-
-    add_ons_pot = (
-        db.query(AddOn.game_id, func.sum(AddOn.amount))
-        .filter(
-            AddOn.game_id.in_(game_ids), AddOn.status == PlayerRequestStatus.APPROVED
-        )
-        .group_by(AddOn.game_id)
-        .all()
-    )
-    for gid, total in add_ons_pot:
-        if total:
-            stats[gid]["total_pot"] += total
-
-    # 2. Players Count
-    players_counts = (
-        db.query(UserGame.game_id, func.count(UserGame.user_id))
-        .filter(UserGame.game_id.in_(game_ids))
-        .group_by(UserGame.game_id)
-        .all()
-    )
-    for gid, count in players_counts:
-        stats[gid]["players_count"] = count
-
-    # 3. My Balance
-    money_in = defaultdict(float)
-    money_out = defaultdict(float)
-
-    user_buy_ins = (
-        db.query(BuyIn.game_id, func.sum(BuyIn.amount))
-        .filter(BuyIn.game_id.in_(game_ids), BuyIn.user_id == user_id)
-        .group_by(BuyIn.game_id)
-        .all()
-    )
-    for gid, total in user_buy_ins:
-        if total:
-            money_in[gid] += total
-
-    user_add_ons = (
-        db.query(AddOn.game_id, func.sum(AddOn.amount))
-        .filter(
-            AddOn.game_id.in_(game_ids),
-            AddOn.user_id == user_id,
-            AddOn.status == PlayerRequestStatus.APPROVED,
-        )
-        .group_by(AddOn.game_id)
-        .all()
-    )
-    for gid, total in user_add_ons:
-        if total:
-            money_in[gid] += total
-
-    user_cash_outs = (
-        db.query(CashOut.game_id, func.sum(CashOut.amount))
-        .filter(
-            CashOut.game_id.in_(game_ids),
-            CashOut.user_id == user_id,
-            CashOut.status == PlayerRequestStatus.APPROVED,
-        )
-        .group_by(CashOut.game_id)
-        .all()
-    )
-    for gid, total in user_cash_outs:
-        if total:
-            money_out[gid] += total
-
-    for gid in game_ids:
-        # Defaults to 0 if not in dict
-        stats[gid]["my_balance"] = money_out[gid] - money_in[gid]
-
-    return stats
@@ -0,0 +1,47 @@
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.db.game_events import rebuild_players
+from backend.db.models.game_event import GameEvent, GameSnapshot
+
+EVENT_FIELDS = (
+    "seq",
+    "type",
+    "user_id",
+    "entity_id",
+    "amount",
+    "previous_amount",
+    "status",
+    "previous_status",
+)
+
+
+def get_game_events_since(
+    game_id: int, since: int, db: Session, limit: int = None
+) -> List[Dict]:
+    """The game's events after seq since, oldest first, as dicts."""
+    query = (
+        select(*(getattr(GameEvent, field) for field in EVENT_FIELDS))
+        .where(GameEvent.game_id == game_id, GameEvent.seq > since)
+        .order_by(GameEvent.seq)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [dict(row._mapping) for row in db.execute(query)]
+
+
+def get_game_snapshot(game_id: int, db: Session) -> Tuple[int, Dict]:
+    """
+    The game's (seq, players) snapshot. Games without events yet have none
+    stored; their state is computed from the ledgers, at seq 0.
+    """
+    snapshot = db.execute(
+        select(GameSnapshot.seq, GameSnapshot.players).where(
+            GameSnapshot.game_id == game_id
+        )
+    ).one_or_none()
+    if snapshot is None:
+        return 0, rebuild_players(db.connection(), game_id)
+    return snapshot.seq, snapshot.players
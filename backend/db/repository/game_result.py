@@ -0,0 +1,286 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, false, func, or_
+from sqlalchemy.orm import Session
+
+from backend.core.debt_settlement import minimal_transfers
+from backend.db.keyset import Page, paginate
+from backend.db.models.add_on import AddOn
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.cash_out import CashOut
+from backend.db.models.game import Game
+from backend.db.models.game_result import GameResult
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.user import User
+
+
+def _ledger_totals(game_ids: List[int], db: Session) -> Dict[int, Dict[int, Dict]]:
+    """
+    game_id -> user_id -> buy-in, approved add-on and approved cash-out sums.
+    A player took part in a game if they have any of these; players who were
+    seated but never bought in get no result.
+    """
+    totals = defaultdict(
+        lambda: defaultdict(lambda: {"buy_in": 0.0, "add_on": 0.0, "cash_out": 0.0})
+    )
+    ledgers = [
+        ("buy_in", BuyIn, None),
+        ("add_on", AddOn, AddOn.status == PlayerRequestStatus.APPROVED),
+        ("cash_out", CashOut, CashOut.status == PlayerRequestStatus.APPROVED),
+    ]
+    for key, model, condition in ledgers:
+        query = db.query(model.game_id, model.user_id, func.sum(model.amount)).filter(
+            model.game_id.in_(game_ids)
+        )
+        if condition is not None:
+            query = query.filter(condition)
+        for game_id, user_id, amount in query.group_by(model.game_id, model.user_id):
+            totals[game_id][user_id][key] += amount or 0.0
+    return totals
+
+
+def _positions(nets: Dict[int, float]) -> Dict[int, int]:
+    """Competition ranking by net result: 1, 2, 2, 4, ..."""
+    ordered = sorted(nets.values(), reverse=True)
+    return {user_id: ordered.index(net) + 1 for user_id, net in nets.items()}
+
+
+def write_game_results(games: List[Game], db: Session) -> int:
+    """
+    Replaces the result rows of the given finished games with ones computed
+    from their ledgers and sets the games' pot and player count; running
+    games are skipped. Only flushes, so the rows are written in the caller's
+    transaction together with the change that made them necessary.
+    """
+    games = [g for g in games if not g.running]
+    if not games:
+        return 0
+    game_ids = [g.id for g in games]
+    db.flush()  # sessions don't autoflush; the ledger edits must be visible
+    totals = _ledger_totals(game_ids, db)
+
+    db.query(GameResult).filter(GameResult.game_id.in_(game_ids)).delete(
+        synchronize_session=False
+    )
+    now = datetime.now()
+    rows = []
+    for game in games:
+        players = totals.get(game.id, {})
+        game.player_count = len(players)
+        game.pot = sum(t["buy_in"] + t["add_on"] for t in players.values())
+        if not players:
+            continue
+        nets = {}
+        for user_id, t in players.items():
+            t["investment"] = t["buy_in"] + t["add_on"]
+            nets[user_id] = t["cash_out"] - t["investment"]
+        positions = _positions(nets)
+        duration = (
+            (game.finish_time - game.start_time).total_seconds() / 3600
+            if game.start_time and game.finish_time
+            else 0.0
+        )
+        for user_id, t in players.items():
+            rows.append(
+                GameResult(
+                    game_id=game.id,
+                    team_id=game.team_id,
+                    user_id=user_id,
+                    game_date=game.date,
+                    played_at=game.start_time
+                    or datetime.combine(game.date, datetime.min.time()),
+                    duration_hours=duration,
+                    buy_in=t["buy_in"],
+                    add_on=t["add_on"],
+                    investment=t["investment"],
+                    cash_out=t["cash_out"],
+                    net=nets[user_id],
+                    player_count=game.player_count,
+                    pot=game.pot,
+                    position=positions[user_id],
+                    created_at=now,
+                )
+            )
+    db.add_all(rows)
+    db.flush()
+    for game in games:
+        db.expire(game, ["results"])
+    return len(rows)
+
+
+def backfill_game_results(db: Session, batch_size: int = 500) -> int:
+    """
+    Writes results for finished games that have none yet, or whose pot and
+    player count were never set. Returns the number of games processed.
+    """
+    done = 0
+    last_id = 0
+    while True:
+        games = (
+            db.query(Game)
+            .outerjoin(GameResult, GameResult.game_id == Game.id)
+            .filter(
+                Game.running == false(),
+                or_(GameResult.id.is_(None), Game.player_count == 0),
+                Game.id > last_id,
+            )
+            .distinct()
+            .order_by(Game.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not games:
+            return done
+        # Games without any players never get rows; skip past them
+        last_id = games[-1].id
+        write_game_results(games, db)
+        db.commit()
+        done += len(games)
+
+
+def get_team_results(
+    team_id: int, db: Session, year: Optional[str] = None
+) -> List[GameResult]:
+    query = db.query(GameResult).filter(GameResult.team_id == team_id)
+    if year and year != "all":
+        query = query.filter(game_result_year_filter(year))
+    return query.all()
+
+
+def get_net_balances(
+    db: Session,
+    team_id: Optional[int] = None,
+    game_ids: Optional[List[int]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Dict[int, float]:
+    """
+    Every player's summed net result over the selected finished games (of a
+    team, by id and/or with start <= game date < end), in one grouped query.
+    """
+    query = db.query(GameResult.user_id, func.sum(GameResult.net))
+    if team_id is not None:
+        query = query.filter(GameResult.team_id == team_id)
+    if game_ids is not None:
+        query = query.filter(GameResult.game_id.in_(game_ids))
+    if start is not None:
+        query = query.filter(GameResult.game_date >= start)
+    if end is not None:
+        query = query.filter(GameResult.game_date < end)
+    return {user_id: net for user_id, net in query.group_by(GameResult.user_id)}
+
+
+def get_settlement_transfers(db: Session, **filters) -> List[Dict]:
+    """
+    Who pays whom to settle the games selected as in get_net_balances, with
+    the paying and receiving User (None for the pot), largest first.
+    """
+    transfers = minimal_transfers(get_net_balances(db, **filters))
+    user_ids = {t.payer_id for t in transfers} | {t.payee_id for t in transfers}
+    user_ids.discard(None)
+    users = {}
+    if user_ids:
+        users = {u.id: u for u in db.query(User).filter(User.id.in_(user_ids))}
+    return [
+        {
+            "payer": users.get(t.payer_id),
+            "payee": users.get(t.payee_id),
+            "amount": t.amount,
+        }
+        for t in transfers
+    ]
+
+
+def _player_results_query(
+    team_id: int, user_id: int, db: Session, year: Optional[str] = None
+):
+    query = db.query(GameResult).filter(
+        GameResult.user_id == user_id, GameResult.team_id == team_id
+    )
+    if year and year != "all":
+        query = query.filter(game_result_year_filter(year))
+    return query
+
+
+def get_player_summary(
+    team_id: int, user_id: int, db: Session, year: Optional[str] = None
+) -> Dict:
+    """Games played, total balance and balance per hour, in one aggregate."""
+    games_count, total_balance, total_hours = (
+        _player_results_query(team_id, user_id, db, year)
+        .with_entities(
+            func.count(GameResult.id),
+            func.coalesce(func.sum(GameResult.net), 0.0),
+            func.coalesce(func.sum(GameResult.duration_hours), 0.0),
+        )
+        .one()
+    )
+    return {
+        "games_count": games_count,
+        "total_balance": total_balance,
+        "winrate": total_balance / total_hours if total_hours > 0 else 0,
+    }
+
+
+def get_player_balance_points(
+    team_id: int, user_id: int, db: Session, year: Optional[str] = None
+) -> List[Dict]:
+    """Cumulative balance after every game, oldest first, for the chart."""
+    rows = (
+        _player_results_query(team_id, user_id, db, year)
+        .with_entities(GameResult.played_at, GameResult.net)
+        .order_by(GameResult.played_at, GameResult.id)
+        .all()
+    )
+    points = []
+    balance = 0.0
+    for played_at, net in rows:
+        balance += net
+        points.append({"date": played_at.strftime("%Y-%m-%d"), "balance": balance})
+    return points
+
+
+PLAYER_RESULTS_PAGE_SIZE = 25
+
+PLAYER_RESULTS_SORTS = {
+    "date": "played_at",
+    "pot": "pot",
+    "balance": "net",
+}
+
+
+def get_player_results_page(
+    team_id: int,
+    user_id: int,
+    db: Session,
+    year: Optional[str] = None,
+    sort: str = "date",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = PLAYER_RESULTS_PAGE_SIZE,
+) -> Page:
+    """One keyset page of a player's results in a team, sorted in the database."""
+    attribute = PLAYER_RESULTS_SORTS.get(sort, "played_at")
+    return paginate(
+        _player_results_query(team_id, user_id, db, year),
+        getattr(GameResult, attribute),
+        GameResult.id,
+        key=lambda r: (getattr(r, attribute), r.id),
+        cursor=cursor,
+        descending=order == "desc",
+        limit=limit,
+    )
+
+
+def game_result_year_filter(year):
+    """Same range predicate as game_year_filter, on the results table."""
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return false()
+    return and_(
+        GameResult.game_date >= date(year, 1, 1),
+        GameResult.game_date < date(year + 1, 1, 1),
+    )
@@ -0,0 +1,167 @@
+import unicodedata
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.core.game_state import PLAYER_JOINED
+from backend.core.hashing import Hasher
+from backend.db.game_events import record_game_event
+from backend.db.invalidation import invalidate
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.game import Game
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.team import Team
+from backend.db.models.user import User
+from backend.db.models.user_game import UserGame
+from backend.db.models.user_team import UserTeam
+
+GUEST_PASSWORD = "guest123"
+
+
+def guest_email(nick: str, team: Team) -> str:
+    """
+    The e-mail of a team's guest with the given nick:
+    {lowercase ascii nick}_{team search code}@over-bet.com
+    """
+    # replace non-ascii characters with close matches (e.g. ł -> l)
+    normalized_nick = unicodedata.normalize(
+        "NFD", nick.lower().replace("ł", "l").replace("Ł", "L")
+    )
+    ascii_nick = "".join(
+        c for c in normalized_nick if unicodedata.category(c) != "Mn"
+    ).replace(" ", "_")
+    return f"{ascii_nick}_{team.search_code.lower()}@over-bet.com"
+
+
+def preregister_guests(nicks: List[str], game: Game, db: Session) -> List[Dict]:
+    """
+    Makes every nick a player of the game, as a guest of the game's team:
+    existing guests are found by their e-mail in one query, missing ones are
+    created, and missing team and game memberships (approved, as when the
+    host adds a player) and default buy-ins are added with one multi-row
+    INSERT per table. Doesn't commit.
+
+    Returns one dict per distinct guest, in the order of the nicks, with the
+    user's id, nick and whether the guest account was created.
+    """
+    team = game.team
+    emails = {}
+    for nick in nicks:
+        nick = nick.strip()
+        if nick:
+            emails.setdefault(guest_email(nick, team), nick)
+    if not emails:
+        return []
+
+    users = {
+        user.email: user
+        for user in db.query(User).filter(User.email.in_(list(emails)))
+    }
+    inactive = [user for user in users.values() if not user.is_active]
+    for user in inactive:
+        user.is_active = True
+
+    ids = {email: user.id for email, user in users.items()}
+    missing = [email for email in emails if email not in users]
+    if missing:
+        # Every guest gets the same default password; hash it only once
+        hashed_password = Hasher.get_password_hash(GUEST_PASSWORD)
+        created = db.execute(
+            insert(User).returning(User.email, User.id),
+            [
+                {
+                    "email": email,
+                    "nick": emails[email],
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                    "is_superuser": False,
+                }
+                for email in missing
+            ],
+        )
+        ids.update(created.tuples().all())
+
+    user_ids = list(ids.values())
+    in_team = {
+        user_id
+        for (user_id,) in db.query(UserTeam.user_id).filter(
+            UserTeam.team_id == team.id, UserTeam.user_id.in_(user_ids)
+        )
+    }
+    in_game = {
+        user_id
+        for (user_id,) in db.query(UserGame.user_id).filter(
+            UserGame.game_id == game.id, UserGame.user_id.in_(user_ids)
+        )
+    }
+    joining_team = [user_id for user_id in user_ids if user_id not in in_team]
+    joining_game = [user_id for user_id in user_ids if user_id not in in_game]
+    if joining_team:
+        db.execute(
+            insert(UserTeam),
+            [
+                {
+                    "user_id": user_id,
+                    "team_id": team.id,
+                    "status": PlayerRequestStatus.APPROVED,
+                }
+                for user_id in joining_team
+            ],
+        )
+    if joining_game:
+        db.execute(
+            insert(UserGame),
+            [
+                {
+                    "user_id": user_id,
+                    "game_id": game.id,
+                    "status": PlayerRequestStatus.APPROVED,
+                }
+                for user_id in joining_game
+            ],
+        )
+        for user_id in joining_game:
+            record_game_event(db, game.id, PLAYER_JOINED, user_id)
+        if game.default_buy_in > 0:
+            now = datetime.now()
+            buy_ins = db.execute(
+                insert(BuyIn).returning(BuyIn.id, BuyIn.user_id),
+                [
+                    {
+                        "user_id": user_id,
+                        "game_id": game.id,
+                        "amount": game.default_buy_in,
+                        "time": now,
+                    }
+                    for user_id in joining_game
+                ],
+            )
+            for buy_in_id, user_id in buy_ins.tuples().all():
+                record_game_event(
+                    db,
+                    game.id,
+                    "buy_in",
+                    user_id,
+                    buy_in_id,
+                    game.default_buy_in,
+                    status=PlayerRequestStatus.APPROVED,
+                )
+    db.expire(game, ["user_associations", "buy_ins"])
+    db.expire(team, ["user_associations"])
+    invalidate(
+        db,
+        f"game:{game.id}",
+        f"team:{team.id}",
+        *(f"user:{user_id}" for user_id in user_ids),
+    )
+
+    return [
+        {
+            "user_id": ids[email],
+            "nick": users[email].nick if email in users else nick,
+            "created": email not in users,
+        }
+        for email, nick in emails.items()
+    ]
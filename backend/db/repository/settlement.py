@@ -0,0 +1,182 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import case, func, literal, select, union_all, update
+from sqlalchemy.orm import Session
+
+from backend.db.game_events import record_game_event
+from backend.db.invalidation import invalidate
+from backend.db.models.add_on import AddOn
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.cash_out import CashOut
+from backend.db.models.game import Game
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.user import User
+from backend.db.models.user_game import UserGame
+
+
+@dataclass
+class PlayerSettlement:
+    player: User
+    money_in: float  # buy-ins and approved add-ons
+    money_out: float  # approved cash-outs
+    buy_in_count: int
+    cash_out_count: int  # cash-out requests of any status
+
+    @property
+    def balance(self) -> float:
+        return self.money_out - self.money_in
+
+    @property
+    def cashed_out(self) -> bool:
+        return self.cash_out_count >= self.buy_in_count
+
+
+@dataclass
+class GameSettlement:
+    players: List[PlayerSettlement] = field(default_factory=list)
+
+    @property
+    def total_money_in(self) -> float:
+        return sum(p.money_in for p in self.players)
+
+    @property
+    def total_money_out(self) -> float:
+        return sum(p.money_out for p in self.players)
+
+    @property
+    def all_cashed_out(self) -> bool:
+        return all(p.cashed_out for p in self.players)
+
+    @property
+    def sum_warning(self) -> bool:
+        """Money in and out don't match (to the cent)."""
+        return round(self.total_money_in - self.total_money_out, 2) != 0
+
+
+def _ledger(game_id: int):
+    """Every money movement of the game as (user_id, in, out, buy-ins, cash-outs)."""
+    approved = PlayerRequestStatus.APPROVED
+    return union_all(
+        select(
+            BuyIn.user_id,
+            BuyIn.amount.label("money_in"),
+            literal(0.0).label("money_out"),
+            literal(1).label("buy_ins"),
+            literal(0).label("cash_outs"),
+        ).where(BuyIn.game_id == game_id),
+        select(
+            AddOn.user_id,
+            AddOn.amount,
+            literal(0.0),
+            literal(0),
+            literal(0),
+        ).where(AddOn.game_id == game_id, AddOn.status == approved),
+        select(
+            CashOut.user_id,
+            literal(0.0),
+            case((CashOut.status == approved, CashOut.amount), else_=0.0),
+            literal(0),
+            literal(1),
+        ).where(CashOut.game_id == game_id),
+    ).subquery()
+
+
+def get_game_settlement(game: Game, db: Session) -> GameSettlement:
+    """
+    Money in and out of every seated player of the game, from one grouped
+    query over the three ledgers.
+    """
+    ledger = _ledger(game.id)
+    totals = (
+        select(
+            ledger.c.user_id,
+            func.sum(ledger.c.money_in).label("money_in"),
+            func.sum(ledger.c.money_out).label("money_out"),
+            func.sum(ledger.c.buy_ins).label("buy_ins"),
+            func.sum(ledger.c.cash_outs).label("cash_outs"),
+        )
+        .group_by(ledger.c.user_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            User,
+            func.coalesce(totals.c.money_in, 0.0),
+            func.coalesce(totals.c.money_out, 0.0),
+            func.coalesce(totals.c.buy_ins, 0),
+            func.coalesce(totals.c.cash_outs, 0),
+        )
+        .select_from(UserGame)
+        .join(User, User.id == UserGame.user_id)
+        .outerjoin(totals, totals.c.user_id == UserGame.user_id)
+        .where(UserGame.game_id == game.id)
+    ).all()
+
+    return GameSettlement(
+        players=[
+            PlayerSettlement(
+                player=user,
+                money_in=money_in,
+                money_out=money_out,
+                buy_in_count=buy_ins,
+                cash_out_count=cash_outs,
+            )
+            for user, money_in, money_out, buy_ins, cash_outs in rows
+        ]
+    )
+
+
+def decide_pending_requests(
+    game: Game,
+    status: PlayerRequestStatus,
+    db: Session,
+    add_on_ids: Optional[List[int]] = None,
+    cash_out_ids: Optional[List[int]] = None,
+) -> int:
+    """
+    Sets the status of the game's open add-on and cash-out requests with the
+    given ids (all of them when ids are None) with one UPDATE per ledger,
+    recording an event per request in the game's log. Requests already
+    decided or of another game are left alone. Doesn't commit. Returns the
+    number of requests changed.
+    """
+    decided = 0
+    for model, ids in ((AddOn, add_on_ids), (CashOut, cash_out_ids)):
+        if ids is not None and not ids:
+            continue
+        statement = (
+            update(model)
+            .where(
+                model.game_id == game.id,
+                model.status == PlayerRequestStatus.REQUESTED,
+            )
+            .values(status=status)
+            .returning(model.id, model.user_id, model.amount)
+            .execution_options(synchronize_session=False)
+        )
+        if ids is not None:
+            statement = statement.where(model.id.in_(ids))
+        kind = "add_on" if model is AddOn else "cash_out"
+        for entity_id, user_id, amount in db.execute(statement).all():
+            record_game_event(
+                db,
+                game.id,
+                f"{kind}_{status.value.lower()}",
+                user_id,
+                entity_id,
+                amount,
+                amount,
+                status,
+                PlayerRequestStatus.REQUESTED,
+            )
+            decided += 1
+    db.expire(game, ["add_ons", "cash_outs"])
+    if decided:
+        invalidate(db, f"game:{game.id}")
+    return decided
+
+
+def decline_pending_requests(game: Game, db: Session) -> int:
+    """Declines all open requests of the game, see decide_pending_requests."""
+    return decide_pending_requests(game, PlayerRequestStatus.DECLINED, db)
@@ -1,17 +1,22 @@
+import math
 from collections import defaultdict
 from multiprocessing import Value
-from select import select
 from sqlite3 import IntegrityError
 from typing import Dict, List, Type, Optional
-import random
 
 from fastapi import HTTPException
+from sqlalchemy import exc, func, select
 from sqlalchemy.orm import Session
 from starlette.requests import Request
 
 from backend.apis.v1.route_login import get_current_user
+from backend.core.config import settings
+from backend.core.game_state import PLAYER_REMOVED
+from backend.core.team_codes import team_code
+from backend.db.game_events import record_game_event
+from backend.db.invalidation import invalidate
 from backend.db.models.player_request_status import PlayerRequestStatus
-from backend.db.models.team import Team
+from backend.db.models.team import TEAM_CODE_SEQUENCE, Team
 from backend.db.models.user import User
 from backend.db.models.game import Game
 from backend.db.models.user_team import UserTeam
@@ -101,6 +106,16 @@ def remove_user_from_team(team: Team, user: User, db: Session):
     # (We can do bulk delete with WHERE IN subquery or similar)
     team_game_ids = db.query(Game.id).filter(Game.team_id == team.id)
 
+    game_ids = [
+        game_id
+        for (game_id,) in db.query(UserGame.game_id).filter(
+            UserGame.user_id == user.id, UserGame.game_id.in_(team_game_ids)
+        )
+    ]
+    invalidate(db, *(f"game:{game_id}" for game_id in game_ids))
+    for game_id in game_ids:
+        record_game_event(db, game_id, PLAYER_REMOVED, user.id)
+
     # 3. Remove UserGame associations (Player in specific games)
     db.query(UserGame).filter(
         UserGame.user_id == user.id, UserGame.game_id.in_(team_game_ids)
@@ -279,43 +294,83 @@ def approve_all_join_requests(team_id: int, db: Session):
     db.query(UserTeam).filter(
         UserTeam.team_id == team_id, UserTeam.status == PlayerRequestStatus.REQUESTED
     ).update({UserTeam.status: PlayerRequestStatus.APPROVED}, synchronize_session=False)
+    invalidate(db, f"team:{team_id}")
     db.commit()
 
 
-def generate_team_code(
-    db: Session, min_digits: int = 4, max_digits=8, max_attempts: int = 100
-) -> str:
+def generate_team_code(db: Session, offset: int = 0) -> str:
     """
-    Generate a unique numeric team code.
-    Starts with 4 digits, expands if all are taken.
+    Allocates a new team search code in one round trip: the next number of
+    the team code sequence, permuted by team_code. Allocated codes never
+    repeat, so nothing is checked against existing teams; codes handed out
+    otherwise (e.g. randomly, before codes were allocated) can still collide,
+    see create_team_with_new_code.
+
+    SQLite has no sequences; there the number is the highest team id plus
+    offset, which is unique as long as teams are created one at a time.
     """
-    digits = min_digits
+    if db.get_bind().dialect.name == "postgresql":
+        number = db.scalar(TEAM_CODE_SEQUENCE.next_value())
+    else:
+        number = db.scalar(select(func.coalesce(func.max(Team.id), 0))) + offset
+    return team_code(number)
 
-    for _ in range(max_digits - min_digits):
-        # generate a few random codes at this digit length
-        for _ in range(max_attempts):
-            code_int = random.randint(0, 10**digits - 1)
-            code = f"{code_int:0{digits}d}"  # zero-padded
 
-            # Check if it exists
-            exists = db.query(Team).filter_by(search_code=code).first()
-            if not exists:
-                return code
+def create_team_with_new_code(name: str, creator: User, db: Session) -> Team:
+    """
+    Creates a team (see create_new_team) with a newly allocated search code.
+    When the code turns out to be taken, the unique index rejects the team
+    and it is created again with the next code, up to TEAM_CODE_ATTEMPTS
+    times; other integrity errors are raised right away.
+    """
+    attempts = settings.TEAM_CODE_ATTEMPTS
+    for attempt in range(attempts):
+        code = generate_team_code(db, offset=attempt)
+        try:
+            return create_new_team(TeamCreate(name=name, search_code=code), creator, db)
+        except exc.IntegrityError:
+            db.rollback()
+            taken = db.scalar(select(Team.id).where(Team.search_code == code))
+            if taken is None or attempt == attempts - 1:
+                raise
 
-        # if all attempts failed, increase digit count
-        digits += 1
-        print(
-            f"All {digits-1}-digit codes exhausted, switching to {digits}-digit codes."
-        )
 
-    raise ValueError("Can't generate the team code, try again.")
+def bump_team_games_version(team_id: int, db: Session) -> None:
+    """
+    Increments the team's games change counter inside the current transaction.
+    The caller is responsible for committing.
+    """
+    db.query(Team).filter(Team.id == team_id).update(
+        {Team.games_version: Team.games_version + 1}, synchronize_session=False
+    )
+    invalidate(db, f"team:{team_id}")
+
+
+def get_user_teams_games_version(user_id: int, db: Session) -> int:
+    """
+    Returns a cursor for the games of all teams the user belongs to.
+    It changes whenever a game is created, finished or deleted in any of them.
+    """
+    version = (
+        db.query(func.coalesce(func.sum(Team.games_version), 0))
+        .join(UserTeam, UserTeam.team_id == Team.id)
+        .filter(UserTeam.user_id == user_id)
+        .scalar()
+    )
+    return int(version or 0)
 
 
 def get_team_by_search_code(search_code: str, db: Session) -> Optional[Team]:
     """
-    Fetches a Team model instance by its ID.
+    Fetches the team with the given search code; a lookup on the unique
+    search_code index.
     """
-    return db.query(Team).filter(Team.search_code == search_code).one_or_none()
+    search_code = search_code.strip()
+    return (
+        db.query(Team)
+        .filter(Team.search_code == search_code, Team.deleting == False)  # noqa
+        .one_or_none()
+    )
 
 
 def get_user(doctor_id, db):
@@ -328,15 +383,104 @@ def list_all_users(db):
     return users
 
 
+def update_team_time_decay(
+    team: Team, grace_days: Optional[int], decay_rate: Optional[float], db: Session
+) -> Team:
+    """
+    Sets the time decay parameters used by the team's statistics.
+    None restores the global default.
+    """
+    if grace_days is not None and grace_days < 0:
+        raise ValueError("Grace period cannot be negative.")
+    if decay_rate is not None and not math.isfinite(decay_rate):
+        raise ValueError("Decay rate must be a number.")
+    if decay_rate is not None and decay_rate < 0:
+        raise ValueError("Decay rate cannot be negative.")
+
+    team.time_decay_grace_days = grace_days
+    team.time_decay_rate = decay_rate
+    db.commit()
+    return team
+
+
 def delete_team(team: Team, db: Session):
     """
-    Deletes a team and all its associated data (games, user mappings) via cascade.
+    Deletes a team. The database removes its games (with their ledgers and
+    results) and memberships through ON DELETE CASCADE and detaches its chip
+    structures; nothing is loaded into the session for it.
     """
     db.delete(team)
     db.commit()
 
 
-from sqlalchemy import func
+def count_team_games(team_id: int, db: Session) -> int:
+    return db.query(func.count(Game.id)).filter(Game.team_id == team_id).scalar()
+
+
+def hide_team(team: Team, db: Session):
+    """
+    Removes every membership of a team, so it disappears from its members'
+    pages right away while delete_team_in_batches runs in the background,
+    and marks it as deleting, so resume_team_deletions can finish the
+    delete if the background task never does.
+    """
+    team.deleting = True
+    member_ids = [
+        user_id
+        for (user_id,) in db.query(UserTeam.user_id).filter(UserTeam.team_id == team.id)
+    ]
+    db.query(UserTeam).filter(UserTeam.team_id == team.id).delete(
+        synchronize_session=False
+    )
+    invalidate(db, f"team:{team.id}", *(f"user:{user_id}" for user_id in member_ids))
+    db.commit()
+
+
+def delete_team_in_batches(team_id: int, bind, batch_size: int = None) -> int:
+    """
+    Deletes a team's games batch by batch, each in its own short transaction,
+    then the team itself, in a new session on bind (an engine or
+    connection). For teams too big to delete within a request. Returns the
+    number of games deleted.
+    """
+    batch_size = batch_size or settings.TEAM_DELETE_BATCH_SIZE
+    deleted = 0
+    with Session(bind=bind, autoflush=False) as db:
+        while True:
+            game_ids = [
+                game_id
+                for (game_id,) in db.query(Game.id)
+                .filter(Game.team_id == team_id)
+                .limit(batch_size)
+            ]
+            if not game_ids:
+                break
+            db.query(Game).filter(Game.id.in_(game_ids)).delete(
+                synchronize_session=False
+            )
+            invalidate(db, *(f"game:{game_id}" for game_id in game_ids))
+            db.commit()
+            deleted += len(game_ids)
+        db.query(Team).filter(Team.id == team_id).delete(synchronize_session=False)
+        invalidate(db, f"team:{team_id}")
+        db.commit()
+    return deleted
+
+
+def resume_team_deletions(bind, batch_size: int = None) -> int:
+    """
+    Deletes the teams hide_team marked as deleting, batch by batch (see
+    delete_team_in_batches). Returns the number of teams deleted.
+    """
+    with Session(bind=bind) as db:
+        team_ids = db.scalars(
+            select(Team.id).where(Team.deleting == True).order_by(Team.id)  # noqa
+        ).all()
+    for team_id in team_ids:
+        delete_team_in_batches(team_id, bind, batch_size)
+    return len(team_ids)
+
+
 from backend.db.models.buy_in import BuyIn
 from backend.db.models.cash_out import CashOut
 from backend.db.models.add_on import AddOn
@@ -356,6 +500,8 @@ def get_team_player_stats_bulk(
     }
     Optimized to use aggregation queries instead of N+1 loops.
     """
+    from backend.db.repository.game import game_year_filter
+
     stats = defaultdict(lambda: {"games_count": 0, "total_balance": 0.0})
 
     # 1. Games Count
@@ -365,7 +511,7 @@ def get_team_player_stats_bulk(
         .filter(Game.team_id == team_id)
     )
     if year:
-        q1 = q1.filter(Game.date.like(f"{year}%"))
+        q1 = q1.filter(game_year_filter(year))
     games_counts = q1.group_by(UserGame.user_id).all()
 
     for uid, count in games_counts:
@@ -378,7 +524,7 @@ def get_team_player_stats_bulk(
         .filter(Game.team_id == team_id)
     )
     if year:
-        q2 = q2.filter(Game.date.like(f"{year}%"))
+        q2 = q2.filter(game_year_filter(year))
     buy_ins = q2.group_by(BuyIn.user_id).all()
 
     money_in = defaultdict(float)
@@ -393,7 +539,7 @@ def get_team_player_stats_bulk(
         .filter(Game.team_id == team_id, AddOn.status == PlayerRequestStatus.APPROVED)
     )
     if year:
-        q3 = q3.filter(Game.date.like(f"{year}%"))
+        q3 = q3.filter(game_year_filter(year))
     add_ons = q3.group_by(AddOn.user_id).all()
 
     for uid, total in add_ons:
@@ -407,7 +553,7 @@ def get_team_player_stats_bulk(
         .filter(Game.team_id == team_id, CashOut.status == PlayerRequestStatus.APPROVED)
     )
     if year:
-        q4 = q4.filter(Game.date.like(f"{year}%"))
+        q4 = q4.filter(game_year_filter(year))
     cash_outs = q4.group_by(CashOut.user_id).all()
 
     money_out = defaultdict(float)
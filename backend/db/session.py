@@ -1,11 +1,24 @@
 from typing import Generator
 import os
+import sqlite3
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from backend.core.config import settings
 
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys, and so their ON DELETE CASCADE, unless
+    # enabled on every connection
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 # Check if we should use SQLite for local development
 USE_SQLITE = os.getenv("USE_SQLITE", "false").lower() == "true"
 
@@ -24,6 +37,20 @@ else:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for heavy read-only routes (see backend/db/replica.py)
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.REPLICA_DATABASE_URL and not USE_SQLITE:
+    # An unreachable replica must fail fast; requests fall back to the primary
+    replica_engine = create_engine(
+        settings.REPLICA_DATABASE_URL,
+        connect_args={"connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+    )
+    ReplicaSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=replica_engine
+    )
+    print("📖 Using read replica for stats and history pages")
+
 
 def get_db() -> Generator:
     try:
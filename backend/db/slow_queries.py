@@ -0,0 +1,214 @@
+"""
+Slow-query log: statements slower than SLOW_QUERY_THRESHOLD_MS are logged
+with their parameter shape and the repository function (or route) that ran
+them, and kept in a rolling in-memory buffer shown on /admin/slow-queries.
+
+With SLOW_QUERY_EXPLAIN on PostgreSQL, the first slow occurrence of every
+plain SELECT shape is re-run under EXPLAIN (ANALYZE, BUFFERS) and the plan
+is stored with it. The buffer is per worker process.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.core.config import settings
+from backend.db.query_stats import statement_shape
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_REPOSITORY_DIR = os.path.join(_BACKEND_DIR, "db", "repository")
+_WEBAPPS_DIR = os.path.join(_BACKEND_DIR, "webapps")
+
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+_PLAIN_SELECT = re.compile(r"\s*SELECT\b.*\bFROM\b", re.IGNORECASE | re.DOTALL)
+_LOCKING_CLAUSE = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE
+)
+_SIDE_EFFECT_CALL = re.compile(
+    r"\b(nextval|setval|pg_notify|pg_advisory\w*|pg_try_advisory\w*|"
+    r"set_config|pg_sleep|dblink\w*)\s*\(",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class SlowQuery:
+    logged_at: datetime
+    duration_ms: float
+    statement: str
+    shape: str
+    parameters: str
+    caller: str
+    plan: Optional[str] = None
+
+
+@dataclass
+class SlowQueryLog:
+    entries: Deque[SlowQuery] = field(
+        default_factory=lambda: deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+    )
+    explained: Set[str] = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, entry: SlowQuery) -> None:
+        with self.lock:
+            self.entries.append(entry)
+
+    def recent(self) -> List[SlowQuery]:
+        """Newest first."""
+        with self.lock:
+            return list(reversed(self.entries))
+
+    def claim_explain(self, shape: str) -> bool:
+        """True the first time a shape is seen, so it's explained only once."""
+        with self.lock:
+            if shape in self.explained:
+                return False
+            self.explained.add(shape)
+            return True
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.explained.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def parameter_shape(parameters, executemany: bool) -> str:
+    """Parameter types without values, e.g. `(int, str)` or `{team_id: int}`."""
+    if executemany:
+        rows = list(parameters or [])
+        first = parameter_shape(rows[0], False) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        return "{%s}" % ", ".join(
+            f"{key}: {type(value).__name__}" for key, value in parameters.items()
+        )
+    if isinstance(parameters, (list, tuple)):
+        return "(%s)" % ", ".join(type(value).__name__ for value in parameters)
+    return type(parameters).__name__
+
+
+def calling_function() -> str:
+    """
+    Innermost repository function on the stack, falling back to the route
+    handler, as `module.function:line`.
+    """
+    fallback = "unknown"
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_REPOSITORY_DIR) or filename.startswith(_WEBAPPS_DIR):
+            module = os.path.relpath(filename, os.path.dirname(_BACKEND_DIR))
+            location = (
+                f"{module[:-3].replace(os.sep, '.')}.{frame.f_code.co_name}"
+                f":{frame.f_lineno}"
+            )
+            if filename.startswith(_REPOSITORY_DIR):
+                return location
+            if fallback == "unknown":
+                fallback = location
+        frame = frame.f_back
+    return fallback
+
+
+def explain(conn, statement: str, parameters) -> Optional[str]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) on a separate cursor of the same connection,
+    inside a savepoint that is always rolled back: a failing EXPLAIN would
+    otherwise abort the request's transaction.
+    """
+    dbapi_connection = conn.connection.dbapi_connection
+    in_transaction = not getattr(dbapi_connection, "autocommit", False)
+    cursor = dbapi_connection.cursor()
+    try:
+        if in_transaction:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            if in_transaction:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+    except Exception as e:  # the plan is best effort, never fail the request
+        logger.warning("EXPLAIN of slow query failed: %s", e)
+        return None
+    finally:
+        cursor.close()
+
+
+def is_plain_select(statement: str) -> bool:
+    """
+    A SELECT ... FROM that is safe to run again: no row locks and no calls
+    with side effects (nextval, pg_notify, ...).
+    """
+    return bool(
+        _PLAIN_SELECT.match(statement)
+        and not _LOCKING_CLAUSE.search(statement)
+        and not _SIDE_EFFECT_CALL.search(statement)
+    )
+
+
+def _should_explain(conn, statement: str, executemany: bool) -> bool:
+    return (
+        settings.SLOW_QUERY_EXPLAIN
+        and conn.dialect.name == "postgresql"
+        and not executemany
+        and is_plain_select(statement)
+    )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("slow_query_start_time")
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    shape = statement_shape(statement)
+    entry = SlowQuery(
+        logged_at=datetime.now(),
+        duration_ms=round(duration_ms, 1),
+        statement=statement,
+        shape=shape,
+        parameters=parameter_shape(parameters, executemany),
+        caller=calling_function(),
+    )
+    if _should_explain(conn, statement, executemany) and slow_query_log.claim_explain(
+        shape
+    ):
+        entry.plan = explain(conn, statement, parameters)
+    slow_query_log.add(entry)
+
+    logger.warning(
+        json.dumps(
+            {
+                "slow_query_ms": entry.duration_ms,
+                "caller": entry.caller,
+                "parameters": entry.parameters,
+                "statement": shape,
+            }
+        )
+    )
@@ -67,6 +67,55 @@ def add_missing_columns():
             ADD COLUMN IF NOT EXISTS status playerrequeststatus NOT NULL DEFAULT 'REQUESTED';
         """))
         print("✓ user_game_association updated.")
+
+        # Add games change counter to team
+        print("Adding games_version column to team...")
+        conn.execute(text("""
+            ALTER TABLE team
+            ADD COLUMN IF NOT EXISTS games_version INTEGER NOT NULL DEFAULT 0;
+        """))
+        print("✓ team updated.")
+
+        # Per-team time decay parameters for player statistics
+        print("Adding time decay columns to team...")
+        conn.execute(text("""
+            ALTER TABLE team
+            ADD COLUMN IF NOT EXISTS time_decay_grace_days INTEGER,
+            ADD COLUMN IF NOT EXISTS time_decay_rate DOUBLE PRECISION;
+        """))
+        print("✓ team updated.")
+
+        # Marks teams being deleted in the background
+        print("Adding deleting column to team...")
+        conn.execute(text("""
+            ALTER TABLE team
+            ADD COLUMN IF NOT EXISTS deleting BOOLEAN NOT NULL DEFAULT false;
+        """))
+        print("✓ team updated.")
+
+        # Partial index backing the home page running-games query
+        print("Adding running games index to game...")
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_game_running_team_id
+            ON game (team_id) WHERE running;
+        """))
+        print("✓ game updated.")
+
+        # Per-game pot and player count, for sorting and paging game lists
+        print("Adding pot and player_count columns to game...")
+        conn.execute(text("""
+            ALTER TABLE game
+            ADD COLUMN IF NOT EXISTS pot DOUBLE PRECISION NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS player_count INTEGER NOT NULL DEFAULT 0;
+        """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_game_team_id_pot ON game (team_id, pot, id);
+        """))
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_game_team_id_player_count
+            ON game (team_id, player_count, id);
+        """))
+        print("✓ game updated.")
         
         print("\n✅ Successfully added all missing columns!")
         print("\nSummary of changes:")
@@ -74,6 +123,11 @@ def add_missing_columns():
         print("  - add_on: added 'status' column")
         print("  - cash_out: added 'status' column")
         print("  - user_game_association: added 'status' column")
+        print("  - team: added 'games_version' column")
+        print("  - team: added 'time_decay_grace_days' and 'time_decay_rate' columns")
+        print("  - team: added 'deleting' column")
+        print("  - game: added 'ix_game_running_team_id' partial index")
+        print("  - game: added 'pot' and 'player_count' columns and their indexes")
 
 
 if __name__ == "__main__":
@@ -33,3 +33,27 @@ ADD COLUMN IF NOT EXISTS status playerrequeststatus NOT NULL DEFAULT 'REQUESTED'
 ALTER TABLE user_game_association 
 ADD COLUMN IF NOT EXISTS status playerrequeststatus NOT NULL DEFAULT 'REQUESTED';
 
+-- Add games change counter to team table
+ALTER TABLE team
+ADD COLUMN IF NOT EXISTS games_version INTEGER NOT NULL DEFAULT 0;
+
+-- Per-team time decay parameters for player statistics
+ALTER TABLE team
+ADD COLUMN IF NOT EXISTS time_decay_grace_days INTEGER,
+ADD COLUMN IF NOT EXISTS time_decay_rate DOUBLE PRECISION;
+
+-- Marks teams being deleted in the background
+ALTER TABLE team
+ADD COLUMN IF NOT EXISTS deleting BOOLEAN NOT NULL DEFAULT false;
+
+-- Partial index backing the home page running-games query
+CREATE INDEX IF NOT EXISTS ix_game_running_team_id
+ON game (team_id) WHERE running;
+
+-- Per-game pot and player count, for sorting and paging game lists
+ALTER TABLE game
+ADD COLUMN IF NOT EXISTS pot DOUBLE PRECISION NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS player_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_game_team_id_pot ON game (team_id, pot, id);
+CREATE INDEX IF NOT EXISTS ix_game_team_id_player_count ON game (team_id, player_count, id);
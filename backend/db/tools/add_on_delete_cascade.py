@@ -0,0 +1,95 @@
+"""
+Switch the foreign keys below team and game to ON DELETE CASCADE (chip
+structures to ON DELETE SET NULL) and index the referencing columns, so
+deleting a team or game is done by the database instead of row by row.
+Constraints that already have the right ON DELETE are left alone, so the
+script is safe to run multiple times. PostgreSQL only.
+"""
+import sys
+
+from sqlalchemy import text
+
+from backend.db.session import engine
+
+# (table, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = [
+    ("user_team_association", "team_id", "team", "CASCADE"),
+    ("game", "team_id", "team", "CASCADE"),
+    ("game_result", "team_id", "team", "CASCADE"),
+    ("chip_structure", "team_id", "team", "SET NULL"),
+    ("user_game_association", "game_id", "game", "CASCADE"),
+    ("buy_in", "game_id", "game", "CASCADE"),
+    ("add_on", "game_id", "game", "CASCADE"),
+    ("cash_out", "game_id", "game", "CASCADE"),
+    ("game_result", "game_id", "game", "CASCADE"),
+    ("chip_amount", "cash_out_id", "cash_out", "CASCADE"),
+]
+
+# Without these every cascaded delete scans the whole referencing table
+INDEXES = [
+    ("ix_user_team_association_team_id", "user_team_association", "team_id"),
+    ("ix_user_game_association_game_id", "user_game_association", "game_id"),
+    ("ix_buy_in_game_id", "buy_in", "game_id"),
+    ("ix_add_on_game_id", "add_on", "game_id"),
+    ("ix_cash_out_game_id", "cash_out", "game_id"),
+    ("ix_chip_amount_cash_out_id", "chip_amount", "cash_out_id"),
+]
+
+_CONFDELTYPE = {"CASCADE": "c", "SET NULL": "n"}
+
+_EXISTING_FOREIGN_KEYS = text("""
+    SELECT c.conname, c.confdeltype
+    FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+    WHERE c.contype = 'f'
+      AND c.conrelid = to_regclass(:table)
+      AND array_length(c.conkey, 1) = 1
+      AND a.attname = :column
+""")
+
+
+def add_indexes():
+    # CONCURRENTLY can't run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, table, column in INDEXES:
+            print(f"Indexing {table}.{column}...")
+            conn.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column})"
+            ))
+    print("✓ Indexes created/verified.")
+
+
+def replace_foreign_keys():
+    for table, column, referenced, action in FOREIGN_KEYS:
+        with engine.begin() as conn:
+            existing = conn.execute(
+                _EXISTING_FOREIGN_KEYS, {"table": table, "column": column}
+            ).all()
+            if [deltype for _, deltype in existing] == [_CONFDELTYPE[action]]:
+                print(f"✓ {table}.{column} already ON DELETE {action}.")
+                continue
+
+            print(f"Setting {table}.{column} to ON DELETE {action}...")
+            name = f"{table}_{column}_fkey"
+            drops = "".join(f"DROP CONSTRAINT {conname}, " for conname, _ in existing)
+            # NOT VALID + VALIDATE keeps the table writable while rows are checked
+            conn.execute(text(
+                f"ALTER TABLE {table} {drops}"
+                f"ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                f"REFERENCES {referenced} (id) ON DELETE {action} NOT VALID"
+            ))
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}"))
+    print("✓ Foreign keys updated.")
+
+
+if __name__ == "__main__":
+    try:
+        add_indexes()
+        replace_foreign_keys()
+        print("\n✅ Deletes of teams and games now cascade in the database.")
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
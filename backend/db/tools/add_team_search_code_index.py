@@ -0,0 +1,80 @@
+"""
+Make team search codes unique and allocated from a sequence: gives teams
+sharing a code new codes, adds the unique index on team.search_code and
+creates team_search_code_seq. The sequence starts past the longest numeric
+code in use, so the random codes handed out before can't be allocated
+again. Steps already done are skipped, so the script is safe to run
+multiple times. PostgreSQL only.
+"""
+import sys
+
+from sqlalchemy import text
+
+from backend.core.team_codes import first_number_with_digits, team_code
+from backend.db.session import engine
+
+SEQUENCE = "team_search_code_seq"
+INDEX = "ix_team_search_code"
+
+
+def create_sequence():
+    with engine.begin() as conn:
+        if conn.execute(text(f"SELECT to_regclass('{SEQUENCE}')")).scalar():
+            print(f"✓ {SEQUENCE} already exists.")
+            return
+        longest = conn.execute(text(
+            "SELECT max(length(search_code)) FROM team WHERE search_code ~ '^[0-9]+$'"
+        )).scalar()
+        start = first_number_with_digits((longest or 0) + 1)
+        print(f"Creating {SEQUENCE} starting at {start}...")
+        conn.execute(text(
+            f"CREATE SEQUENCE {SEQUENCE} MINVALUE 0 START WITH {start}"
+        ))
+
+
+def reassign_duplicates():
+    with engine.begin() as conn:
+        duplicates = conn.execute(text("""
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY search_code ORDER BY id
+                ) AS n
+                FROM team
+            ) t
+            WHERE n > 1
+            ORDER BY id
+        """)).scalars().all()
+        # The oldest team keeps the code; the others get newly allocated ones
+        for team_id in duplicates:
+            number = conn.execute(text(f"SELECT nextval('{SEQUENCE}')")).scalar()
+            code = team_code(number)
+            print(f"Team {team_id} gets search code {code}.")
+            conn.execute(
+                text("UPDATE team SET search_code = :code WHERE id = :id"),
+                {"code": code, "id": team_id},
+            )
+    print(f"✓ {len(duplicates)} duplicate search codes reassigned.")
+
+
+def add_unique_index():
+    # CONCURRENTLY can't run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        print("Indexing team.search_code...")
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX} "
+            "ON team (search_code)"
+        ))
+    print("✓ Unique index created/verified.")
+
+
+if __name__ == "__main__":
+    try:
+        create_sequence()
+        reassign_duplicates()
+        add_unique_index()
+        print("\n✅ Team search codes are now unique and allocated in one step.")
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
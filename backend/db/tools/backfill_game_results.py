@@ -0,0 +1,46 @@
+"""
+Create the game_result table and fill it for finished games that have no
+results yet. New games get their results when they are finished; this is
+needed once for the games played before the table existed. Games that
+already have results are skipped, so the script is safe to run multiple
+times.
+"""
+import argparse
+import sys
+
+from sqlalchemy import text
+
+from backend.db.base import Base
+from backend.db.models.game_result import GameResult
+from backend.db.repository.game_result import backfill_game_results
+from backend.db.session import SessionLocal, engine
+
+
+def main(batch_size: int):
+    print("Creating game_result table (if missing)...")
+    Base.metadata.create_all(bind=engine, tables=[GameResult.__table__])
+    # Indexes added after the table was first created
+    for index in GameResult.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_game_result_user_id_team_id"))
+
+    print("Writing results for finished games...")
+    with SessionLocal() as db:
+        done = backfill_game_results(db, batch_size=batch_size)
+    print(f"\n✅ Wrote results for {done} games.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="games per transaction"
+    )
+    args = parser.parse_args()
+    try:
+        main(args.batch_size)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,42 @@
+"""
+Create the game_event and game_snapshot tables and write the snapshot of
+every running game that has none yet. Games get their snapshot rebuilt from
+the ledgers with their first event anyway; running this right after
+upgrading spares the first writer of every game that work. Games that
+already have a snapshot are skipped, so the script is safe to run multiple
+times.
+"""
+import argparse
+import sys
+
+from backend.db.base import Base
+from backend.db.game_events import backfill_snapshots
+from backend.db.models.game_event import GameEvent, GameSnapshot
+from backend.db.session import SessionLocal, engine
+
+
+def main(batch_size: int):
+    print("Creating game_event and game_snapshot tables (if missing)...")
+    Base.metadata.create_all(
+        bind=engine, tables=[GameEvent.__table__, GameSnapshot.__table__]
+    )
+
+    print("Writing snapshots of running games...")
+    with SessionLocal() as db:
+        done = backfill_snapshots(db, batch_size=batch_size)
+    print(f"\n✅ Wrote snapshots of {done} games.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="games per transaction"
+    )
+    args = parser.parse_args()
+    try:
+        main(args.batch_size)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,32 @@
+"""
+Delete the teams that were hidden from their members to be deleted in the
+background but are still there, because the background delete failed or
+the worker running it was restarted. Every batch of games is deleted in its
+own transaction, so the script can be interrupted and run again.
+"""
+import argparse
+import sys
+
+from backend.db.repository.team import resume_team_deletions
+from backend.db.session import engine
+
+
+def main(batch_size: int):
+    print("Deleting teams marked as deleting...")
+    done = resume_team_deletions(engine, batch_size=batch_size)
+    print(f"\n✅ Deleted {done} teams.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=200, help="games per transaction"
+    )
+    args = parser.parse_args()
+    try:
+        main(args.batch_size)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
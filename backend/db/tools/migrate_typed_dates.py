@@ -0,0 +1,160 @@
+"""
+Convert the string date/time columns to real DATE/TIMESTAMP columns.
+
+game.date becomes DATE and buy_in/add_on/cash_out.time become TIMESTAMP.
+Rows with values that cannot be cast (not a date at all, or e.g.
+2024-13-45) are backfilled first, so the ALTER never fails half way:
+- game.date from start_time, finish_time or the earliest ledger time of the
+  game; games with none of these get today's date and are listed, so they
+  can be corrected by hand,
+- ledger times from the game start/finish time or date.
+Columns that are already typed are skipped, so the script is safe to run
+multiple times.
+"""
+import sys
+from sqlalchemy import text
+from backend.db.session import engine
+
+
+# ledger table -> game column used when the stored time is unusable
+LEDGER_TABLES = {
+    "buy_in": "start_time",
+    "add_on": "start_time",
+    "cash_out": "finish_time",
+}
+
+# castable(value, type): whether value::type succeeds, i.e. whether the ALTER
+# can convert it. Lives in the session's temporary schema.
+CREATE_CASTABLE = """
+    CREATE OR REPLACE FUNCTION pg_temp.castable(value text, type text)
+    RETURNS boolean AS $$
+    BEGIN
+        EXECUTE format('SELECT %L::%s', value, type);
+        RETURN true;
+    EXCEPTION WHEN others THEN
+        RETURN false;
+    END
+    $$ LANGUAGE plpgsql;
+"""
+
+
+def column_type(conn, table: str, column: str) -> str:
+    return conn.execute(
+        text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = :table AND column_name = :column
+        """),
+        {"table": table, "column": column},
+    ).scalar()
+
+
+def migrate_game_date(conn):
+    if column_type(conn, "game", "date") == "date":
+        print("✓ game.date is already DATE, skipping.")
+        return
+
+    ledger_times = " UNION ALL ".join(
+        f"SELECT time::text AS time FROM {table} WHERE game_id = game.id"
+        for table in LEDGER_TABLES
+    )
+    print("Backfilling game.date where it is not a date...")
+    result = conn.execute(
+        text(f"""
+            UPDATE game
+            SET date = to_char(recovered.time, 'YYYY-MM-DD')
+            FROM (
+                SELECT id, coalesce(
+                    start_time,
+                    finish_time,
+                    (
+                        SELECT min(l.time::timestamp) FROM ({ledger_times}) AS l
+                        WHERE pg_temp.castable(l.time, 'timestamp')
+                    )
+                ) AS time
+                FROM game
+                WHERE NOT pg_temp.castable(left(date, 10), 'date')
+            ) AS recovered
+            WHERE game.id = recovered.id AND recovered.time IS NOT NULL
+        """)
+    )
+    print(f"  {result.rowcount} rows backfilled.")
+
+    unrecovered = conn.execute(
+        text("""
+            UPDATE game
+            SET date = to_char(now(), 'YYYY-MM-DD')
+            WHERE NOT pg_temp.castable(left(date, 10), 'date')
+            RETURNING id
+        """)
+    ).scalars().all()
+    if unrecovered:
+        print(
+            f"  ⚠️ {len(unrecovered)} games have no start, finish or ledger time "
+            f"and were dated today; correct them by hand: {sorted(unrecovered)}"
+        )
+
+    print("Converting game.date to DATE...")
+    conn.execute(text("""
+        ALTER TABLE game
+        ALTER COLUMN date TYPE DATE USING left(date, 10)::date;
+    """))
+    print("✓ game updated.")
+
+
+def migrate_ledger_time(conn, table: str, fallback_column: str):
+    if column_type(conn, table, "time") == "timestamp without time zone":
+        print(f"✓ {table}.time is already TIMESTAMP, skipping.")
+        return
+
+    print(f"Backfilling {table}.time from game.{fallback_column}...")
+    result = conn.execute(
+        text(f"""
+            UPDATE {table} AS t
+            SET time = to_char(
+                coalesce(g.{fallback_column}, g.start_time, g.date::date),
+                'YYYY-MM-DD"T"HH24:MI:SS'
+            )
+            FROM game AS g
+            WHERE g.id = t.game_id AND NOT pg_temp.castable(t.time, 'timestamp')
+        """)
+    )
+    print(f"  {result.rowcount} rows backfilled.")
+
+    print(f"Converting {table}.time to TIMESTAMP...")
+    conn.execute(text(f"""
+        ALTER TABLE {table}
+        ALTER COLUMN time TYPE TIMESTAMP USING time::timestamp;
+    """))
+    print(f"✓ {table} updated.")
+
+
+def migrate_typed_dates():
+    print("Migrating date/time columns to typed columns...")
+
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_CASTABLE))
+        migrate_game_date(conn)
+        for table, fallback_column in LEDGER_TABLES.items():
+            migrate_ledger_time(conn, table, fallback_column)
+
+        print("Adding (team_id, date) index to game...")
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_game_team_id_date ON game (team_id, date);
+        """))
+        print("✓ game updated.")
+
+    print("\n✅ Successfully migrated date/time columns!")
+    print("\nSummary of changes:")
+    print("  - game: 'date' is DATE, added 'ix_game_team_id_date' index")
+    for table in LEDGER_TABLES:
+        print(f"  - {table}: 'time' is TIMESTAMP")
+
+
+if __name__ == "__main__":
+    try:
+        migrate_typed_dates()
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -16,6 +16,27 @@ def verify_schema():
         "add_on": ["id", "user_id", "game_id", "time", "amount", "status"],
         "cash_out": ["id", "user_id", "game_id", "time", "amount", "status"],
         "user_game_association": ["user_id", "game_id", "status"],
+        "team": [
+            "id",
+            "name",
+            "search_code",
+            "games_version",
+            "time_decay_grace_days",
+            "time_decay_rate",
+        ],
+        "game": ["id", "team_id", "date", "running", "pot", "player_count"],
+        "game_result": [
+            "id",
+            "game_id",
+            "team_id",
+            "user_id",
+            "game_date",
+            "played_at",
+            "net",
+            "player_count",
+            "pot",
+            "position",
+        ],
     }
     
     inspector = inspect(engine)
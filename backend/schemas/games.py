@@ -1,11 +1,11 @@
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
 from pydantic_core import PydanticCustomError
 
 
 class GameCreate(BaseModel):
-    date: str
+    date: date
     default_buy_in: float
     running: bool
     team_id: str
@@ -53,7 +53,7 @@ class GameJoin(BaseModel):
 
 class GameShow(BaseModel):
     id: str
-    date: str
+    date: date
     running: bool
     team: str
 
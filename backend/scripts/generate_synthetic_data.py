@@ -0,0 +1,443 @@
+import sys
+import os
+import argparse
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+# Ensure backend modules can be imported
+sys.path.append(os.getcwd())
+
+import numpy as np
+from sqlalchemy import false, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+import backend.db.base  # noqa: F401 - registers all models
+from backend.core.hashing import Hasher
+from backend.core.team_codes import team_code
+from backend.db.models.add_on import AddOn
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.cash_out import CashOut
+from backend.db.models.chip import Chip
+from backend.db.models.chip_amount import ChipAmount
+from backend.db.models.chip_structure import ChipStructure
+from backend.db.models.game import Game
+from backend.db.models.game_result import GameResult
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.team import TEAM_CODE_SEQUENCE, Team
+from backend.db.models.team_role import TeamRole
+from backend.db.models.user import User
+from backend.db.models.user_game import UserGame
+from backend.db.models.user_team import UserTeam
+from backend.db.repository.game_result import write_game_results
+
+DEFAULT_PASSWORD = "synthetic123"
+
+CHIP_SET = [("white", 1.0), ("red", 5.0), ("green", 25.0), ("black", 100.0)]
+BUY_INS = [20.0, 50.0, 100.0, 200.0]
+
+# Tables in foreign key order
+TABLES = [
+    User.__table__,
+    Team.__table__,
+    UserTeam.__table__,
+    ChipStructure.__table__,
+    Chip.__table__,
+    Game.__table__,
+    UserGame.__table__,
+    BuyIn.__table__,
+    AddOn.__table__,
+    CashOut.__table__,
+    ChipAmount.__table__,
+]
+
+
+@dataclass
+class GeneratorConfig:
+    teams: int = 10
+    players_per_team: int = 30
+    guests_per_team: int = 10
+    games_per_year: int = 50
+    years: int = 3
+    seed: int = 0
+    batch_size: int = 10000
+    password: str = DEFAULT_PASSWORD
+
+
+@dataclass
+class GeneratedTeam:
+    team_id: int
+    admin_id: int
+    admin_email: str
+    running_game_id: Optional[int]
+    finished_game_id: Optional[int]
+
+
+@dataclass
+class GeneratorSummary:
+    teams: List[GeneratedTeam] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+
+
+class BulkWriter:
+    """
+    Buffers rows per table and writes them with executemany INSERTs.
+    Primary keys are assigned here (continuing after the current max id), so
+    child rows can reference parents without a round trip per row.
+    """
+
+    def __init__(self, conn: Connection, batch_size: int):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers = {table.name: [] for table in TABLES}
+        self.counts = {table.name: 0 for table in TABLES}
+        self.next_ids = {}
+        for table in TABLES:
+            if "id" in table.c:
+                max_id = conn.execute(select(func.max(table.c.id))).scalar()
+                self.next_ids[table.name] = (max_id or 0) + 1
+
+    def add(self, table, **row) -> Optional[int]:
+        if table.name in self.next_ids:
+            row["id"] = self.next_ids[table.name]
+            self.next_ids[table.name] += 1
+        self.buffers[table.name].append(row)
+        if len(self.buffers[table.name]) >= self.batch_size:
+            self.flush()
+        return row.get("id")
+
+    def flush(self):
+        # Parents first, so foreign keys are satisfied on every flush
+        for table in TABLES:
+            rows = self.buffers[table.name]
+            if rows:
+                self.conn.execute(insert(table), rows)
+                self.counts[table.name] += len(rows)
+                self.buffers[table.name] = []
+
+
+def sync_id_sequences(conn: Connection):
+    """Moves PostgreSQL id sequences past the explicitly inserted ids."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in TABLES:
+        if "id" in table.c:
+            conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+                    f"coalesce(max(id), 0) + 1, false) FROM \"{table.name}\""
+                )
+            )
+
+
+def chip_counts(amount: float, chips: List[tuple]) -> List[tuple]:
+    """Greedy split of an amount into (chip_id, count), largest chips first."""
+    counts = []
+    remaining = int(round(amount))
+    for chip_id, value in sorted(chips, key=lambda c: -c[1]):
+        count, remaining = divmod(remaining, int(value))
+        if count:
+            counts.append((chip_id, count))
+    return counts
+
+
+def ascii_nick(nick: str) -> str:
+    # Same normalization the guest join flow uses for guest e-mails
+    normalized = unicodedata.normalize("NFKD", nick).encode("ascii", "ignore").decode()
+    return "".join(c for c in normalized if c.isalnum()).lower() or "guest"
+
+
+def generate_team(
+    writer: BulkWriter,
+    rng: np.random.Generator,
+    config: GeneratorConfig,
+    team_index: int,
+    hashed_password: str,
+    today: date,
+) -> GeneratedTeam:
+    # Allocated like generate_team_code does; on SQLite that takes the
+    # highest team id, i.e. the id this team is about to get minus one
+    if writer.conn.dialect.name == "postgresql":
+        number = writer.conn.scalar(TEAM_CODE_SEQUENCE.next_value())
+    else:
+        number = writer.next_ids[Team.__tablename__] - 1
+    search_code = team_code(number)
+    total_games = config.games_per_year * config.years
+    team_id = writer.add(
+        Team.__table__,
+        name=f"Synthetic team {team_index}",
+        search_code=search_code,
+        games_version=total_games + 1,
+    )
+
+    # Chip structure
+    chip_structure_id = writer.add(
+        ChipStructure.__table__, name="Default", team_id=team_id
+    )
+    chips = [
+        (
+            writer.add(
+                Chip.__table__,
+                color=color,
+                value=value,
+                chip_structure_id=chip_structure_id,
+            ),
+            value,
+        )
+        for color, value in CHIP_SET
+    ]
+
+    # Members and guests
+    member_ids = []
+    admin_email = None
+    for i in range(config.players_per_team):
+        user_id = writer.next_ids[User.__table__.name]
+        email = f"player{user_id}@synthetic.example.com"
+        writer.add(
+            User.__table__,
+            email=email,
+            hashed_password=hashed_password,
+            nick=f"Player {user_id}",
+            is_active=True,
+            is_superuser=False,
+        )
+        if i == 0:
+            admin_email = email
+        member_ids.append(user_id)
+
+    guest_ids = []
+    for _ in range(config.guests_per_team):
+        user_id = writer.next_ids[User.__table__.name]
+        nick = f"Guest {user_id}"
+        writer.add(
+            User.__table__,
+            email=f"{ascii_nick(nick)}_{search_code}@over-bet.com",
+            hashed_password=hashed_password,
+            nick=nick,
+            is_active=True,
+            is_superuser=False,
+        )
+        guest_ids.append(user_id)
+
+    player_ids = member_ids + guest_ids
+    for user_id in player_ids:
+        writer.add(
+            UserTeam.__table__,
+            user_id=user_id,
+            team_id=team_id,
+            status=PlayerRequestStatus.APPROVED,
+            role=TeamRole.ADMIN if user_id == member_ids[0] else TeamRole.MEMBER,
+        )
+
+    # Heavy-tailed attendance: a few regulars, a long tail of rare players.
+    # Guests get a smaller propensity on top.
+    propensity = rng.pareto(1.2, size=len(player_ids)) + 0.05
+    propensity[len(member_ids):] *= 0.2
+    attendance = propensity / propensity.sum()
+
+    # Games, spread over the years with the newest one still running
+    span_days = 365 * config.years
+    days_ago = np.sort(rng.integers(1, span_days + 1, size=total_games))[::-1]
+    default_buy_in = float(rng.choice(BUY_INS))
+    running_game_id = None
+    finished_game_id = None
+
+    for game_index in range(total_games + 1):
+        running = game_index == total_games
+        game_day = today if running else today - timedelta(days=int(days_ago[game_index]))
+        start = datetime.combine(game_day, datetime.min.time()) + timedelta(
+            hours=int(rng.integers(18, 22)), minutes=int(rng.choice([0, 15, 30, 45]))
+        )
+        finish = None if running else start + timedelta(minutes=int(rng.integers(180, 420)))
+
+        table_size = int(min(len(player_ids), rng.integers(4, 11)))
+        seated = rng.choice(player_ids, size=table_size, replace=False, p=attendance)
+        owner_id = int(seated[0])
+
+        game_id = writer.add(
+            Game.__table__,
+            date=game_day,
+            start_time=start,
+            finish_time=finish,
+            default_buy_in=default_buy_in,
+            running=running,
+            owner_id=owner_id,
+            book_keeper_id=owner_id,
+            team_id=team_id,
+            chip_structure_id=chip_structure_id,
+        )
+        if running:
+            running_game_id = game_id
+        else:
+            finished_game_id = game_id
+
+        stacks = []
+        for user_id in seated:
+            user_id = int(user_id)
+            writer.add(
+                UserGame.__table__,
+                user_id=user_id,
+                game_id=game_id,
+                status=PlayerRequestStatus.APPROVED,
+            )
+            writer.add(
+                BuyIn.__table__,
+                user_id=user_id,
+                game_id=game_id,
+                amount=default_buy_in,
+                time=start + timedelta(minutes=int(rng.integers(0, 30))),
+            )
+            stack = default_buy_in
+
+            # Add-ons in mixed statuses; open requests only in the running game
+            for _ in range(int(rng.poisson(0.5))):
+                if running:
+                    status = (
+                        PlayerRequestStatus.REQUESTED
+                        if rng.random() < 0.5
+                        else PlayerRequestStatus.APPROVED
+                    )
+                else:
+                    status = (
+                        PlayerRequestStatus.DECLINED
+                        if rng.random() < 0.1
+                        else PlayerRequestStatus.APPROVED
+                    )
+                writer.add(
+                    AddOn.__table__,
+                    user_id=user_id,
+                    game_id=game_id,
+                    amount=default_buy_in,
+                    time=start + timedelta(minutes=int(rng.integers(30, 180))),
+                    status=status,
+                )
+                if status == PlayerRequestStatus.APPROVED:
+                    stack += default_buy_in
+            stacks.append(stack)
+
+        if running:
+            continue
+
+        # Zero-sum cash-outs in whole chips: skewed shares of the pot
+        pot = int(round(sum(stacks)))
+        shares = rng.gamma(0.8, size=table_size)
+        amounts = np.floor(pot * shares / shares.sum()).astype(int)
+        amounts[int(np.argmax(amounts))] += pot - int(amounts.sum())
+        for user_id, amount in zip(seated, amounts):
+            cash_out_id = writer.add(
+                CashOut.__table__,
+                user_id=int(user_id),
+                game_id=game_id,
+                amount=float(amount),
+                time=finish,
+                status=PlayerRequestStatus.APPROVED,
+            )
+            for chip_id, count in chip_counts(amount, chips):
+                writer.add(
+                    ChipAmount.__table__,
+                    chip_id=chip_id,
+                    amount=count,
+                    cash_out_id=cash_out_id,
+                )
+
+    return GeneratedTeam(
+        team_id=team_id,
+        admin_id=member_ids[0],
+        admin_email=admin_email,
+        running_game_id=running_game_id,
+        finished_game_id=finished_game_id,
+    )
+
+
+def generate_synthetic_data(
+    conn: Connection, config: GeneratorConfig, today: Optional[date] = None
+) -> GeneratorSummary:
+    """
+    Writes the synthetic data set through `conn`. The caller owns the
+    transaction; the same seed and `today` always produce the same rows.
+    """
+    rng = np.random.default_rng(config.seed)
+    today = today or date.today()
+    hashed_password = Hasher.get_password_hash(config.password)
+
+    writer = BulkWriter(conn, config.batch_size)
+    first_game_id = writer.next_ids[Game.__tablename__]
+    summary = GeneratorSummary()
+    for team_index in range(config.teams):
+        summary.teams.append(
+            generate_team(writer, rng, config, team_index, hashed_password, today)
+        )
+    writer.flush()
+    sync_id_sequences(conn)
+
+    summary.rows = dict(writer.counts)
+    # Games get consecutive ids, so these are the ones generated above
+    game_ids = list(range(first_game_id, writer.next_ids[Game.__tablename__]))
+    summary.rows[GameResult.__tablename__] = write_results(conn, game_ids)
+    return summary
+
+
+def write_results(conn: Connection, game_ids: List[int], batch_size: int = 500) -> int:
+    """
+    Result rows of the given games that are finished, as finishing them would
+    write. Games that were already in the database are left alone.
+    """
+    written = 0
+    with Session(bind=conn) as db:
+        for start in range(0, len(game_ids), batch_size):
+            games = db.scalars(
+                select(Game).where(
+                    Game.id.in_(game_ids[start : start + batch_size]),
+                    Game.running == false(),
+                )
+            ).all()
+            written += write_game_results(games, db)
+            db.expunge_all()
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic teams, players and games for load testing."
+    )
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--players-per-team", type=int, default=30)
+    parser.add_argument("--guests-per-team", type=int, default=10)
+    parser.add_argument("--games-per-year", type=int, default=50)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--batch-size", type=int, default=10000, help="Rows per INSERT batch"
+    )
+    parser.add_argument(
+        "--password",
+        default=DEFAULT_PASSWORD,
+        help=f"Password of every generated user (default: {DEFAULT_PASSWORD})",
+    )
+
+    args = parser.parse_args()
+
+    from backend.db.session import engine
+
+    config = GeneratorConfig(
+        teams=args.teams,
+        players_per_team=args.players_per_team,
+        guests_per_team=args.guests_per_team,
+        games_per_year=args.games_per_year,
+        years=args.years,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        password=args.password,
+    )
+    started = datetime.now()
+    with engine.begin() as conn:
+        summary = generate_synthetic_data(conn, config)
+
+    print(f"Generated in {(datetime.now() - started).total_seconds():.1f}s:")
+    for table_name, count in summary.rows.items():
+        print(f"  {table_name}: {count}")
+    first = summary.teams[0] if summary.teams else None
+    if first:
+        print(f"Log in as {first.admin_email} / {args.password} (admin of team {first.team_id})")
@@ -21,8 +21,11 @@ from backend.db.models.add_on import AddOn
 from backend.db.models.user_verification import UserVerification
 from backend.db.models.player_request_status import PlayerRequestStatus
 from backend.core.hashing import Hasher
-from backend.db.repository.team import create_new_team
-from backend.schemas.team import TeamCreate
+from backend.db.repository.game_result import write_game_results
+from backend.db.repository.team import (
+    bump_team_games_version,
+    create_team_with_new_code,
+)
 
 
 def get_db():
@@ -154,14 +157,12 @@ def parse_legacy_file(filepath: str):
             current_idx += 1
             continue
 
-        date_iso = dt.date().isoformat()
-
         # Times: 20:00 to 01:00 next day
         start_time = dt.replace(hour=20, minute=0, second=0)
         finish_time = start_time + timedelta(hours=5)
 
         game_record = {
-            "date": date_iso,
+            "date": dt.date(),
             "start_time": start_time,
             "finish_time": finish_time,
             "player_stats": [],
@@ -253,12 +254,7 @@ def get_or_create_team(db: Session, user: User, team_name: str) -> Team:
     # Try to find team globally by name? Or creates new unique one?
     # Team names might be unique or per user. Assuming creating new if not in user's list.
     print(f"Creating new team: {team_name}")
-    import random
-
-    # Generate random numeric code like "1234"
-    code = str(random.randint(1000, 9999))
-    new_team = create_new_team(TeamCreate(name=team_name, search_code=code), user, db)
-    return new_team
+    return create_team_with_new_code(team_name, user, db)
 
 
 def run_import(file_path: str, admin_nick: str, admin_email: str, team_name: str):
@@ -381,9 +377,14 @@ def run_import(file_path: str, admin_nick: str, admin_email: str, team_name: str
             )
             db.add(cash_out)
 
+        write_game_results([new_game], db)
         db.commit()
         created_count += 1
 
+    if created_count:
+        bump_team_games_version(team.id, db)
+        db.commit()
+
     print(f"Successfully imported {created_count} games into Team '{team.name}'.")
 
 
@@ -117,3 +117,32 @@ def mock_team_create_data() -> TeamCreate:
     return TeamCreate(
         name="TestGame",
     )
+
+
+@pytest.fixture(scope="function")
+def team_owner(db_session: SessionTesting):
+    """Creates an admin user with a team and a chip structure."""
+    from backend.db.models.chip_structure import ChipStructure
+    from backend.db.models.player_request_status import PlayerRequestStatus
+    from backend.db.models.team import Team
+    from backend.db.models.team_role import TeamRole
+    from backend.db.models.user import User
+    from backend.db.models.user_team import UserTeam
+
+    owner = User(email="owner@example.com", hashed_password="pass", nick="Owner")
+    team = Team(name="Friday Game", search_code="1234")
+    db_session.add_all([owner, team])
+    db_session.commit()
+
+    db_session.add(
+        UserTeam(
+            user_id=owner.id,
+            team_id=team.id,
+            status=PlayerRequestStatus.APPROVED,
+            role=TeamRole.ADMIN,
+        )
+    )
+    chip_structure = ChipStructure(name="Default", team_id=team.id)
+    db_session.add(chip_structure)
+    db_session.commit()
+    return owner, team, chip_structure
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from backend.core.debt_settlement import Transfer, minimal_transfers
+
+
+def settled(balances, transfers):
+    """Balances after the transfers, in cents."""
+    cents = {p: round(b * 100) for p, b in balances.items()}
+    for t in transfers:
+        cents[t.payer_id] = cents.get(t.payer_id, 0) + round(t.amount * 100)
+        cents[t.payee_id] = cents.get(t.payee_id, 0) - round(t.amount * 100)
+    return {p: c for p, c in cents.items() if c}
+
+
+def test_exact_search_finds_zero_sum_groups():
+    balances = {1: 6, 2: 4, 3: -3, 4: -3, 5: -2, 6: -2}
+
+    transfers = minimal_transfers(balances)
+    greedy = minimal_transfers(balances, exact_max_players=0)
+
+    # {1, 3, 4} and {2, 5, 6} settle separately with two transfers each
+    assert len(transfers) == 4
+    assert len(greedy) == 5
+    assert settled(balances, transfers) == settled(balances, greedy) == {}
+
+
+def test_opposite_balances_pay_each_other():
+    transfers = minimal_transfers({1: 25.5, 2: -10, 3: -25.5, 4: 10, 5: 0})
+
+    assert sorted(transfers, key=lambda t: t.payer_id) == [
+        Transfer(payer_id=2, payee_id=4, amount=10.0),
+        Transfer(payer_id=3, payee_id=1, amount=25.5),
+    ]
+
+
+def test_unbalanced_games_settle_the_difference_with_the_pot():
+    transfers = minimal_transfers({1: 10, 2: -5})
+
+    assert Transfer(payer_id=None, payee_id=1, amount=5.0) in transfers
+    assert len(transfers) == 2
+
+
+@pytest.mark.parametrize("players", [3, 8, 12, 40, 2000])
+def test_transfers_settle_everyone(players):
+    rng = random.Random(players)
+    balances = {p: rng.randint(-20000, 20000) / 100 for p in range(players - 1)}
+    balances[players - 1] = -round(sum(balances.values()), 2)
+
+    transfers = minimal_transfers(balances)
+
+    assert settled(balances, transfers) == {}
+    assert len(transfers) < players
+    assert all(t.amount > 0 for t in transfers)
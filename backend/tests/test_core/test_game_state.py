@@ -0,0 +1,70 @@
+from backend.core.game_state import apply_event, empty_totals, event_kind
+
+
+def test_events_move_amounts_between_totals():
+    players = {}
+    events = [
+        {"type": "player_joined", "user_id": 1},
+        {"type": "buy_in", "user_id": 1, "amount": 50, "status": "APPROVED"},
+        {
+            "type": "add_on_requested",
+            "user_id": 1,
+            "amount": 20,
+            "status": "REQUESTED",
+        },
+        {
+            "type": "add_on_approved",
+            "user_id": 1,
+            "amount": 20,
+            "previous_amount": 20,
+            "status": "APPROVED",
+            "previous_status": "REQUESTED",
+        },
+        {
+            "type": "add_on_edited",
+            "user_id": 1,
+            "amount": 30,
+            "previous_amount": 20,
+            "status": "APPROVED",
+            "previous_status": "APPROVED",
+        },
+        {
+            "type": "cash_out_requested",
+            "user_id": 1,
+            "amount": 90,
+            "status": "REQUESTED",
+        },
+        {
+            "type": "cash_out_declined",
+            "user_id": 1,
+            "amount": 90,
+            "previous_amount": 90,
+            "status": "DECLINED",
+            "previous_status": "REQUESTED",
+        },
+    ]
+    for event in events:
+        apply_event(players, event)
+
+    assert players == {"1": {**empty_totals(), "buy_in": 50, "add_on": 30}}
+
+
+def test_removed_players_leave_the_table():
+    players = {}
+    buy_in = {"type": "buy_in", "user_id": 2, "amount": 50, "status": "APPROVED"}
+    apply_event(players, buy_in)
+    apply_event(
+        players,
+        {
+            "type": "buy_in_deleted",
+            "user_id": 2,
+            "previous_amount": 50,
+            "previous_status": "APPROVED",
+        },
+    )
+    assert players == {"2": empty_totals()}
+
+    apply_event(players, {"type": "player_removed", "user_id": 2})
+    assert players == {}
+    assert event_kind("cash_out_edited") == "cash_out"
+    assert event_kind("player_joined") is None
@@ -0,0 +1,28 @@
+import pytest
+
+from backend.core.team_codes import first_number_with_digits, team_code
+
+
+def test_codes_are_a_permutation_of_each_length():
+    codes = [team_code(n, key="key") for n in range(10**4)]
+
+    assert sorted(codes) == [f"{n:04d}" for n in range(10**4)]
+    # Consecutive numbers don't give consecutive codes
+    assert codes[:3] != sorted(codes[:3]) or int(codes[1]) - int(codes[0]) != 1
+
+
+def test_codes_get_longer_once_a_length_is_used_up():
+    assert first_number_with_digits(4) == 0
+    assert first_number_with_digits(6) == 10**4 + 10**5
+    assert len(team_code(10**4 - 1, key="key")) == 4
+    assert len(team_code(10**4, key="key")) == 5
+    assert len(team_code(first_number_with_digits(6), key="key")) == 6
+
+
+def test_codes_depend_on_the_key():
+    first = [team_code(n, key="one") for n in range(20)]
+    second = [team_code(n, key="two") for n in range(20)]
+
+    assert first != second
+    with pytest.raises(ValueError):
+        team_code(-1, key="one")
@@ -0,0 +1,56 @@
+import math
+from datetime import date, datetime
+
+import pytest
+
+from backend.core.time_weighting import time_weighted_stats, time_weights
+
+TODAY = date(2024, 6, 1)
+
+
+def reference_weight(days_ago, grace_days=180, decay_rate=0.0018):
+    # Per-game formula the player page used before vectorizing
+    if days_ago <= grace_days:
+        return 1.0 - (days_ago / grace_days) * 0.05
+    return 0.95 * math.exp(-decay_rate * (days_ago - grace_days))
+
+
+def test_time_weights_match_per_game_formula():
+    days_ago = [0, 90, 180, 365, 3 * 365]
+    dates = [date.fromordinal(TODAY.toordinal() - d) for d in days_ago]
+
+    weights = time_weights(dates, today=TODAY)
+
+    assert weights == pytest.approx([reference_weight(d) for d in days_ago])
+    assert weights[-1] == pytest.approx(0.2, abs=0.02)
+
+
+def test_time_weights_accept_datetimes_and_team_params():
+    weights = time_weights(
+        [datetime(2024, 5, 22, 20, 0)], today=TODAY, grace_days=0, decay_rate=0.1
+    )
+
+    assert weights == pytest.approx([0.95 * math.exp(-1.0)])
+
+
+def test_time_weighted_stats():
+    balances = [100.0, -50.0, 20.0]
+    dates = [date(2024, 5, 1), date(2023, 1, 1), date(2021, 1, 1)]
+
+    stats = time_weighted_stats(balances, dates, today=TODAY)
+
+    weights = [reference_weight((TODAY - d).days) for d in dates]
+    total = sum(weights)
+    mean = sum(w * b for w, b in zip(weights, balances)) / total
+    variance = sum(w * (b - mean) ** 2 for w, b in zip(weights, balances)) / total
+    assert stats.mean == pytest.approx(mean)
+    assert stats.variance == pytest.approx(variance)
+    assert stats.std_dev == pytest.approx(math.sqrt(variance))
+    assert stats.effective_n == pytest.approx(total)
+
+
+def test_time_weighted_stats_empty():
+    stats = time_weighted_stats([], [], today=TODAY)
+
+    assert stats.effective_n == 0
+    assert stats.mean == 0
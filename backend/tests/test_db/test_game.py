@@ -0,0 +1,139 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.db.models.game import Game
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.user import User
+from backend.db.models.user_game import UserGame
+from backend.db.repository.game import (
+    delete_game_by_id,
+    finish_the_game,
+    game_year_filter,
+    get_team_game_years,
+    get_user_running_games,
+)
+from backend.db.repository.team import get_user_teams_games_version
+from backend.tests.utils.games import create_game
+from backend.tests.utils.queries import max_queries
+
+
+def test_games_version_bumped_on_create_finish_and_delete(
+    db_session: Session, team_owner
+):
+    owner, team, chip_structure = team_owner
+    assert get_user_teams_games_version(owner.id, db_session) == 0
+
+    game = create_game(owner, team, chip_structure, db_session)
+    assert get_user_teams_games_version(owner.id, db_session) == 1
+
+    finish_the_game(owner, game, db_session)
+    assert get_user_teams_games_version(owner.id, db_session) == 2
+
+    assert delete_game_by_id(game.id, db_session)
+    assert get_user_teams_games_version(owner.id, db_session) == 3
+
+
+def test_games_version_is_zero_without_teams(db_session: Session):
+    loner = User(email="loner@example.com", hashed_password="pass", nick="Loner")
+    db_session.add(loner)
+    db_session.commit()
+
+    assert get_user_teams_games_version(loner.id, db_session) == 0
+
+
+def test_user_running_games_flags_participation(db_session: Session, team_owner):
+    owner, team, chip_structure = team_owner
+    joined = create_game(owner, team, chip_structure, db_session)
+    not_joined = create_game(owner, team, chip_structure, db_session)
+    finished = create_game(owner, team, chip_structure, db_session)
+    db_session.add(
+        UserGame(
+            user_id=owner.id,
+            game_id=joined.id,
+            status=PlayerRequestStatus.APPROVED,
+        )
+    )
+    db_session.commit()
+    finish_the_game(owner, finished, db_session)
+
+    owner_id = owner.id
+    with max_queries(1):
+        rows = get_user_running_games(owner_id, db_session)
+
+    assert {row.id: row.is_player for row in rows} == {
+        joined.id: True,
+        not_joined.id: False,
+    }
+
+
+def test_year_filter_uses_date_range(db_session: Session, team_owner):
+    owner, team, chip_structure = team_owner
+    for game_date in ["2023-12-31", "2024-01-01", "2024-12-31", "2025-01-01"]:
+        create_game(owner, team, chip_structure, db_session, game_date=game_date)
+
+    dates = [
+        g.date
+        for g in db_session.query(Game)
+        .filter(Game.team_id == team.id, game_year_filter("2024"))
+        .order_by(Game.date)
+    ]
+
+    assert dates == [date(2024, 1, 1), date(2024, 12, 31)]
+    assert db_session.query(Game).filter(game_year_filter("junk")).count() == 0
+    assert get_team_game_years(team.id, db_session) == [2025, 2024, 2023]
+
+
+@pytest.mark.parametrize("sort", ["date", "players", "pot", "balance"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_past_games_pages_follow_the_sort(
+    db_session: Session, team_owner, sort, order
+):
+    from backend.db.models.game_result import GameResult
+    from backend.db.repository.game import get_past_games_page
+
+    owner, team, chip_structure = team_owner
+    dates = ["2024-01-05", "2024-01-05", "2024-02-01", "2024-03-01", "2024-03-09"]
+    for i, game_date in enumerate(dates):
+        game = create_game(owner, team, chip_structure, db_session, game_date)
+        game.running = False
+        game.pot = [100, 300, 100, 200, 300][i]
+        game.player_count = [4, 2, 4, 3, 2][i]
+        if i % 2:
+            db_session.add(
+                GameResult(
+                    game_id=game.id,
+                    team_id=team.id,
+                    user_id=owner.id,
+                    game_date=game.date,
+                    played_at=datetime(2024, 1, 1),
+                    net=[0, -20, 0, 15, 0][i],
+                    player_count=game.player_count,
+                    pot=game.pot,
+                    position=1,
+                    created_at=datetime(2024, 1, 1),
+                )
+            )
+    create_game(owner, team, chip_structure, db_session)  # running, not listed
+    db_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = get_past_games_page(
+            [team.id], owner.id, db_session, sort, order, cursor, limit=2
+        )
+        seen.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    attribute = {"date": "date", "players": "players_count", "pot": "total_pot"}.get(
+        sort, "my_balance"
+    )
+    expected = sorted(
+        seen, key=lambda row: (getattr(row, attribute), row.id), reverse=order == "desc"
+    )
+    assert len(seen) == 5
+    assert [row.id for row in seen] == [row.id for row in expected]
+    assert sorted(row.my_balance for row in seen) == [-20, 0, 0, 0, 15]
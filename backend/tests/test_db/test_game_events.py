@@ -0,0 +1,118 @@
+from datetime import datetime
+
+from sqlalchemy import delete
+
+from backend.db.game_events import rebuild_players
+from backend.db.models.add_on import AddOn
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.game_event import GameEvent, GameSnapshot
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.user_game import UserGame
+from backend.db.repository.game_event import get_game_events_since, get_game_snapshot
+from backend.db.repository.settlement import decide_pending_requests
+from backend.tests.utils.games import create_game
+
+
+def test_changes_are_logged_and_applied_to_the_snapshot(db_session, team_owner):
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    assert get_game_snapshot(game.id, db_session) == (0, {})
+
+    db_session.add_all(
+        [
+            UserGame(
+                user_id=owner.id,
+                game_id=game.id,
+                status=PlayerRequestStatus.APPROVED,
+            ),
+            BuyIn(user_id=owner.id, game_id=game.id, amount=50, time=datetime.now()),
+            AddOn(user_id=owner.id, game_id=game.id, amount=20, time=datetime.now()),
+        ]
+    )
+    db_session.commit()
+    decide_pending_requests(game, PlayerRequestStatus.APPROVED, db_session)
+    db_session.commit()
+    add_on = db_session.query(AddOn).one()
+    add_on.amount = 30
+    db_session.commit()
+    db_session.delete(add_on)
+    db_session.commit()
+
+    events = get_game_events_since(game.id, 0, db_session)
+    assert [(e["seq"], e["type"]) for e in events] == [
+        (1, "player_joined"),
+        (2, "buy_in"),
+        (3, "add_on_requested"),
+        (4, "add_on_approved"),
+        (5, "add_on_edited"),
+        (6, "add_on_deleted"),
+    ]
+    assert events[4]["previous_amount"] == 20 and events[4]["amount"] == 30
+    assert [e["seq"] for e in get_game_events_since(game.id, 4, db_session)] == [5, 6]
+
+    seq, players = get_game_snapshot(game.id, db_session)
+    assert seq == 6
+    assert players == rebuild_players(db_session.connection(), game.id)
+    assert players[str(owner.id)]["buy_in"] == 50
+    assert players[str(owner.id)]["add_on"] == 0
+
+
+def test_games_without_a_snapshot_are_rebuilt_from_their_ledgers(
+    db_session, team_owner
+):
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    db_session.add(
+        BuyIn(user_id=owner.id, game_id=game.id, amount=50, time=datetime.now())
+    )
+    db_session.commit()
+    # As if the game had started before the log existed
+    db_session.execute(delete(GameEvent).where(GameEvent.game_id == game.id))
+    db_session.execute(delete(GameSnapshot).where(GameSnapshot.game_id == game.id))
+    db_session.commit()
+    assert get_game_snapshot(game.id, db_session)[1][str(owner.id)]["buy_in"] == 50
+
+    db_session.add(
+        BuyIn(user_id=owner.id, game_id=game.id, amount=25, time=datetime.now())
+    )
+    db_session.commit()
+
+    seq, players = get_game_snapshot(game.id, db_session)
+    assert seq == 1
+    assert players[str(owner.id)]["buy_in"] == 75
+    assert [e["type"] for e in get_game_events_since(game.id, 0, db_session)] == [
+        "buy_in"
+    ]
+
+
+def test_edits_of_expired_objects_keep_their_previous_values(db_session, team_owner):
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    add_on = AddOn(user_id=owner.id, game_id=game.id, amount=20, time=datetime.now())
+    db_session.add_all([UserGame(user_id=owner.id, game_id=game.id), add_on])
+    db_session.commit()  # expires add_on
+
+    add_on.status = PlayerRequestStatus.APPROVED
+    db_session.commit()
+    add_on.amount = 25
+    db_session.commit()
+
+    events = get_game_events_since(game.id, 0, db_session)
+    assert [
+        (e["type"], e["previous_status"], e["previous_amount"]) for e in events
+    ] == [
+        ("player_joined", None, None),
+        ("add_on_requested", None, None),
+        ("add_on_approved", "REQUESTED", 20),
+        ("add_on_edited", "APPROVED", 20),
+    ]
+    seq, players = get_game_snapshot(game.id, db_session)
+    assert players == rebuild_players(db_session.connection(), game.id)
+    assert players[str(owner.id)]["add_on"] == 25
+
+    db_session.delete(add_on)
+    db_session.commit()
+    assert get_game_events_since(game.id, seq, db_session)[0]["previous_amount"] == 25
+    seq, players = get_game_snapshot(game.id, db_session)
+    assert players == rebuild_players(db_session.connection(), game.id)
+    assert players[str(owner.id)]["add_on"] == 0
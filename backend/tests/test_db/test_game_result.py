@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from backend.db.models.add_on import AddOn
+from backend.db.models.buy_in import BuyIn
+from backend.db.models.cash_out import CashOut
+from backend.db.models.game_result import GameResult
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.user import User
+from backend.db.repository.game import finish_the_game
+from backend.db.repository.game_result import (
+    backfill_game_results,
+    get_settlement_transfers,
+    get_team_results,
+    write_game_results,
+)
+from backend.tests.utils.games import create_game
+
+
+def play(game, owner, db_session: Session):
+    """Owner wins 30, guest loses 30; declined requests don't count."""
+    guest = User(email="guest@example.com", hashed_password="pass", nick="Guest")
+    db_session.add(guest)
+    db_session.commit()
+    now = datetime.now()
+    db_session.add_all(
+        [
+            BuyIn(user_id=owner.id, game_id=game.id, amount=50, time=now),
+            BuyIn(user_id=guest.id, game_id=game.id, amount=50, time=now),
+            AddOn(
+                user_id=owner.id,
+                game_id=game.id,
+                amount=20,
+                time=now,
+                status=PlayerRequestStatus.APPROVED,
+            ),
+            AddOn(
+                user_id=guest.id,
+                game_id=game.id,
+                amount=500,
+                time=now,
+                status=PlayerRequestStatus.REQUESTED,
+            ),
+            CashOut(
+                user_id=owner.id,
+                game_id=game.id,
+                amount=100,
+                time=now,
+                status=PlayerRequestStatus.APPROVED,
+            ),
+            CashOut(
+                user_id=guest.id,
+                game_id=game.id,
+                amount=20,
+                time=now,
+                status=PlayerRequestStatus.APPROVED,
+            ),
+        ]
+    )
+    db_session.commit()
+    return guest
+
+
+def test_finishing_a_game_writes_its_results(db_session: Session, team_owner):
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    guest = play(game, owner, db_session)
+    assert get_team_results(team.id, db_session) == []
+
+    finish_the_game(owner, game, db_session)
+
+    results = {r.user_id: r for r in get_team_results(team.id, db_session, "2024")}
+    assert (results[owner.id].investment, results[owner.id].net) == (70, 30)
+    assert (results[guest.id].investment, results[guest.id].net) == (50, -30)
+    assert [results[owner.id].position, results[guest.id].position] == [1, 2]
+    assert {(r.pot, r.player_count) for r in results.values()} == {(120, 2)}
+    assert get_team_results(team.id, db_session, "2023") == []
+
+
+def test_results_are_rewritten_and_backfilled(db_session: Session, team_owner):
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    guest = play(game, owner, db_session)
+    finish_the_game(owner, game, db_session)
+
+    # Editing the history of a finished game replaces its rows
+    db_session.add(
+        BuyIn(user_id=guest.id, game_id=game.id, amount=30, time=datetime.now())
+    )
+    write_game_results([game], db_session)
+    db_session.commit()
+    nets = {r.user_id: r.net for r in game.results}
+    assert nets == {owner.id: 30, guest.id: -60}
+
+    db_session.query(GameResult).delete()
+    db_session.commit()
+    running = create_game(owner, team, chip_structure, db_session)
+
+    assert backfill_game_results(db_session) == 1
+    assert backfill_game_results(db_session) == 0
+    assert {r.game_id for r in get_team_results(team.id, db_session)} == {game.id}
+    assert running.results == []
+
+
+def test_settlement_transfers_net_finished_games(db_session: Session, team_owner):
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    guest = play(game, owner, db_session)
+    assert get_settlement_transfers(db_session, game_ids=[game.id]) == []
+
+    finish_the_game(owner, game, db_session)
+
+    transfers = get_settlement_transfers(db_session, game_ids=[game.id])
+    assert [(t["payer"], t["payee"], t["amount"]) for t in transfers] == [
+        (guest, owner, 30)
+    ]
+    month = get_settlement_transfers(
+        db_session,
+        team_id=team.id,
+        start=game.date,
+        end=game.date + timedelta(days=1),
+    )
+    assert month == transfers
+    assert get_settlement_transfers(db_session, team_id=team.id, end=game.date) == []
+
+
+def test_settlement_and_finish_decline_open_requests(db_session: Session, team_owner):
+    from backend.db.models.user_game import UserGame
+    from backend.db.repository.settlement import get_game_settlement
+
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    guest = play(game, owner, db_session)
+    for user in (owner, guest):
+        db_session.add(UserGame(user_id=user.id, game_id=game.id))
+    db_session.commit()
+
+    settlement = get_game_settlement(game, db_session)
+    by_user = {p.player.id: p for p in settlement.players}
+    assert (by_user[owner.id].money_in, by_user[owner.id].balance) == (70, 30)
+    assert (by_user[guest.id].money_in, by_user[guest.id].balance) == (50, -30)
+    assert settlement.all_cashed_out and not settlement.sum_warning
+
+    finish_the_game(owner, game, db_session)
+
+    statuses = {a.status for a in game.add_ons}
+    assert PlayerRequestStatus.REQUESTED not in statuses
+    assert PlayerRequestStatus.DECLINED in statuses
+    assert {r.user_id for r in game.results} == {owner.id, guest.id}
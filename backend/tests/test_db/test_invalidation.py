@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+
+from backend.core.cache import LocalCache
+from backend.db import invalidation
+from backend.db.models.buy_in import BuyIn
+from backend.db.repository.settlement import decline_pending_requests
+from backend.tests.utils.games import create_game
+
+
+@pytest.fixture
+def published(monkeypatch):
+    keys = []
+    monkeypatch.setattr(invalidation, "_subscribers", [])
+    invalidation.subscribe(lambda published_keys: keys.append(published_keys))
+    return keys
+
+
+def test_keys_are_published_on_commit_only(db_session, team_owner, published):
+    owner, team, chip_structure = team_owner
+    game = create_game(owner, team, chip_structure, db_session)
+    db_session.commit()
+    published.clear()
+
+    db_session.add(
+        BuyIn(user_id=owner.id, game_id=game.id, amount=50, time=datetime.now())
+    )
+    db_session.flush()
+    assert published == []
+    db_session.commit()
+    assert published == [{f"game:{game.id}", f"user:{owner.id}"}]
+
+    # Bulk statements publish what they were given
+    decline_pending_requests(game, db_session)  # nothing to decline
+    invalidation.invalidate(db_session, f"team:{team.id}")
+    db_session.commit()
+    assert published[-1] == {f"team:{team.id}"}
+
+    # Rolled back changes are never published
+    db_session.add(
+        BuyIn(user_id=owner.id, game_id=game.id, amount=50, time=datetime.now())
+    )
+    db_session.flush()
+    db_session.rollback()
+    db_session.commit()
+    assert len(published) == 2
+
+
+def test_local_cache_drops_invalidated_entries(published):
+    cache = LocalCache("test", max_entries=2)
+    loads = []
+
+    def load(value):
+        loads.append(value)
+        return value
+
+    assert cache.get(1, ["game:1"], lambda: load("a")) == "a"
+    assert cache.get(1, ["game:1"], lambda: load("b")) == "a"
+    cache.get(2, ["game:2", "team:1"], lambda: load("c"))
+
+    cache.invalidate({"team:1"})
+    assert cache.get(2, ["game:2"], lambda: load("d")) == "d"
+    assert cache.get(1, ["game:1"], lambda: load("e")) == "a"
+    assert loads == ["a", "c", "d"]
+
+    # A value loaded while an invalidation came in isn't kept
+    cache.get(3, ["game:3"], lambda: cache.invalidate({"game:9"}) or "f")
+    assert 3 not in cache.entries
+
+    # Least recently used entries go first; "*" drops everything
+    cache.get(4, ["game:4"], lambda: "g")
+    assert sorted(cache.entries) == [1, 4]
+    cache.invalidate({"*"})
+    assert len(cache) == 0
+
+
+def test_notify_payloads_stay_below_the_limit():
+    keys = {f"game:{i}" for i in range(2000)}
+
+    payloads = invalidation._payloads(keys)
+
+    assert len(payloads) > 1
+    assert all(len(p) < 8000 for p in payloads)
+    assert {k for p in payloads for k in p.split()} == keys
@@ -0,0 +1,107 @@
+import threading
+import time
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.db import replica
+from backend.db.replica import (
+    LAST_WRITE_COOKIE,
+    get_read_db,
+    install_read_your_writes_middleware,
+)
+from backend.db.session import get_db
+
+
+class FakeReplicaSession:
+    def close(self):
+        pass
+
+
+class FakeMonitor:
+    def __init__(self, healthy):
+        self._healthy = healthy
+
+    def healthy(self):
+        return self._healthy
+
+
+def make_client(db_session, replica_session, monkeypatch, healthy=True):
+    monkeypatch.setattr(replica, "lag_monitor", FakeMonitor(healthy))
+    monkeypatch.setattr(replica, "ReplicaSessionLocal", lambda: replica_session)
+
+    app = FastAPI()
+    install_read_your_writes_middleware(app)
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    @app.get("/read")
+    def read(db=Depends(get_read_db)):
+        return {"replica": db is replica_session}
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    return TestClient(app)
+
+
+def test_reads_use_replica(db_session, monkeypatch):
+    replica_session = FakeReplicaSession()
+    client = make_client(db_session, replica_session, monkeypatch)
+
+    assert client.get("/read").json() == {"replica": True}
+
+
+def test_reads_after_own_write_use_primary(db_session, monkeypatch):
+    replica_session = FakeReplicaSession()
+    client = make_client(db_session, replica_session, monkeypatch)
+
+    client.post("/write")
+    assert client.cookies.get(LAST_WRITE_COOKIE)
+    assert client.get("/read").json() == {"replica": False}
+
+    # Once the window has passed the replica is used again
+    client.cookies.set(LAST_WRITE_COOKIE, str(int(time.time()) - 3600))
+    assert client.get("/read").json() == {"replica": True}
+
+
+def test_lagging_replica_falls_back_to_primary(db_session, monkeypatch):
+    replica_session = FakeReplicaSession()
+    client = make_client(db_session, replica_session, monkeypatch, healthy=False)
+
+    assert client.get("/read").json() == {"replica": False}
+
+
+def test_lag_monitor_treats_unreachable_replica_as_unhealthy():
+    def broken_factory():
+        raise ConnectionError("replica down")
+
+    monitor = replica.ReplicaLagMonitor(broken_factory)
+    assert monitor.healthy() is False
+
+
+def test_lag_monitor_does_not_block_while_measuring():
+    started, release = threading.Event(), threading.Event()
+
+    class SlowSession:
+        def __enter__(self):
+            started.set()
+            release.wait(5)
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, query):
+            return type("Result", (), {"scalar": lambda self: 1.5})()
+
+    monitor = replica.ReplicaLagMonitor(SlowSession)
+    checker = threading.Thread(target=monitor.current_lag)
+    checker.start()
+    assert started.wait(5)
+
+    # The check in progress holds no lock: the last known lag is returned
+    assert monitor.current_lag() is None
+    release.set()
+    checker.join(5)
+    assert monitor.current_lag() == 1.5
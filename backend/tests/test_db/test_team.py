@@ -7,6 +7,7 @@ from starlette.testclient import TestClient
 
 from backend.db.models.user import User
 from backend.db.models.team import Team
+from backend.tests.utils.games import create_game
 
 
 @pytest.fixture
@@ -68,3 +69,139 @@ def test_create_team_with_owner_and_users(
     assert len(assoc) == 1
     assert assoc[0]._mapping["user_id"] == player.id
     assert assoc[0]._mapping["team_id"] == team.id
+
+
+def test_deleting_a_team_is_left_to_the_database(db_session: Session, team_owner):
+    from sqlalchemy import event
+
+    from backend.db.models.buy_in import BuyIn
+    from backend.db.models.cash_out import CashOut
+    from backend.db.models.chip import Chip
+    from backend.db.models.chip_amount import ChipAmount
+    from backend.db.models.chip_structure import ChipStructure
+    from backend.db.models.game import Game
+    from backend.db.models.game_result import GameResult
+    from backend.db.models.user_game import UserGame
+    from backend.db.models.user_team import UserTeam
+    from backend.db.repository.game import finish_the_game
+    from backend.db.repository.team import (
+        delete_team,
+        delete_team_in_batches,
+        get_team_by_search_code,
+        hide_team,
+        resume_team_deletions,
+    )
+    from backend.tests.test_db.test_game_result import play
+
+    owner, team, chip_structure = team_owner
+    team_id, chip_structure_id = team.id, chip_structure.id
+    game = create_game(owner, team, chip_structure, db_session)
+    play(game, owner, db_session)
+    chip = Chip(color="white", value=1, chip_structure_id=chip_structure.id)
+    db_session.add(chip)
+    db_session.flush()
+    for cash_out in db_session.query(CashOut):
+        db_session.add(ChipAmount(chip_id=chip.id, amount=1, cash_out_id=cash_out.id))
+    finish_the_game(owner, game, db_session)
+    db_session.expunge_all()  # nothing loaded, so nothing deleted by the ORM
+
+    statements = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    delete_team(db_session.get(Team, team_id), db_session)
+
+    assert not any("buy_in" in s or "cash_out" in s for s in statements)
+    cascaded = [Team, Game, UserTeam, UserGame, BuyIn, CashOut, ChipAmount, GameResult]
+    assert [db_session.query(model).count() for model in cascaded] == [0] * 8
+    chip_structure = db_session.get(ChipStructure, chip_structure_id)
+    assert chip_structure.team_id is None
+
+    # Big teams go batch by batch
+    owner = db_session.merge(owner)
+    team = Team(name="Big", search_code="4242")
+    db_session.add(team)
+    db_session.flush()
+    for _ in range(5):
+        create_game(owner, team, chip_structure, db_session)
+
+    assert delete_team_in_batches(team.id, db_session.get_bind(), batch_size=2) == 5
+    assert db_session.query(Game).count() == 0
+    assert db_session.query(Team).count() == 0
+
+    # A hidden team whose background delete never ran is deleted later
+    team = Team(name="Hidden", search_code="4243")
+    db_session.add(team)
+    db_session.flush()
+    create_game(owner, team, chip_structure, db_session)
+    hide_team(team, db_session)
+    assert get_team_by_search_code("4243", db_session) is None
+
+    assert resume_team_deletions(db_session.get_bind(), batch_size=2) == 1
+    assert db_session.query(Game).count() == 0
+    assert db_session.query(Team).count() == 0
+
+
+def test_team_codes_are_allocated_in_one_statement(db_session: Session, team_owner):
+    from sqlalchemy.exc import IntegrityError
+
+    from backend.db.repository.team import (
+        create_new_team,
+        generate_team_code,
+        get_team_by_search_code,
+    )
+    from backend.schemas.team import TeamCreate
+    from backend.tests.utils.queries import max_queries
+
+    owner = team_owner[0]
+    codes = []
+    for i in range(3):
+        with max_queries(1):  # no lookup of existing codes
+            code = generate_team_code(db_session)
+        team = TeamCreate(name=f"Team {i}", search_code=code)
+        create_new_team(team, owner, db_session)
+        codes.append(code)
+
+    assert len(set(codes)) == 3
+    assert all(len(code) == 4 and code.isdigit() for code in codes)
+    assert get_team_by_search_code(f" {codes[1]} ", db_session).name == "Team 1"
+
+    # The unique index rejects a duplicate
+    db_session.add(Team(name="Copy", search_code=codes[0]))
+    with pytest.raises(IntegrityError):
+        db_session.flush()
+
+
+def test_time_decay_rate_must_be_finite(db_session, team_owner):
+    from backend.db.repository.team import update_team_time_decay
+
+    team = team_owner[1]
+    for rate in (float("nan"), float("inf"), -0.1):
+        with pytest.raises(ValueError):
+            update_team_time_decay(team, 30, rate, db_session)
+
+    update_team_time_decay(team, 30, 0.002, db_session)
+    assert team.time_decay_rate == 0.002
+
+
+def test_taken_team_codes_are_skipped(db_session: Session, team_owner):
+    from sqlalchemy import select
+
+    from backend.core.team_codes import team_code
+    from backend.db.repository.team import create_team_with_new_code
+
+    # A session that rolls back to a savepoint, keeping the fixture's data
+    db = Session(bind=db_session.get_bind(), join_transaction_mode="create_savepoint")
+    owner = db.get(User, team_owner[0].id)
+    highest_id = db.scalar(select(Team.id).order_by(Team.id.desc()).limit(1))
+    # A code handed out before codes were allocated
+    db.add(Team(name="Old", search_code=team_code(highest_id + 1)))
+    db.commit()
+
+    team = create_team_with_new_code("New", owner, db)
+
+    assert team.search_code == team_code(highest_id + 2)
+    assert db.query(Team).count() == 3
+    db.close()
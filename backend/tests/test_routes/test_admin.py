@@ -0,0 +1,94 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.staticfiles import StaticFiles
+
+from backend.core.config import STATIC_DIR, settings
+from backend.core.profiling import install_profiling_middleware
+from backend.core.security import create_access_token
+from backend.db.models.user import User
+from backend.db.session import get_db
+from backend.db.slow_queries import slow_query_log
+from backend.webapps.base import api_router
+
+
+def make_user(db_session, email, is_superuser):
+    user = User(
+        email=email,
+        hashed_password="pass",
+        nick=email.split("@")[0],
+        is_active=True,
+        is_superuser=is_superuser,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def client(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILES_DIR", str(tmp_path))
+    test_app = FastAPI()
+    test_app.include_router(api_router)
+    install_profiling_middleware(test_app)
+    test_app.dependency_overrides[get_db] = lambda: db_session
+    test_app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+    return TestClient(test_app)
+
+
+def login(client, user):
+    token = create_access_token(data={"sub": user.email})
+    client.cookies.set("access_token", f"Bearer {token}")
+
+
+def test_superuser_can_profile_request(client, db_session):
+    login(client, make_user(db_session, "admin@example.com", is_superuser=True))
+
+    response = client.get("/game/api/check_update?profile=1")
+    name = response.headers["X-Profile-Id"]
+    assert "_GET_" in name
+
+    listing = client.get("/admin/profiles")
+    assert listing.status_code == 200
+    assert "/game/api/check_update" in listing.text
+    assert "check_update" in client.get(f"/admin/profiles/{name}").text
+    download = client.get(f"/admin/profiles/{name}/download")
+    assert download.status_code == 200
+    assert download.content
+
+
+def test_regular_user_cannot_profile(client, db_session):
+    login(client, make_user(db_session, "player@example.com", is_superuser=False))
+
+    response = client.get("/game/api/check_update?profile=1")
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert client.get("/admin/profiles").status_code == 403
+
+
+def test_slow_queries_are_listed(client, db_session, monkeypatch):
+    login(client, make_user(db_session, "admin@example.com", is_superuser=True))
+    slow_query_log.clear()
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+
+    client.get("/game/api/check_update")
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 10_000)
+
+    entries = slow_query_log.recent()
+    assert any(e.caller.startswith("backend.db.repository.") for e in entries)
+    response = client.get("/admin/slow-queries")
+    assert response.status_code == 200
+    assert entries[0].caller in response.text
+
+
+def test_only_plain_selects_are_explained():
+    from backend.db.slow_queries import is_plain_select
+
+    assert is_plain_select("SELECT game.id FROM game WHERE game.team_id = %(id)s")
+    assert is_plain_select("select count(*) from buy_in")
+    assert not is_plain_select("SELECT nextval('team_search_code_seq')")
+    assert not is_plain_select("SELECT pg_notify(%(channel)s, %(payload)s)")
+    assert not is_plain_select(
+        "SELECT game_snapshot.seq FROM game_snapshot WHERE game_id = 1 FOR UPDATE"
+    )
+    assert not is_plain_select("UPDATE game SET pot = 0")
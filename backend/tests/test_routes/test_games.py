@@ -0,0 +1,488 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from starlette.staticfiles import StaticFiles
+
+from backend.apis.v1.route_login import get_current_user_from_token
+from backend.core.config import STATIC_DIR
+from backend.core.metrics import install_metrics
+from backend.db.models.player_request_status import PlayerRequestStatus
+from backend.db.models.team import Team
+from backend.db.models.user import User
+from backend.db.models.user_team import UserTeam
+from backend.db.query_stats import install_query_stats_middleware
+from backend.db.repository.team import bump_team_games_version
+from backend.db.session import get_db
+from backend.tests.utils.queries import assert_max_queries
+from backend.webapps.base import api_router
+
+
+@pytest.fixture
+def player(db_session):
+    user = User(
+        email="player@example.com", hashed_password="pass", nick="Player", is_active=True
+    )
+    team = Team(name="Team", search_code="4321")
+    db_session.add_all([user, team])
+    db_session.commit()
+    db_session.add(
+        UserTeam(user_id=user.id, team_id=team.id, status=PlayerRequestStatus.APPROVED)
+    )
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def client(db_session, player):
+    test_app = FastAPI()
+    test_app.include_router(api_router)
+    install_query_stats_middleware(test_app)
+    test_app.dependency_overrides[get_db] = lambda: db_session
+    test_app.dependency_overrides[get_current_user_from_token] = lambda: player
+    test_app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+
+    yield TestClient(test_app)
+
+    test_app.dependency_overrides.clear()
+
+
+def test_check_update_returns_cursor(client):
+    response = client.get("/game/api/check_update")
+    assert response.status_code == 200
+    assert response.json() == {"new_game": False, "cursor": 0}
+
+
+def test_check_update_detects_moved_cursor(client, db_session, player):
+    cursor = client.get("/game/api/check_update").json()["cursor"]
+
+    response = client.get(f"/game/api/check_update?cursor={cursor}")
+    assert response.json()["new_game"] is False
+
+    bump_team_games_version(player.teams[0].id, db_session)
+    db_session.commit()
+
+    response = client.get(f"/game/api/check_update?cursor={cursor}&wait=5")
+    assert response.json() == {"new_game": True, "cursor": cursor + 1}
+
+
+def test_requests_report_query_count(client):
+    response = client.get("/game/api/check_update")
+
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_home_page_query_count(client):
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert_max_queries(response, 8)
+
+
+def test_past_games_are_paged_with_constant_queries(client, db_session, player):
+    from datetime import date, datetime, timedelta
+
+    from backend.db.models.game import Game
+    from backend.db.models.game_result import GameResult
+
+    team = player.teams[0]
+    other = Team(name="Other", search_code="9999")
+    db_session.add(other)
+    db_session.flush()
+    for day in range(90):
+        game = Game(
+            date=date(2024, 1, 1) + timedelta(days=day),
+            default_buy_in=50,
+            running=False,
+            pot=100 + day,
+            player_count=5,
+            team_id=team.id if day < 80 else other.id,  # not a member of other
+            owner_id=player.id,
+        )
+        db_session.add(game)
+        db_session.flush()
+        if day % 4:  # games the player skipped aren't listed
+            db_session.add(
+                GameResult(
+                    game_id=game.id,
+                    team_id=game.team_id,
+                    user_id=player.id,
+                    game_date=game.date,
+                    played_at=datetime(2024, 1, 1),
+                    net=day,
+                    player_count=5,
+                    pot=game.pot,
+                    position=1,
+                    created_at=datetime(2024, 1, 1),
+                )
+            )
+    db_session.commit()
+
+    response = client.get("/game/view_past?sort=balance&order=asc")
+    assert response.status_code == 200
+    assert_max_queries(response, 6)
+    assert "60 games" in response.text
+    assert response.text.count("onclick=") == 50
+    cursor = response.text.split("cursor=")[1].split('"')[0]
+
+    rows = client.get(f"/game/view_past/rows?sort=balance&order=asc&cursor={cursor}")
+    assert rows.text.count("onclick=") == 10
+    assert "Load more" not in rows.text
+    cells = rows.text.split('text-success">')[1:]
+    balances = [float(cell.split("<")[0]) for cell in cells]
+    assert balances == [day for day in range(67, 80) if day % 4]
+
+
+def test_requests_are_decided_in_one_batch(client, db_session, player):
+    from datetime import date, datetime
+
+    from backend.db.models.add_on import AddOn
+    from backend.db.models.buy_in import BuyIn
+    from backend.db.models.cash_out import CashOut
+    from backend.db.models.game import Game
+    from backend.db.models.user_game import UserGame
+
+    guest = User(email="guest@example.com", hashed_password="pass", nick="Guest")
+    games = [
+        Game(
+            date=date(2024, 1, 1),
+            default_buy_in=50,
+            running=True,
+            team_id=player.teams[0].id,
+            owner_id=player.id,
+        )
+        for _ in range(2)
+    ]
+    db_session.add_all([guest, *games])
+    db_session.flush()
+    game, other_game = games
+    now = datetime.now()
+    requests = {}
+    for name, request in [
+        ("add_on", AddOn(user_id=guest.id, game_id=game.id, amount=20)),
+        ("cash_out", CashOut(user_id=player.id, game_id=game.id, amount=70)),
+        ("late", AddOn(user_id=player.id, game_id=game.id, amount=10)),
+        ("other", AddOn(user_id=guest.id, game_id=other_game.id, amount=30)),
+    ]:
+        request.time = now
+        request.status = PlayerRequestStatus.REQUESTED
+        requests[name] = request
+    db_session.add_all(
+        [
+            UserGame(user_id=player.id, game_id=game.id),
+            UserGame(user_id=guest.id, game_id=game.id),
+            BuyIn(user_id=player.id, game_id=game.id, amount=50, time=now),
+            BuyIn(user_id=guest.id, game_id=game.id, amount=50, time=now),
+            *requests.values(),
+        ]
+    )
+    db_session.commit()
+    ids = {name: request.id for name, request in requests.items()}
+
+    response = client.post(
+        f"/game/{game.id}/requests/approve",
+        data={
+            "add_on_id": [ids["add_on"], ids["other"]],
+            "cash_out_id": [ids["cash_out"]],
+        },
+    )
+
+    assert response.status_code == 200
+    assert "Approve all" in response.text  # the late add-on is still open
+    statuses = {
+        name: db_session.get(type(request), ids[name]).status
+        for name, request in requests.items()
+    }
+    assert statuses == {
+        "add_on": PlayerRequestStatus.APPROVED,
+        "cash_out": PlayerRequestStatus.APPROVED,
+        "late": PlayerRequestStatus.REQUESTED,
+        "other": PlayerRequestStatus.REQUESTED,
+    }
+
+    response = client.post(
+        f"/game/{game.id}/requests/decline", data={"add_on_id": [ids["late"]]}
+    )
+    assert "Approve all" not in response.text
+    assert db_session.get(AddOn, ids["late"]).status == PlayerRequestStatus.DECLINED
+
+    response = client.post(
+        f"/game/{game.id}/requests/maybe", data={"add_on_id": [ids["other"]]}
+    )
+    assert response.status_code == 422
+    assert db_session.get(AddOn, ids["other"]).status == PlayerRequestStatus.REQUESTED
+
+    # Deciding after the game finished rewrites its results
+    other_game.running = False
+    db_session.add(BuyIn(user_id=guest.id, game_id=other_game.id, amount=50, time=now))
+    db_session.commit()
+    response = client.post(
+        f"/game/{other_game.id}/requests/approve", data={"add_on_id": [ids["other"]]}
+    )
+    assert response.status_code == 200
+    db_session.refresh(other_game)
+    assert other_game.pot == 80
+
+    client.app.dependency_overrides[get_current_user_from_token] = lambda: guest
+    response = client.post(
+        f"/game/{game.id}/requests/approve", data={"add_on_id": [ids["other"]]}
+    )
+    assert response.status_code == 403
+
+
+def test_table_cash_out_is_validated_then_inserted_at_once(
+    client, db_session, player
+):
+    from datetime import date
+
+    from backend.db.models.cash_out import CashOut
+    from backend.db.models.chip import Chip
+    from backend.db.models.chip_amount import ChipAmount
+    from backend.db.models.chip_structure import ChipStructure
+    from backend.db.models.game import Game
+    from backend.db.models.user_game import UserGame
+
+    structure = ChipStructure(name="Default", team_id=player.teams[0].id)
+    guest = User(email="guest@example.com", hashed_password="pass", nick="Guest")
+    db_session.add_all([structure, guest])
+    db_session.flush()
+    white = Chip(color="white", value=1, chip_structure_id=structure.id)
+    red = Chip(color="red", value=5, chip_structure_id=structure.id)
+    game = Game(
+        date=date(2024, 1, 1),
+        default_buy_in=50,
+        running=True,
+        team_id=player.teams[0].id,
+        owner_id=player.id,
+        chip_structure_id=structure.id,
+    )
+    db_session.add_all([white, red, game])
+    db_session.flush()
+    db_session.add_all(
+        [
+            UserGame(user_id=player.id, game_id=game.id),
+            UserGame(user_id=guest.id, game_id=game.id),
+        ]
+    )
+    db_session.commit()
+
+    page = client.get(f"/game/{game.id}/cash_out_table")
+    assert page.status_code == 200
+    assert f'name="chip_{guest.id}_{red.id}"' in page.text
+
+    # One bad row rejects the whole table
+    response = client.post(
+        f"/game/{game.id}/cash_out_table",
+        data={
+            f"chip_{player.id}_{white.id}": "3",
+            f"chip_{guest.id}_{red.id}": "-1",
+            "auto_approve": "1",
+        },
+    )
+    assert response.status_code == 200
+    assert "whole numbers" in response.text
+    assert db_session.query(CashOut).count() == 0
+
+    response = client.post(
+        f"/game/{game.id}/cash_out_table",
+        data={
+            f"chip_{player.id}_{white.id}": "3",
+            f"chip_{player.id}_{red.id}": "",
+            f"chip_{guest.id}_{white.id}": "",
+            f"chip_{guest.id}_{red.id}": "",
+            "auto_approve": "1",
+        },
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+
+    cash_outs = db_session.query(CashOut).all()
+    assert [(c.user_id, c.amount, c.status) for c in cash_outs] == [
+        (player.id, 3, PlayerRequestStatus.APPROVED)
+    ]
+    chips = {(a.chip_id, a.amount) for a in db_session.query(ChipAmount)}
+    assert chips == {(white.id, 3), (red.id, 0)}
+
+    # Nothing could approve a request once the game is finished
+    game.running = False
+    db_session.commit()
+    response = client.post(
+        f"/game/{game.id}/cash_out_table",
+        data={f"chip_{guest.id}_{white.id}": "2", f"chip_{guest.id}_{red.id}": ""},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    cash_out = db_session.query(CashOut).filter(CashOut.user_id == guest.id).one()
+    assert cash_out.status == PlayerRequestStatus.APPROVED
+
+
+def test_approving_on_a_finished_game_rewrites_its_results(
+    client, db_session, player
+):
+    from datetime import date, datetime
+
+    from backend.db.models.add_on import AddOn
+    from backend.db.models.buy_in import BuyIn
+    from backend.db.models.cash_out import CashOut
+    from backend.db.models.game import Game
+    from backend.db.models.game_result import GameResult
+    from backend.db.models.user_game import UserGame
+    from backend.db.repository.game_result import write_game_results
+
+    game = Game(
+        date=date(2024, 1, 1),
+        default_buy_in=50,
+        running=True,
+        team_id=player.teams[0].id,
+        owner_id=player.id,
+    )
+    db_session.add(game)
+    db_session.flush()
+    now = datetime.now()
+    add_on = AddOn(
+        user_id=player.id,
+        game_id=game.id,
+        amount=20,
+        time=now,
+        status=PlayerRequestStatus.DECLINED,
+    )
+    cash_out = CashOut(
+        user_id=player.id,
+        game_id=game.id,
+        amount=90,
+        time=now,
+        status=PlayerRequestStatus.DECLINED,
+    )
+    db_session.add_all(
+        [
+            UserGame(user_id=player.id, game_id=game.id),
+            BuyIn(user_id=player.id, game_id=game.id, amount=50, time=now),
+            add_on,
+            cash_out,
+        ]
+    )
+    game.running = False
+    write_game_results([game], db_session)
+    db_session.commit()
+
+    response = client.post(
+        f"/game/{game.id}/add_on/{add_on.id}/approve", follow_redirects=False
+    )
+    assert response.status_code == 303
+    result = db_session.query(GameResult).filter(GameResult.game_id == game.id).one()
+    assert (result.add_on, result.investment, result.pot) == (20, 70, 70)
+
+    response = client.post(
+        f"/game/{game.id}/cash_out/{cash_out.id}/approve", follow_redirects=False
+    )
+    assert response.status_code == 303
+    result = db_session.query(GameResult).filter(GameResult.game_id == game.id).one()
+    assert (result.cash_out, result.net) == (90, 20)
+
+
+def test_metrics_report_route_latency(db_session, player):
+    test_app = FastAPI()
+    test_app.include_router(api_router)
+    install_metrics(test_app, create_engine("sqlite://"))
+    test_app.dependency_overrides[get_db] = lambda: db_session
+    test_app.dependency_overrides[get_current_user_from_token] = lambda: player
+    client = TestClient(test_app)
+
+    client.get("/game/api/check_update")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/game/api/check_update",status="200"}' in response.text
+    )
+    assert "http_request_db_queries_bucket" in response.text
+
+
+def test_guests_are_preregistered_in_bulk(db_session, player):
+    from datetime import date
+    from urllib.parse import parse_qs, urlparse
+
+    from backend.db.models.buy_in import BuyIn
+    from backend.db.models.game import Game
+    from backend.db.models.user_game import UserGame
+    from backend.db.repository.guest import guest_email
+    from backend.webapps.guest.route_guest import router as guest_router
+
+    team = player.teams[0]
+    game = Game(
+        date=date(2024, 1, 1),
+        default_buy_in=50,
+        running=True,
+        team_id=team.id,
+        owner_id=player.id,
+    )
+    known = User(
+        email=guest_email("Łukasz", team),
+        hashed_password="pass",
+        nick="Łukasz",
+        is_active=False,
+    )
+    db_session.add_all([game, known])
+    db_session.commit()
+
+    test_app = FastAPI()
+    test_app.include_router(api_router)
+    test_app.include_router(guest_router, prefix="/guest")
+    install_query_stats_middleware(test_app)
+    test_app.dependency_overrides[get_db] = lambda: db_session
+    test_app.dependency_overrides[get_current_user_from_token] = lambda: player
+    client = TestClient(test_app)
+
+    response = client.post(
+        f"/guest/game/{game.id}/preregister",
+        data={"nicks": "Ann\nBob\n  \nann\nlukasz"},
+    )
+    assert response.status_code == 200
+    # Lookups, one INSERT per table and the game's event log and snapshot,
+    # whatever the number of guests
+    assert_max_queries(response, 15)
+
+    guests = db_session.query(User).filter(User.email.like("%@over-bet.com")).all()
+    assert sorted(u.nick for u in guests) == ["Ann", "Bob", "Łukasz"]
+    assert all(u.is_active for u in guests)
+    seated = {
+        ug.user_id
+        for ug in db_session.query(UserGame).filter(
+            UserGame.game_id == game.id,
+            UserGame.status == PlayerRequestStatus.APPROVED,
+        )
+    }
+    assert seated == {u.id for u in guests}
+    assert db_session.query(BuyIn).filter(BuyIn.game_id == game.id).count() == 3
+    assert db_session.query(UserTeam).filter(UserTeam.team_id == team.id).count() == 4
+
+    links = [
+        line.split('value="')[1].split('"')[0]
+        for line in response.text.splitlines()
+        if "readonly" in line
+    ]
+    assert len(links) == 3
+    token = parse_qs(urlparse(links[0]).query)["token"][0]
+    test_app.dependency_overrides.pop(get_current_user_from_token)
+    response = client.get(f"/guest/login?token={token}", follow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers["location"] == f"/game/{game.id}"
+    assert "access_token" in response.cookies
+
+    # Adding the same guests again adds nothing
+    test_app.dependency_overrides[get_current_user_from_token] = lambda: player
+    client.post(f"/guest/game/{game.id}/preregister", data={"nicks": "Ann\nBob"})
+    assert db_session.query(BuyIn).filter(BuyIn.game_id == game.id).count() == 3
+
+    # The table follows as events, after the snapshot
+    response = client.get(f"/game/{game.id}/events")
+    assert response.status_code == 200
+    table = response.json()
+    assert table["seq"] == 6
+    assert table["events"] == []
+    assert {totals["buy_in"] for totals in table["players"].values()} == {50}
+    assert set(table["players"]) == {str(u.id) for u in guests}
+    response = client.get(f"/game/{game.id}/events?since=4")
+    assert [e["type"] for e in response.json()["events"]] == ["buy_in", "buy_in"]
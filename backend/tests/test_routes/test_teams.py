@@ -64,3 +64,175 @@ def test_read_team(client):
     assert response.status_code == 200
     # Response is HTML, so we check if the name is in the text
     assert "team0" in response.text
+
+
+def test_team_games_history_pages(client, db_session):
+    from datetime import date, timedelta
+
+    from backend.db.models.game import Game
+    from backend.db.models.player_request_status import PlayerRequestStatus
+    from backend.db.models.user_team import UserTeam
+
+    user = db_session.query(User).first()
+    user.is_active = True
+    team = Team(name="Paged", search_code="4321")
+    db_session.add(team)
+    db_session.commit()
+    db_session.add(
+        UserTeam(user_id=user.id, team_id=team.id, status=PlayerRequestStatus.APPROVED)
+    )
+    for day in range(1, 61):
+        db_session.add(
+            Game(
+                date=date(2024, 1, 1) + timedelta(days=day),
+                default_buy_in=50,
+                running=False,
+                pot=day,
+                player_count=4,
+                team_id=team.id,
+                owner_id=user.id,
+            )
+        )
+    db_session.commit()
+
+    response = client.get(f"/team/{team.id}/games?sort=pot&order=asc")
+    assert response.status_code == 200
+    assert "60 games" in response.text
+    assert "50.00" in response.text and "51.00" not in response.text
+    cursor = response.text.split("cursor=")[1].split('"')[0]
+
+    rows = client.get(f"/team/{team.id}/games/rows?sort=pot&order=asc&cursor={cursor}")
+    assert rows.status_code == 200
+    assert "51.00" in rows.text and "60.00" in rows.text
+    assert "Load more" not in rows.text
+
+
+def test_player_page_loads_history_and_chart_separately(client, db_session):
+    from datetime import date, datetime, timedelta
+
+    from backend.db.models.buy_in import BuyIn
+    from backend.db.models.cash_out import CashOut
+    from backend.db.models.game import Game
+    from backend.db.models.player_request_status import PlayerRequestStatus
+    from backend.db.models.user_team import UserTeam
+    from backend.db.repository.game_result import write_game_results
+
+    user = db_session.query(User).first()
+    user.is_active = True
+    team = Team(name="History", search_code="5678")
+    db_session.add(team)
+    db_session.commit()
+    db_session.add(
+        UserTeam(user_id=user.id, team_id=team.id, status=PlayerRequestStatus.APPROVED)
+    )
+    games = []
+    for day in range(30):
+        game = Game(
+            date=date(2024, 1, 1) + timedelta(days=day),
+            default_buy_in=50,
+            running=False,
+            team_id=team.id,
+            owner_id=user.id,
+        )
+        db_session.add(game)
+        db_session.flush()
+        at = datetime(2024, 1, 1) + timedelta(days=day)
+        db_session.add_all(
+            [
+                BuyIn(user_id=user.id, game_id=game.id, amount=50, time=at),
+                CashOut(
+                    user_id=user.id,
+                    game_id=game.id,
+                    amount=50 + day,
+                    time=at,
+                    status=PlayerRequestStatus.APPROVED,
+                ),
+            ]
+        )
+        games.append(game)
+    write_game_results(games, db_session)
+    db_session.commit()
+
+    page = client.get(f"/team/{team.id}/player/{user.id}?year=2024")
+    assert page.status_code == 200
+    assert "2024-01-30" not in page.text  # rows come from the partial
+
+    rows = client.get(
+        f"/team/{team.id}/player/{user.id}/games?year=2024&sort=balance&order=desc"
+    )
+    assert rows.status_code == 200
+    assert rows.text.index("2024-01-30") < rows.text.index("2024-01-29")
+    assert "2024-01-05" not in rows.text and "Load more" in rows.text
+
+    chart = client.get(f"/team/{team.id}/player/{user.id}/chart?year=2024").json()
+    assert len(chart) == 30
+    assert chart[-1] == {"date": "2024-01-30", "balance": sum(range(30))}
+
+
+def test_team_transfers_net_a_month_or_selected_games(client, db_session):
+    import re
+    from datetime import date, datetime
+
+    from backend.db.models.buy_in import BuyIn
+    from backend.db.models.cash_out import CashOut
+    from backend.db.models.game import Game
+    from backend.db.models.player_request_status import PlayerRequestStatus
+    from backend.db.models.user_team import UserTeam
+    from backend.db.repository.game_result import write_game_results
+
+    user = db_session.query(User).first()
+    user.is_active = True
+    guest = User(email="guest@example.com", hashed_password="pass", nick="Guest")
+    team = Team(name="Settle", search_code="9876")
+    db_session.add_all([guest, team])
+    db_session.commit()
+    db_session.add(
+        UserTeam(user_id=user.id, team_id=team.id, status=PlayerRequestStatus.APPROVED)
+    )
+    games = []
+    nights = [(date(2024, 3, 1), 40), (date(2024, 3, 8), -15), (date(2024, 4, 1), 7)]
+    for day, won in nights:
+        game = Game(
+            date=day,
+            default_buy_in=50,
+            running=False,
+            team_id=team.id,
+            owner_id=user.id,
+        )
+        db_session.add(game)
+        db_session.flush()
+        at = datetime.combine(day, datetime.min.time())
+        for player, amount in [(user, 50 + won), (guest, 50 - won)]:
+            db_session.add_all(
+                [
+                    BuyIn(user_id=player.id, game_id=game.id, amount=50, time=at),
+                    CashOut(
+                        user_id=player.id,
+                        game_id=game.id,
+                        amount=amount,
+                        time=at,
+                        status=PlayerRequestStatus.APPROVED,
+                    ),
+                ]
+            )
+        games.append(game)
+    write_game_results(games, db_session)
+    db_session.commit()
+
+    def amounts(html):
+        return re.findall(r">\s*([\d.]+)\s*</td>", html)
+
+    march = client.get(f"/team/{team.id}/transfers?month=2024-03")
+    assert march.status_code == 200
+    assert "2 games of 2024-03" in march.text
+    assert amounts(march.text) == ["25"]
+
+    selected = client.get(
+        f"/team/{team.id}/transfers?game_id={games[1].id}&game_id={games[2].id}"
+    )
+    assert "2 selected games" in selected.text
+    assert amounts(selected.text) == ["8"]
+
+    single = client.get(f"/game/{games[2].id}/transfers")
+    assert single.status_code == 200
+    assert amounts(single.text) == ["7"]
@@ -0,0 +1,13 @@
+from backend.db.repository.game import create_new_game_db
+from backend.schemas.games import GameCreate
+
+
+def create_game(owner, team, chip_structure, db_session, game_date="2024-05-17"):
+    game_data = GameCreate(
+        date=game_date,
+        default_buy_in=50,
+        running=True,
+        team_id=str(team.id),
+        chip_structure_id=str(chip_structure.id),
+    )
+    return create_new_game_db(game=game_data, current_user=owner, db=db_session)
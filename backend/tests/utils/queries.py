@@ -0,0 +1,25 @@
+from contextlib import contextmanager
+
+from backend.db.query_stats import track_queries
+
+
+def assert_max_queries(response, max_queries: int):
+    """
+    Fails if the request behind `response` ran more than `max_queries` SQL
+    statements. The app must have the query stats middleware installed.
+    """
+    count = int(response.headers["X-DB-Queries"])
+    assert count <= max_queries, (
+        f"{response.request.method} {response.request.url.path} ran {count} "
+        f"queries, expected at most {max_queries}"
+    )
+
+
+@contextmanager
+def max_queries(limit: int):
+    """Same check for code called directly, e.g. repository functions."""
+    with track_queries() as stats:
+        yield stats
+    assert stats.count <= limit, (
+        f"expected at most {limit} queries, got {stats.report()}"
+    )
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.templating import Jinja2Templates
+from starlette import status
+
+from backend.apis.v1.route_login import get_current_user_from_token
+from backend.core.config import TEMPLATES_DIR, settings
+from backend.core.profiling import list_profiles, profile_path, profile_summary
+from backend.db.models.user import User
+from backend.db.slow_queries import slow_query_log
+
+templates = Jinja2Templates(directory=TEMPLATES_DIR)
+router = APIRouter(include_in_schema=False)
+
+
+def get_superuser(user: User = Depends(get_current_user_from_token)) -> User:
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admins only."
+        )
+    return user
+
+
+@router.get("/profiles")
+async def profiles(request: Request, user: User = Depends(get_superuser)):
+    return templates.TemplateResponse(
+        "admin/profiles.html",
+        {"request": request, "user": user, "profiles": list_profiles()},
+    )
+
+
+@router.get("/profiles/{name}")
+async def profile_detail(
+    request: Request, name: str, user: User = Depends(get_superuser)
+):
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return templates.TemplateResponse(
+        "admin/profile_detail.html",
+        {
+            "request": request,
+            "user": user,
+            "name": name,
+            "summary": profile_summary(path),
+        },
+    )
+
+
+@router.get("/profiles/{name}/download")
+async def download_profile(name: str, user: User = Depends(get_superuser)):
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
+
+
+@router.get("/slow-queries")
+async def slow_queries(request: Request, user: User = Depends(get_superuser)):
+    return templates.TemplateResponse(
+        "admin/slow_queries.html",
+        {
+            "request": request,
+            "user": user,
+            "queries": slow_query_log.recent(),
+            "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+            "explain_enabled": settings.SLOW_QUERY_EXPLAIN,
+        },
+    )
+
+
+@router.post("/slow-queries/clear")
+async def clear_slow_queries(user: User = Depends(get_superuser)):
+    slow_query_log.clear()
+    return RedirectResponse("/admin/slow-queries", status_code=303)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
-from backend.apis.v1 import route_health, route_login
+from backend.apis.v1 import route_health, route_login, route_metrics
 from backend.webapps import home
+from backend.webapps.admin import route_admin
 from backend.webapps.auth import route_user_login
 from backend.webapps.chip_structure import route_chip_structure
 from backend.webapps.game import route_game
@@ -15,6 +16,7 @@ api_router = APIRouter()
 api_router.include_router(route_user.router, prefix="/user", tags=["user-webapp"])
 api_router.include_router(home.router, prefix="", tags=["user-webapp"])
 api_router.include_router(route_health.health_router, prefix="")
+api_router.include_router(route_metrics.metrics_router, prefix="")
 
 api_router.include_router(route_team.router, prefix="/team", tags=["team-webapp"])
 api_router.include_router(
@@ -36,6 +38,8 @@ api_router.include_router(
     route_predictions.router, prefix="/game", tags=["game-webapp"]
 )
 
+api_router.include_router(route_admin.router, prefix="/admin", tags=["admin-webapp"])
+
 api_router.include_router(route_login.router, prefix="", tags=["auth-webapp"])
 api_router.include_router(route_user_login.router, prefix="", tags=["auth-webapp"])
 api_router.include_router(route_verify.router, prefix="", tags=["auth-webapp"])
@@ -1,7 +1,9 @@
+import asyncio
 import json
+import time
 from datetime import datetime, timedelta
 from sqlite3 import IntegrityError
-from typing import Optional
+from typing import List, Literal, Optional
 from fastapi import APIRouter, Depends, Request, responses, HTTPException, Form
 from fastapi.templating import Jinja2Templates
 from pydantic import ValidationError
@@ -23,6 +25,7 @@ from backend.apis.v1.route_login import (
 )
 from backend.core.security import create_access_token
 from backend.core.config import TEMPLATES_DIR, settings
+from backend.core.game_state import PLAYER_REMOVED
 from backend.db.models.game import Game
 from backend.db.models.player_request_status import PlayerRequestStatus
 from backend.db.models.user import User
@@ -30,6 +33,8 @@ from backend.db.models.user_game import UserGame
 from backend.db.models.buy_in import BuyIn
 from backend.db.models.add_on import AddOn
 from backend.db.models.cash_out import CashOut
+from backend.db.game_events import record_game_event
+from backend.db.invalidation import invalidate
 from backend.db.repository.add_on import (
     get_player_game_addons,
 )
@@ -40,6 +45,10 @@ from backend.db.repository.buy_in import (
 from backend.db.repository.cash_out import (
     get_player_game_cash_out,
 )
+from backend.db.repository.game_event import (
+    get_game_events_since,
+    get_game_snapshot,
+)
 from backend.db.repository.chip_structure import (
     get_user_team_chip_structures_dict,
     list_team_chip_structures,
@@ -54,12 +63,19 @@ from backend.db.repository.game import (
     get_user_game_balance,
     delete_game_by_id,
 )
+from backend.db.repository.game_result import (
+    get_settlement_transfers,
+    write_game_results,
+)
+from backend.db.repository.settlement import decide_pending_requests
 from backend.db.repository.team import (
     get_team_by_id,
+    get_user_teams_games_version,
     is_user_admin,
 )
 from backend.db.models.team_role import TeamRole
 from backend.db.models.user_team import UserTeam
+from backend.db.replica import get_read_db
 from backend.db.session import get_db
 from backend.schemas.games import GameCreate, GameJoin
 from backend.apis.v1.route_login import get_active_user
@@ -168,7 +184,7 @@ async def create_game(
         
         # Fallback to today if still empty
         if not game_date:
-            game_date = str(datetime.today().date())
+            game_date = datetime.today().date()
 
         new_game_data = GameCreate(
             date=game_date,
@@ -221,79 +237,68 @@ async def create_game(
 @router.get("/view_past", name="view_past")
 async def view_past_games(
     request: Request,
-    limit: int = 10000,
     sort: str = "date",
     order: str = "desc",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_active_user),
 ):
-    from backend.db.repository.game import (
-        get_user_past_games,
-        get_user_past_games_stats_bulk,
-    )
+    from backend.db.repository.game import get_user_past_games_count
 
     if not user:
         return RedirectResponse(url="/login")
 
-    # Get all games to allow sorting by computed fields
-    past_games = get_user_past_games(user, db, limit=None)
-    total_count = len(past_games)
-
-    game_ids = [g.id for g in past_games]
-    bulk_stats = get_user_past_games_stats_bulk(user.id, game_ids, db)
-
-    games_data = []
-    for game in past_games:
-        s = bulk_stats.get(
-            game.id, {"total_pot": 0.0, "my_balance": 0.0, "players_count": 0}
-        )
-        games_data.append(
-            {
-                "id": game.id,
-                "date": game.date,
-                "start_time": game.start_time,
-                "players_count": s["players_count"],
-                "total_pot": s["total_pot"],
-                "my_balance": s["my_balance"],
-            }
-        )
-
-    # Sorting
-    reverse = order == "desc"
-    if sort == "date":
-        games_data.sort(
-            key=lambda x: (x["date"], x["start_time"] or datetime.min.time()),
-            reverse=reverse,
-        )
-    elif sort == "players":
-        games_data.sort(key=lambda x: x["players_count"], reverse=reverse)
-    elif sort == "pot":
-        games_data.sort(key=lambda x: x["total_pot"], reverse=reverse)
-    elif sort == "balance":
-        games_data.sort(key=lambda x: x["my_balance"], reverse=reverse)
-    else:
-        games_data.sort(
-            key=lambda x: (x["date"], x["start_time"] or datetime.min.time()),
-            reverse=True,
-        )
+    page = _past_games_page(user, db, sort, order, None)
+    return templates.TemplateResponse(
+        "game/view_past.html",
+        {
+            "request": request,
+            "games_data": page.items,
+            "next_cursor": page.next_cursor,
+            "rows_url": "/game/view_past/rows",
+            "games_count": get_user_past_games_count(user, db),
+            "sort_by": sort,
+            "order": order,
+        },
+    )
 
-    # Slicing
-    visible_games = games_data[:limit]
 
+@router.get("/view_past/rows", name="view_past_rows")
+async def view_past_games_rows(
+    request: Request,
+    sort: str = "date",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_active_user),
+):
+    """Next page of view_past, appended by the "load more" row."""
+    page = _past_games_page(user, db, sort, order, cursor)
     return templates.TemplateResponse(
-        "game/view_past.html",
+        "components/past_games_rows.html",
         {
             "request": request,
-            "games_data": visible_games,
-            "games_count": total_count,
-            "visible_count": len(visible_games),
-            "limit": limit,
+            "games_data": page.items,
+            "next_cursor": page.next_cursor,
+            "rows_url": "/game/view_past/rows",
             "sort_by": sort,
             "order": order,
         },
     )
 
 
+def _past_games_page(user: User, db: Session, sort, order, cursor):
+    """Games the user played in, over all their teams, one page at a time."""
+    from backend.db.keyset import Page
+    from backend.db.repository.game import get_past_games_page
+
+    team_ids = [team.id for team in user.teams]
+    if not team_ids:
+        return Page(items=[], next_cursor=None)
+    return get_past_games_page(
+        team_ids, user.id, db, sort, order, cursor, played_only=True
+    )
+
+
 @router.get("/{game_id}/join", name="join_game_form")
 async def join_game_form(
     request: Request,
@@ -517,6 +522,32 @@ async def open_game(
     )
 
 
+@router.get("/{game_id}/transfers", name="game_transfers")
+async def game_transfers(
+    request: Request,
+    game_id: int,
+    db: Session = Depends(get_read_db),
+    user: Optional[User] = Depends(get_current_user),
+):
+    """Who pays whom to settle a finished game, for the ended game view."""
+    game = get_game_by_id(game_id, db)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    return templates.TemplateResponse(
+        "components/transfers_table.html",
+        {
+            "request": request,
+            "transfers": get_settlement_transfers(db, game_ids=[game.id]),
+            "empty_message": (
+                "Available once the game is finished."
+                if game.running
+                else "Everybody is even."
+            ),
+        },
+    )
+
+
 @router.get("/{game_id}/table", name="get_game_table")
 async def get_game_table(
     request: Request,
@@ -540,6 +571,37 @@ async def get_game_table(
         # Guests can see the table
         pass
 
+    return _game_table_response(request, game, user, db, sort, order)
+
+
+@router.get("/{game_id}/events", name="get_game_events")
+async def get_game_events(
+    game_id: int,
+    since: int = 0,
+    db: Session = Depends(get_db),
+    user: Optional[User] = Depends(get_current_user),
+):
+    """
+    The game's table as events: those after seq since, and with since=0
+    the snapshot to apply them to. Visible to whoever can see the table.
+    """
+    if not get_game_by_id(game_id, db):
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    content = {}
+    if since <= 0:
+        since, content["players"] = get_game_snapshot(game_id, db)
+    events = get_game_events_since(
+        game_id, since, db, limit=settings.GAME_EVENTS_PAGE_SIZE
+    )
+    content["seq"] = events[-1]["seq"] if events else since
+    content["events"] = events
+    content["more"] = len(events) == settings.GAME_EVENTS_PAGE_SIZE
+    return JSONResponse(content)
+
+
+def _game_table_response(request, game, user, db, sort, order, is_admin=None):
+    """The players table partial; is_admin is looked up unless given."""
     players_info = []
     existing_requests = False
     for player in game.players:
@@ -550,13 +612,15 @@ async def get_game_table(
 
     sort_players_game_info(players_info, sort, order)
 
+    if is_admin is None:
+        is_admin = is_user_admin(user.id, game.team_id, db) if user else False
     return templates.TemplateResponse(
         "components/players_table.html",
         {
             "request": request,
             "game": game,
             "user": user,
-            "is_admin": is_user_admin(user.id, game.team_id, db) if user else False,
+            "is_admin": is_admin,
             "is_owner": (game.owner_id == user.id) if user else False,
             "is_book_keeper": (game.book_keeper_id == user.id) if user else False,
             "players_info": players_info,
@@ -567,6 +631,46 @@ async def get_game_table(
     )
 
 
+@router.post("/{game_id}/requests/{action}", name="decide_requests")
+async def decide_requests(
+    request: Request,
+    game_id: int,
+    action: Literal["approve", "decline"],
+    add_on_id: List[int] = Form([]),
+    cash_out_id: List[int] = Form([]),
+    sort: str = "balance",
+    order: str = "desc",
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_from_token),
+):
+    """
+    Approves or declines several open add-on and cash-out requests at once,
+    in one transaction, and returns the refreshed players table. The
+    results of a finished game are rewritten with them.
+    """
+    game = get_game_by_id(game_id, db)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    is_admin = is_user_admin(user.id, game.team_id, db)
+    if not (is_admin or user.id == game.owner_id or user.id == game.book_keeper_id):
+        raise HTTPException(
+            status_code=403,
+            detail="Only admins, the game owner, or the bookkeeper can approve requests",
+        )
+
+    new_status = (
+        PlayerRequestStatus.APPROVED
+        if action == "approve"
+        else PlayerRequestStatus.DECLINED
+    )
+    decide_pending_requests(game, new_status, db, add_on_id, cash_out_id)
+    write_game_results([game], db)  # only when decided after the game finished
+    db.commit()
+
+    return _game_table_response(request, game, user, db, sort, order, is_admin)
+
+
 @router.post("/{game_id}/finish", name="finish_game_post")
 async def finish_game_view(
     request: Request,
@@ -747,32 +851,30 @@ async def export_game_stats(
 
 
 @router.get("/api/check_update")
-def check_update(user: User = Depends(get_active_user), db: Session = Depends(get_db)):
-    # Get latest game in the user’s teams
-    team_ids = [team.id for team in user.teams]
-    latest_game = (
-        db.query(Game)
-        .filter(Game.team_id.in_(team_ids))
-        .order_by(Game.date.desc())
-        .first()
-    )
-
-    if not latest_game:
-        return {"new_game": False}
-
-    # Compare against user.last_checked_game_time if you track it, or use a simpler check
-    if not hasattr(user, "last_checked_game_time") or not user.last_checked_game_time:
-        user.last_checked_game_time = datetime.now()
-        db.commit()
-        return {"new_game": True}
-
-    new_game = latest_game.date > user.last_checked_game_time
+async def check_update(
+    cursor: Optional[int] = None,
+    wait: int = 0,
+    user: User = Depends(get_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Cheap change feed for the homepage. Compares the client's cursor with the
+    games version of the user's teams and, when `wait` is given, long-polls
+    until it moves or the wait runs out.
+    """
+    user_id = user.id
+    version = get_user_teams_games_version(user_id, db)
+    if cursor is None:
+        return {"new_game": False, "cursor": version}
 
-    if new_game:
-        user.last_checked_game_time = datetime.now()
-        db.commit()
+    deadline = time.monotonic() + min(max(wait, 0), settings.CHECK_UPDATE_MAX_WAIT)
+    while version == cursor and time.monotonic() < deadline:
+        # Give the connection back to the pool while idle
+        db.close()
+        await asyncio.sleep(settings.CHECK_UPDATE_POLL_INTERVAL)
+        version = get_user_teams_games_version(user_id, db)
 
-    return {"new_game": new_game}
+    return {"new_game": version != cursor, "cursor": version}
 
 
 @router.get("/{game_id}/add_player", name="get_add_player_list")
@@ -925,6 +1027,8 @@ async def remove_player_remotely(
         CashOut.user_id == player_id, CashOut.game_id == game_id
     ).delete(synchronize_session=False)
 
+    invalidate(db, f"game:{game_id}", f"user:{player_id}")
+    record_game_event(db, game_id, PLAYER_REMOVED, player_id)
     db.commit()
 
     response = responses.Response()
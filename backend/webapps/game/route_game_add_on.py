@@ -23,11 +23,8 @@ from backend.db.repository.add_on import (
 from backend.db.repository.buy_in import (
     get_player_game_total_buy_in_amount,
     add_user_buy_in,
-    get_player_game_buy_ins,
-)
-from backend.db.repository.cash_out import (
-    get_player_game_cash_out,
 )
+from backend.db.repository.settlement import get_game_settlement
 from backend.db.repository.game import (
     get_game_by_id,
     user_in_game,
@@ -194,53 +191,18 @@ async def finish_game_view(
     if not (is_user_admin(user.id, game.team_id, db) or user.id == game.owner_id):
         return RedirectResponse(url=f"/game/{game.id}")
 
-    players_info = []
-    all_cashed_out = True
-    total_money_in = 0
-    total_money_out = 0
-
-    for player in game.players:
-        buy_ins = get_player_game_buy_ins(player, game, db)
-        add_ons = get_player_game_addons(player, game, db)
-        cash_outs = get_player_game_cash_out(player, game, db)
-
-        buy_in_sum = sum([bi.amount for bi in buy_ins])
-        add_on_sum = sum(
-            [ao.amount for ao in add_ons if ao.status == PlayerRequestStatus.APPROVED]
-        )
-        money_in = buy_in_sum + add_on_sum
-        cash_out = sum(
-            [co.amount for co in cash_outs if co.status == PlayerRequestStatus.APPROVED]
-        )
-        balance = cash_out - money_in
-
-        if len(cash_outs) < len(buy_ins):
-            all_cashed_out = False
-
-        total_money_in += money_in
-        total_money_out += cash_out
-
-        players_info.append(
-            {
-                "player": player,
-                "money_in": money_in,
-                "money_out": cash_out,
-                "balance": balance,
-            }
-        )
-
-    sum_warning = total_money_in != total_money_out
+    settlement = get_game_settlement(game, db)
 
     return templates.TemplateResponse(
         "game/finish.html",
         {
             "request": request,
             "game": game,
-            "players_info": players_info,
-            "all_cashed_out": all_cashed_out,
-            "sum_warning": sum_warning,
-            "total_buy_in": total_money_in,
-            "total_cash_out": total_money_out,
+            "players_info": settlement.players,
+            "all_cashed_out": settlement.all_cashed_out,
+            "sum_warning": settlement.sum_warning,
+            "total_buy_in": settlement.total_money_in,
+            "total_cash_out": settlement.total_money_out,
             "show_balance": True,
         },
     )
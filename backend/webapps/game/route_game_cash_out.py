@@ -1,6 +1,6 @@
 from sqlite3 import IntegrityError
 from typing import List
-from fastapi import APIRouter, Depends, Request, Form
+from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.templating import Jinja2Templates
 from pydantic_core import PydanticCustomError, ValidationError
 from sqlalchemy.orm import Session
@@ -22,6 +22,7 @@ from backend.db.repository.buy_in import (
 )
 from backend.db.repository.cash_out import (
     create_cash_out_request,
+    create_cash_outs,
     get_cash_out_by_id,
     update_cash_out_status,
 )
@@ -33,6 +34,7 @@ from backend.db.repository.game import (
     get_game_by_id,
     user_in_game,
 )
+from backend.db.repository.game_result import write_game_results
 from backend.db.repository.team import (
     is_user_admin,
 )
@@ -136,6 +138,136 @@ def read_chips_from_form(form_data, expected_chip_ids):
     return chip_values
 
 
+def read_cash_out_table(form_data, players, chips):
+    """
+    Reads the `chip_<player id>_<chip id>` counts of the table cash-out form
+    in one pass over the fields. Rows left empty are skipped, empty fields in
+    a filled row count as 0 and the amount is computed from the chip values.
+    Returns ([(user_id, amount, chip amounts)], {user_id: error}).
+    """
+    chip_values = {chip.id: chip.value for chip in chips}
+    counts = {player.id: {} for player in players}
+    errors = {}
+    for key, value in form_data.items():
+        parts = key.split("_")
+        if len(parts) != 3 or parts[0] != "chip":
+            continue
+        try:
+            player_id, chip_id = int(parts[1]), int(parts[2])
+        except ValueError:
+            continue
+        if player_id not in counts or chip_id not in chip_values:
+            raise HTTPException(status_code=400, detail=f"Unexpected field {key}")
+        if not value.strip():
+            continue
+        try:
+            count = int(value)
+        except ValueError:
+            count = -1
+        if count < 0:
+            errors[player_id] = "Chip counts must be whole numbers, 0 or more."
+            continue
+        counts[player_id][chip_id] = count
+
+    rows = []
+    for player in players:
+        player_counts = counts[player.id]
+        if not player_counts or player.id in errors:
+            continue
+        chips_amounts = [
+            ChipAmountCreate(chip_id=chip_id, amount=player_counts.get(chip_id, 0))
+            for chip_id in chip_values
+        ]
+        amount = sum(c.amount * chip_values[c.chip_id] for c in chips_amounts)
+        rows.append((player.id, amount, chips_amounts))
+    return rows, errors
+
+
+def _can_enter_cash_outs(user, game, db):
+    return (
+        is_user_admin(user.id, game.team_id, db)
+        or user.id == game.owner_id
+        or user.id == game.book_keeper_id
+    )
+
+
+def _cash_out_table_response(request, game, chips, user, form=None, errors=None):
+    return templates.TemplateResponse(
+        "game/cash_out_table.html",
+        {
+            "request": request,
+            "game": game,
+            "players": sorted(game.players, key=lambda p: (p.nick or "").lower()),
+            "chips": sorted(chips, key=lambda c: c.value),
+            "user": user,
+            "form": form or {},
+            "errors": errors or {},
+        },
+    )
+
+
+@router.get("/{game_id}/cash_out_table", name="cash_out_table")
+async def cash_out_table_view(
+    request: Request,
+    game_id: int,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_from_token),
+):
+    game = get_game_by_id(game_id, db)
+    if not game:
+        return RedirectResponse(url="/")
+    if not _can_enter_cash_outs(user, game, db):
+        raise HTTPException(
+            status_code=403,
+            detail="Only admins, the game owner, or the bookkeeper can enter cash-outs",
+        )
+    chips = get_chips_from_structure(game.chip_structure_id, db)
+    return _cash_out_table_response(request, game, chips, user)
+
+
+@router.post("/{game_id}/cash_out_table", name="cash_out_table")
+async def cash_out_table(
+    request: Request,
+    game_id: int,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_from_token),
+):
+    """
+    Cash-outs for the whole table at once: every filled row is validated
+    first, then all of them are inserted in one transaction, approved right
+    away when the bookkeeper ticked auto-approve or the game is finished.
+    """
+    game = get_game_by_id(game_id, db)
+    if not game:
+        return RedirectResponse(url="/")
+    if not _can_enter_cash_outs(user, game, db):
+        raise HTTPException(
+            status_code=403,
+            detail="Only admins, the game owner, or the bookkeeper can enter cash-outs",
+        )
+
+    form = await request.form()
+    chips = get_chips_from_structure(game.chip_structure_id, db)
+    rows, errors = read_cash_out_table(form, game.players, chips)
+    if errors or not rows:
+        if not errors:
+            errors = {None: "Enter the chip counts of at least one player."}
+        return _cash_out_table_response(request, game, chips, user, form, errors)
+
+    # Finishing a game declines open requests, so after it nothing is left
+    # to approve these later
+    status = (
+        PlayerRequestStatus.APPROVED
+        if form.get("auto_approve") or not game.running
+        else PlayerRequestStatus.REQUESTED
+    )
+    create_cash_outs(game, rows, status, db)
+    write_game_results([game], db)  # only when entered after the game finished
+    db.commit()
+
+    return RedirectResponse(url=f"/game/{game.id}", status_code=303)
+
+
 @router.post("/{game_id}/cash_out", name="cash_out")
 async def cash_out(
     request: Request,
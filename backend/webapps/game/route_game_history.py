@@ -14,6 +14,7 @@ from backend.db.models.add_on import AddOn
 from backend.db.models.cash_out import CashOut
 from backend.db.models.player_request_status import PlayerRequestStatus
 from backend.db.repository.game import get_game_by_id
+from backend.db.repository.game_result import write_game_results
 from backend.db.repository.team import is_user_admin
 
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
@@ -59,7 +60,7 @@ async def player_game_history(
     add_ons = db.query(AddOn).filter(AddOn.game_id == game_id, AddOn.user_id == player_id).all()
     cash_outs = db.query(CashOut).filter(CashOut.game_id == game_id, CashOut.user_id == player_id).all()
 
-    # Combine and sort by time (assuming ISO format strings)
+    # Combine and sort by time
     events = []
     for bi in buy_ins:
         events.append({"type": "buy_in", "obj": bi, "time": bi.time, "amount": bi.amount, "id": bi.id})
@@ -70,7 +71,7 @@ async def player_game_history(
         if co.status == "APPROVED":
             events.append({"type": "cash_out", "obj": co, "time": co.time, "amount": co.amount, "id": co.id, "status": co.status})
 
-    events.sort(key=lambda x: x["time"] or "")
+    events.sort(key=lambda x: x["time"] or datetime.min)
 
 
     return templates.TemplateResponse(
@@ -100,21 +101,27 @@ async def add_buy_in_manual(
 ):
     game = verify_book_keeper_access(game_id, user.id, db)
     
-    if not time:
-        time = datetime.now().isoformat()
-
     new_bi = BuyIn(
         user_id=player_id,
         game_id=game_id,
         amount=amount,
-        time=time
+        time=parse_event_time(time) if time else datetime.now()
     )
     db.add(new_bi)
+    write_game_results([game], db)
     db.commit()
     
     return Response(status_code=200, headers={"HX-Trigger": "refreshHistory, refreshTable"})
 
 
+def parse_event_time(value: str) -> datetime:
+    """Parse a datetime-local form value ("YYYY-MM-DDTHH:MM[:SS]")."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid time format")
+
+
 def get_event_by_type_and_id(game_id: int, event_type: str, event_id: int, db: Session):
     if event_type == "buy_in":
         return db.query(BuyIn).filter(BuyIn.id == event_id, BuyIn.game_id == game_id).first()
@@ -202,7 +209,8 @@ async def update_event_generic(
     event_obj = get_event_by_type_and_id(game_id, event_type, event_id, db)
     if event_obj:
         event_obj.amount = amount
-        event_obj.time = time
+        event_obj.time = parse_event_time(time)
+        write_game_results([game], db)
         db.commit()
     
     # Return the read-only row
@@ -217,7 +225,7 @@ async def delete_event_generic(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user_from_token),
 ):
-    verify_book_keeper_access(game_id, user.id, db)
+    game = verify_book_keeper_access(game_id, user.id, db)
     
     if event_type == "buy_in":
         raise HTTPException(status_code=400, detail="Cannot delete a buy-in.")
@@ -225,6 +233,7 @@ async def delete_event_generic(
     event_obj = get_event_by_type_and_id(game_id, event_type, event_id, db)
     if event_obj:
         db.delete(event_obj)
+        write_game_results([game], db)
         db.commit()
     
     return Response(status_code=200) # Returns empty response to remove element from DOM
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
-from backend.db.session import get_db
+from backend.db.replica import get_read_db
 from backend.core.config import TEMPLATES_DIR
 from backend.apis.v1.route_login import get_current_user
 from backend.db.models.user import User
@@ -16,7 +16,7 @@ router = APIRouter()
 async def game_predictions(
     request: Request,
     game_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user: Optional[User] = Depends(get_current_user),
 ):
     game = get_game_by_id(game_id, db)
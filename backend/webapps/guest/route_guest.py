@@ -1,7 +1,6 @@
 
 from datetime import timedelta
 import uuid
-import unicodedata
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Request, Form, HTTPException, status
@@ -14,13 +13,16 @@ from backend.core.config import settings, TEMPLATES_DIR
 from backend.db.session import get_db
 from backend.db.models.team import Team
 from backend.db.models.game import Game
+from backend.db.models.user import User
+from backend.db.repository.guest import GUEST_PASSWORD, guest_email, preregister_guests
 from backend.db.repository.user import create_new_user, get_user_by_email
-from backend.db.repository.team import join_team, get_team_by_id
+from backend.db.repository.team import join_team, get_team_by_id, is_user_admin
 from backend.db.repository.game import get_game_by_id, add_user_to_game
 from backend.db.repository.buy_in import add_user_buy_in
 from backend.schemas.user import UserCreate
-from backend.apis.v1.route_login import add_new_access_token
+from backend.apis.v1.route_login import add_new_access_token, get_active_user
 from backend.core.hashing import Hasher
+from backend.core.security import create_access_token
 
 router = APIRouter(include_in_schema=False)
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
@@ -102,17 +104,11 @@ async def guest_join(
 
     try:
         # 1. Logic for Guest User
-        # Normalize nick to create a safe ASCII string for email
-        # replace non-ascii characters with close matches (e.g. ł -> l)
-        normalized_nick = unicodedata.normalize('NFD', nick.lower().replace('ł', 'l').replace('Ł', 'L'))
-        ascii_nick = "".join(c for c in normalized_nick if unicodedata.category(c) != 'Mn').replace(' ', '_')
-        
-        # Email format: {lowercase_nick}_{group_search_code}@over-bet.com
-        guest_email = f"{ascii_nick}_{team.search_code.lower()}@over-bet.com"
-        guest_password = "guest123"
+        email = guest_email(nick, team)
+        guest_password = GUEST_PASSWORD
 
         # Check if user exists
-        existing_user = get_user_by_email(guest_email, db)
+        existing_user = get_user_by_email(email, db)
         
         if existing_user:
              # If user exists, we use them.
@@ -127,7 +123,7 @@ async def guest_join(
         else:
             # Create new user
             user_create = UserCreate(
-                email=guest_email,
+                email=email,
                 nick=nick,
                 password=guest_password,
                 repeat_password=guest_password,
@@ -156,7 +152,7 @@ async def guest_join(
     except IntegrityError:
         error_msg = (
             f"Nick ({nick}) already exists in this group. "
-            f"If you want to use it, please log in with {guest_email}, the default password is guest123. "
+            f"If you want to use it, please log in with {email}, the default password is guest123. "
             "If you want to create a new guest account use a different nick."
         )
         return templates.TemplateResponse(
@@ -182,3 +178,71 @@ async def guest_join(
                 "errors": [f"Error joining game: {str(e)}"],
             },
         )
+
+
+def guest_login_link(user_id: int, game_id: int) -> str:
+    """A link that signs the guest in and opens the game, valid for 24 hours."""
+    token = create_access_token(
+        data={"sub": "guest_login", "user_id": user_id, "game_id": game_id},
+        expires_delta=timedelta(hours=24),
+    )
+    base_url = settings.URL or "http://localhost:8000"
+    return f"{base_url}/guest/login?token={token}"
+
+
+@router.post("/game/{game_id}/preregister", name="preregister_guests")
+async def preregister_guests_route(
+    request: Request,
+    game_id: int,
+    nicks: str = Form(...),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_active_user),
+):
+    """
+    Seats a list of guests (one nick per line) at once and returns a sign-in
+    link for each of them, so the host can send them out.
+    """
+    game = get_game_by_id(game_id, db)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    if not (is_user_admin(user.id, game.team_id, db) or user.id == game.owner_id):
+        raise HTTPException(
+            status_code=403, detail="Only admins or game owner can add guests"
+        )
+
+    if not game.running:
+        raise HTTPException(status_code=400, detail="This game has already finished")
+
+    guests = preregister_guests(nicks.splitlines(), game, db)
+    db.commit()
+    for guest in guests:
+        guest["link"] = guest_login_link(guest["user_id"], game_id)
+
+    return templates.TemplateResponse(
+        "guest/invite_links.html",
+        {"request": request, "game": game, "guests": guests},
+    )
+
+
+@router.get("/login", name="guest_login")
+async def guest_login(request: Request, token: str, db: Session = Depends(get_db)):
+    payload = verify_guest_token(token)
+    if not payload or payload.get("sub") != "guest_login":
+        return templates.TemplateResponse(
+            "shared/error.html",
+            {"request": request, "errors": ["Invalid or expired invitation link."]},
+        )
+
+    guest = db.get(User, payload.get("user_id"))
+    game = get_game_by_id(payload.get("game_id"), db)
+    if not guest or not game:
+        return templates.TemplateResponse(
+            "shared/error.html", {"request": request, "errors": ["Game not found."]}
+        )
+
+    response = RedirectResponse(
+        url=f"/game/{game.id}", status_code=status.HTTP_302_FOUND
+    )
+    response, _ = add_new_access_token(response, guest)
+    return response
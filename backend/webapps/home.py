@@ -10,6 +10,8 @@ from backend.apis.v1.route_login import (
 )
 from backend.core.config import TEMPLATES_DIR
 from backend.db.models.user import User
+from backend.db.repository.game import get_user_running_games
+from backend.db.repository.team import get_user_teams_games_version
 from backend.db.session import get_db
 
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
@@ -20,9 +22,11 @@ router = APIRouter(include_in_schema=False)
 async def home(
     request: Request,
     user: Optional[User] = Depends(get_current_user_from_token),
+    db: Session = Depends(get_db),
     msg: str = None,
 ):
-    running_games = [g for t in user.teams for g in t.games if g.running]
+    running_games = get_user_running_games(user.id, db)
+    games_cursor = get_user_teams_games_version(user.id, db)
     return templates.TemplateResponse(
         "general_pages/homepage.html",
         {
@@ -30,6 +34,7 @@ async def home(
             "msg": msg,
             "user": user,
             "running_games": running_games,
+            "games_cursor": games_cursor,
         },
     )
 
@@ -1,11 +1,11 @@
 import json
-import unicodedata
-from datetime import datetime
+from datetime import date, datetime
 from sqlite3 import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     Request,
     responses,
@@ -13,6 +13,7 @@ from fastapi import (
     Form,
     UploadFile,
     File,
+    Query,
 )
 from fastapi.templating import Jinja2Templates
 from pydantic import ValidationError
@@ -26,7 +27,7 @@ from backend.apis.v1.route_login import (
     get_current_user_from_token,
     get_active_user,
 )
-from backend.core.config import TEMPLATES_DIR
+from backend.core.config import TEMPLATES_DIR, settings
 from backend.db.models.player_request_status import PlayerRequestStatus
 from backend.db.models.team import Team
 from backend.db.models.game import Game
@@ -42,25 +43,36 @@ from backend.db.repository.game import (
     get_user_team_balance,
     get_user_game_balance,
     get_user_team_games,
+    game_year_filter,
+    get_team_game_years,
+)
+from backend.db.repository.guest import guest_email
+from backend.db.repository.game_result import (
+    get_player_balance_points,
+    get_player_results_page,
+    get_player_summary,
+    get_settlement_transfers,
+    get_team_results,
+    write_game_results,
 )
 from backend.db.repository.team import (
+    bump_team_games_version,
     create_new_user,
     decide_join_team,
-    generate_team_code,
     get_team_approved_players,
     get_team_by_id,
     get_team_by_search_code,
     get_team_join_requests,
     get_user,
-    create_new_team,
+    create_team_with_new_code,
     join_team,
     get_team_by_name,
     remove_user_from_team,
     is_user_admin,
     is_user_privileged_for_team,
 )
+from backend.db.replica import get_read_db
 from backend.db.session import get_db
-from backend.schemas.team import TeamCreate
 from backend.schemas.user import UserCreate
 from backend.webapps.team.forms import TeamCreateForm, TeamJoinForm
 from backend.webapps.chip_structure.chip_structure_form import ChipStructureCreateForm
@@ -73,7 +85,7 @@ from backend.db.repository.chip_structure import (
     update_chip_structure_db,
 )
 import os
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
 router = APIRouter()
@@ -280,13 +292,7 @@ async def create_team(
 
     try:
         team_create_form = TeamCreateForm(**form)
-
-        team_search_code = generate_team_code(db)
-        # Use all extracted variables
-        new_team_data = TeamCreate(
-            **team_create_form.model_dump(), search_code=team_search_code
-        )
-        create_new_team(team=new_team_data, creator=current_user, db=db)
+        create_team_with_new_code(team_create_form.name, current_user, db)
         return responses.RedirectResponse("/", status_code=status.HTTP_302_FOUND)
     except PydanticCustomError as e:
         errors.append(e.message())
@@ -444,12 +450,7 @@ async def team_view(
         return {"error": "Group not found"}
 
     # Get available years
-    team_games = db.query(Game).filter(Game.team_id == team_id).all()
-    all_years = set()
-    for g in team_games:
-        if g.date:
-            all_years.add(int(str(g.date)[:4]))
-    available_years = sorted(list(all_years), reverse=True)
+    available_years = get_team_game_years(team_id, db)
 
     target_year = None
     if year and year != "all":
@@ -516,6 +517,8 @@ async def team_view(
             "is_admin": is_admin,
             "team": team,
             "join_requests": join_requests,
+            "default_grace_days": settings.TIME_DECAY_GRACE_DAYS,
+            "default_decay_rate": settings.TIME_DECAY_RATE,
             "players_info": players_info,
             "sort_by": sort,
             "order": order,
@@ -531,18 +534,88 @@ async def player_stats(
     request: Request,
     team_id: int,
     player_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_active_user),
     year: str = "all",
     sort: str = "date",
     order: str = "desc",
 ):
-    context = await _get_player_stats_context(
-        request, team_id, player_id, db, current_user, year, sort, order
+    """
+    Summary only; the history table and the chart are loaded from
+    player_games_rows and player_balance_chart once the page is shown.
+    """
+    access = _player_page_access(team_id, player_id, db, current_user)
+    if isinstance(access, RedirectResponse):
+        return access
+    team, player, is_admin, player_role = access
+
+    return templates.TemplateResponse(
+        "team/player_stats.html",
+        {
+            "request": request,
+            "team": team,
+            "player": player,
+            **get_player_summary(team_id, player_id, db, year),
+            "available_years": [str(y) for y in get_team_game_years(team.id, db)],
+            "selected_year": year if year else "all",
+            "sort_by": sort,
+            "order": order,
+            "is_admin": is_admin,
+            "player_role": player_role,
+            "current_user": current_user,
+        },
     )
-    if isinstance(context, RedirectResponse):
-        return context
-    return templates.TemplateResponse("team/player_stats.html", context)
+
+
+@router.get("/{team_id}/player/{player_id}/games", name="player_games_rows")
+async def player_games_rows(
+    request: Request,
+    team_id: int,
+    player_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_active_user),
+    year: str = "all",
+    sort: str = "date",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+):
+    """One page of the player's game history, for the player page table."""
+    access = _player_page_access(team_id, player_id, db, current_user)
+    if isinstance(access, RedirectResponse):
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    page = get_player_results_page(
+        team_id, player_id, db, year, sort, order, cursor
+    )
+    return templates.TemplateResponse(
+        "team/partials/player_games_rows.html",
+        {
+            "request": request,
+            "team_id": team_id,
+            "player_id": player_id,
+            "results": page.items,
+            "first_page": cursor is None,
+            "next_cursor": page.next_cursor,
+            "selected_year": year,
+            "sort_by": sort,
+            "order": order,
+        },
+    )
+
+
+@router.get("/{team_id}/player/{player_id}/chart", name="player_balance_chart")
+async def player_balance_chart(
+    team_id: int,
+    player_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_active_user),
+    year: str = "all",
+):
+    """Cumulative balance points for the player page chart."""
+    access = _player_page_access(team_id, player_id, db, current_user)
+    if isinstance(access, RedirectResponse):
+        raise HTTPException(status_code=404, detail="Player not found")
+    return get_player_balance_points(team_id, player_id, db, year)
 
 
 @router.get("/{team_id}/player/{player_id}/advanced")
@@ -550,7 +623,7 @@ async def player_stats_advanced(
     request: Request,
     team_id: int,
     player_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_active_user),
     year: str = "all",
     sort: str = "date",
@@ -568,7 +641,7 @@ async def player_stats_advanced(
 async def team_stats(
     request: Request,
     team_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_active_user),
     year: str = "all",
 ):
@@ -584,12 +657,7 @@ async def team_stats(
         return RedirectResponse(f"/dashboard")
 
     # Available years for the filter
-    team_games = db.query(Game).filter(Game.team_id == team_id).all()
-    all_years = set()
-    for g in team_games:
-        if g.date:
-            all_years.add(int(str(g.date)[:4]))
-    available_years = sorted(list(all_years), reverse=True)
+    available_years = get_team_game_years(team_id, db)
 
     stats = _calculate_team_stats(team, year, db)
 
@@ -605,65 +673,11 @@ async def team_stats(
     )
 
 
-async def _get_player_stats_context(
-    request: Request,
-    team_id: int,
-    player_id: int,
-    db: Session,
-    current_user: User,
-    year: str = "all",
-    sort: str = "date",
-    order: str = "desc",
-):
-    from backend.db.models.buy_in import BuyIn
-    from backend.db.models.add_on import AddOn
-    from backend.db.models.cash_out import CashOut
-    from sqlalchemy import func
-    from collections import defaultdict
-    import math
-    from datetime import datetime, timedelta
-    
-    def get_time_weight(game_date, current_date=None):
-        """
-        Calculate time-based weight for a game based on how long ago it was played.
-        
-        Goals:
-        - Games from last 6 months: weight ≈ 0.95-1.0 (nearly full weight)
-        - Games from 1-2 years ago: weight ≈ 0.4-0.6
-        - Games from 3+ years ago: weight ≈ 0.2 (5x less important than recent)
-        
-        Uses exponential decay with a grace period for recent games.
-        """
-        if current_date is None:
-            current_date = datetime.now().date()
-        
-        # Handle string dates (convert from 'YYYY-MM-DD' format)
-        if isinstance(game_date, str):
-            game_date = datetime.strptime(game_date, '%Y-%m-%d').date()
-        # Handle datetime objects
-        elif isinstance(game_date, datetime):
-            game_date = game_date.date()
-        
-        # Handle current_date conversion
-        if isinstance(current_date, str):
-            current_date = datetime.strptime(current_date, '%Y-%m-%d').date()
-        elif isinstance(current_date, datetime):
-            current_date = current_date.date()
-            
-        days_ago = (current_date - game_date).days
-        
-        # Parameters tuned to meet requirements
-        recent_threshold_days = 180  # 6 months - minimal decay within this period
-        decay_rate = 0.0018  # Controls decay rate after threshold (tuned for ~5x difference at 3 years)
-        
-        if days_ago <= recent_threshold_days:
-            # Recent games: minimal decay (95-100% weight)
-            return 1.0 - (days_ago / recent_threshold_days) * 0.05
-        else:
-            # Older games: exponential decay
-            excess_days = days_ago - recent_threshold_days
-            return 0.95 * math.exp(-decay_rate * excess_days)
-
+def _player_page_access(team_id: int, player_id: int, db: Session, current_user: User):
+    """
+    (team, player, is_admin, player_role) for the player pages, or a redirect
+    when the team or player doesn't exist or the user isn't a member.
+    """
     team = db.query(Team).filter(Team.id == team_id).first()
     if not team:
         return RedirectResponse(f"/dashboard")
@@ -697,55 +711,47 @@ async def _get_player_stats_context(
     player = db.query(User).filter(User.id == player_id).first()
     if not player:
         return RedirectResponse(f"/team/{team_id}")
+    return team, player, is_admin, player_role
+
+
+async def _get_player_stats_context(
+    request: Request,
+    team_id: int,
+    player_id: int,
+    db: Session,
+    current_user: User,
+    year: str = "all",
+    sort: str = "date",
+    order: str = "desc",
+):
+    from collections import defaultdict
+    import math
+    from backend.core.time_weighting import get_team_decay_params, time_weighted_stats
+
+    access = _player_page_access(team_id, player_id, db, current_user)
+    if isinstance(access, RedirectResponse):
+        return access
+    team, player, is_admin, player_role = access
 
-    # Build filters
-    filters = [Game.team_id == team.id]
+    # Build filters; only finished games have results
+    filters = [Game.team_id == team.id, Game.running == False]
     target_year = None
     if year and year != "all":
         target_year = year
-        filters.append(Game.date.like(f"{target_year}%"))
+        filters.append(game_year_filter(target_year))
 
     # Fetch all games for this team (filtered by year)
     q_games = db.query(Game).filter(*filters).order_by(Game.date.desc())
     all_team_games = q_games.all()
     team_total_games = len(all_team_games)
     
-    team_game_ids = [g.id for g in all_team_games]
-    
     # Determine available years for filter
     # To get available years we need ALL games for the team, unqualified by year filter
-    all_dates = db.query(Game.date).filter(Game.team_id == team.id).all()
-    available_years = sorted(
-        list(set([str(d[0])[:4] for d in all_dates if d[0]])), reverse=True
-    )
+    available_years = [str(y) for y in get_team_game_years(team.id, db)]
 
-    # Calculate stats for the specific player
-    # 1. Get games where player participated
-    # Participation is defined by having a BuyIn or AddOn or CashOut? Or just being in the game?
-    # Usually we use BuyIn as participation marker.
-    
-    # We need to calculate balance for each game for this player
-    # Balance = CashOut - (BuyIn + AddOn)
-    
-    # Optimization: Fetch all transactions for this player in these games
-    p_buyins = db.query(BuyIn).filter(BuyIn.user_id == player_id, BuyIn.game_id.in_(team_game_ids)).all()
-    p_addons = db.query(AddOn).filter(AddOn.user_id == player_id, AddOn.game_id.in_(team_game_ids), AddOn.status == PlayerRequestStatus.APPROVED).all()
-    p_cashouts = db.query(CashOut).filter(CashOut.user_id == player_id, CashOut.game_id.in_(team_game_ids)).all()
-
-    game_stats = defaultdict(lambda: {"buyin": 0.0, "addon": 0.0, "cashout": 0.0})
-    played_game_ids = set()
-
-    for b in p_buyins:
-        game_stats[b.game_id]["buyin"] += b.amount
-        played_game_ids.add(b.game_id)
-    for a in p_addons:
-        game_stats[a.game_id]["addon"] += a.amount
-        played_game_ids.add(a.game_id)
-    for c in p_cashouts:
-        game_stats[c.game_id]["cashout"] += c.amount
-        # Cashout implies participation usually, but let's stick to buyin/addon as entry.
-        # If someone has cashout but no buyin, it's weird, but they played.
-        played_game_ids.add(c.game_id)
+    # Per-player results of the finished games, written when each game ended
+    team_results = get_team_results(team.id, db, year)
+    player_results = [r for r in team_results if r.user_id == player_id]
 
     games_history = []
     total_investment = 0.0
@@ -755,39 +761,16 @@ async def _get_player_stats_context(
     losses_count = 0
     best_result = None
     worst_result = None
-    
-    # Calculate Total Pot per game for display
-    # This is expensive if we do it for every game individually.
-    # Let's fetch total pot for the team_games
-    # Total Pot = Sum(BuyIns) + Sum(AddOns) for that game
-    game_pots = defaultdict(float)
-    all_bi = db.query(BuyIn.game_id, BuyIn.amount).filter(BuyIn.game_id.in_(team_game_ids)).all()
-    all_ao = db.query(AddOn.game_id, AddOn.amount).filter(AddOn.game_id.in_(team_game_ids), AddOn.status == PlayerRequestStatus.APPROVED).all()
-    
-    for gid, amt in all_bi:
-        game_pots[gid] += amt
-    for gid, amt in all_ao:
-        game_pots[gid] += amt
-        
-    # Also need player count per game
-    game_player_counts = defaultdict(int)
-    # Count distinct users per game in BuyIn
-    # This is an approximation but fast enough. 
-    # Or cleaner: db.query(BuyIn.game_id, func.count(func.distinct(BuyIn.user_id))).group_by(BuyIn.game_id)
-    gpc_query = db.query(BuyIn.game_id, func.count(func.distinct(BuyIn.user_id))).filter(BuyIn.game_id.in_(team_game_ids)).group_by(BuyIn.game_id).all()
-    for gid, count in gpc_query:
-        game_player_counts[gid] = count
 
     # Prep games_history
     games_map = {g.id: g for g in all_team_games}
     
     monthly_balances = defaultdict(lambda: {"balance": 0.0, "count": 0})
 
-    for gid in played_game_ids:
-        s = game_stats[gid]
-        inv = s["buyin"] + s["addon"]
-        cash = s["cashout"]
-        bal = cash - inv
+    for r in player_results:
+        gid = r.game_id
+        inv = r.investment
+        bal = r.net
         
         total_investment += inv
         total_balance += bal
@@ -807,15 +790,15 @@ async def _get_player_stats_context(
         games_history.append({
             "game": games_map[gid],
             "balance": bal,
-            "total_pot": game_pots[gid],
-            "players_count": game_player_counts[gid]
+            "total_pot": r.pot,
+            "players_count": r.player_count
         })
 
         # Monthly Aggregation
         if games_map[gid].start_time:
              m_key = games_map[gid].start_time.strftime('%Y-%m')
         else:
-             m_key = str(games_map[gid].date)[:7]
+             m_key = games_map[gid].date.strftime('%Y-%m')
         monthly_balances[m_key]["balance"] += bal
         monthly_balances[m_key]["count"] += 1
 
@@ -826,32 +809,23 @@ async def _get_player_stats_context(
     # --- Time-weighted statistics for Bayesian analysis ---
     # Calculate weighted average balance and weighted variance
     # Recent games have more influence on predictions
-    total_weight = 0.0
-    weighted_balance_sum = 0.0
-    
-    for g in games_history:
-        game = g["game"]
-        game_date_val = game.start_time.date() if game.start_time else game.date
-        weight = get_time_weight(game_date_val)
-        g["weight"] = weight  # Store for later use
-        
-        total_weight += weight
-        weighted_balance_sum += weight * g["balance"]
-    
+    grace_days, decay_rate = get_team_decay_params(team)
+    weighted = time_weighted_stats(
+        [g["balance"] for g in games_history],
+        [g["game"].start_time or g["game"].date for g in games_history],
+        grace_days=grace_days,
+        decay_rate=decay_rate,
+    )
+    for g, weight in zip(games_history, weighted.weights):
+        g["weight"] = float(weight)  # Store for later use
+
     # Weighted average balance (used in Bayesian likelihood)
-    weighted_avg_balance = weighted_balance_sum / total_weight if total_weight > 0 else avg_balance
-    
-    # Weighted variance and standard deviation
-    weighted_variance_sum = 0.0
-    for g in games_history:
-        weighted_variance_sum += g["weight"] * ((g["balance"] - weighted_avg_balance) ** 2)
-    
-    weighted_variance = weighted_variance_sum / total_weight if total_weight > 0 else 0
-    weighted_std_dev = math.sqrt(weighted_variance)
-    
+    weighted_avg_balance = weighted.mean if weighted.effective_n > 0 else avg_balance
+    weighted_std_dev = weighted.std_dev
+
     # Effective sample size (accounts for time-based weighting)
     # This is used as 'n' in the Bayesian calculation
-    effective_n_games = total_weight
+    effective_n_games = weighted.effective_n
     
     # Calculate durations for winrate
     total_hours = 0
@@ -879,32 +853,13 @@ async def _get_player_stats_context(
     volatility_label = "N/A"
     
     # --- Team Context & Rankings ---
-    # We need bulk stats for ALL players in the team (filtered by year) to calculate rankings
-    # This might be heavy, but necessary for "Advanced Stats".
-    # We can reuse `get_player_games_stats_bulk` which was likely used before?
-    # Yes, previous code used `get_player_games_stats_bulk`.
-    # To save time writing all that aggregation logic again, I should use the helper if available.
-    # But `get_player_games_stats_bulk` calculates per-game stats for a player.
-    # We need per-player stats for the team.
-    
-    # Let's try to infer the previous implementation of bulk stats.
-    # It queried BuyIn, AddOn, CashOut for the team+year.
-    
-    bis = db.query(BuyIn.user_id, BuyIn.game_id, BuyIn.amount).join(Game).filter(*filters).all()
-    aos = db.query(AddOn.user_id, AddOn.game_id, AddOn.amount).join(Game).filter(*filters, AddOn.status == PlayerRequestStatus.APPROVED).all()
-    cos = db.query(CashOut.user_id, CashOut.game_id, CashOut.amount).join(Game).filter(*filters).all()
-    
+    # Per-player stats for the whole team (filtered by year) to calculate rankings
     p_net = defaultdict(lambda: defaultdict(float))
     p_inv = defaultdict(lambda: defaultdict(float))
-    
-    for u, g, a in bis:
-        p_net[u][g] -= a
-        p_inv[u][g] += a
-    for u, g, a in aos:
-        p_net[u][g] -= a
-        p_inv[u][g] += a
-    for u, g, a in cos:
-        p_net[u][g] += a
+
+    for r in team_results:
+        p_net[r.user_id][r.game_id] = r.net
+        p_inv[r.user_id][r.game_id] = r.investment
         
     # Helpers for Win Share etc
     game_pos_sum = defaultdict(float)
@@ -1218,45 +1173,20 @@ async def _get_player_stats_context(
         "bayesian": adv_stats_bayesian,
     }
 
-    # Sorting for Display
-    reverse_order = order == "desc"
-    if sort == "date":
-        games_history.sort(key=lambda x: (x["game"].date, x["game"].start_time or datetime.min.time()), reverse=reverse_order)
-    elif sort == "balance":
-        games_history.sort(key=lambda x: x["balance"], reverse=reverse_order)
-    elif sort == "pot":
-        games_history.sort(key=lambda x: x["total_pot"], reverse=reverse_order)
-    else:
-        games_history.sort(key=lambda x: (x["game"].date), reverse=reverse_order)
-
-    # Chart Data (Cumulative Balance)
-    chart_data_src = sorted(games_history, key=lambda x: (x["game"].date, x["game"].start_time or datetime.min.time()))
-    chart_points = []
-    running_bal = 0.0
-    for g in chart_data_src:
-        running_bal += g["balance"]
-        chart_points.append({
-            "date": g["game"].start_time.strftime('%Y-%m-%d') if g["game"].start_time else str(g["game"].date),
-            "balance": running_bal
-        })
-
     return {
         "request": request,
         "team": team,
         "player": player,
-        "games_history": games_history,
         "adv_stats": adv_stats,
         "games_count": games_count,
         "total_balance": total_balance,
         "winrate": winrate,
         "available_years": available_years,
         "selected_year": year if year else "all",
-        "chart_points": chart_points,
         "sort_by": sort,
         "order": order,
         "is_admin": is_admin,
         "player_role": player_role,
-        "visible_count": len(games_history),
         "current_user": current_user,
     }
 
@@ -1331,10 +1261,16 @@ async def remove_player(
 async def delete_team_route(
     request: Request,
     team_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user_from_token),
 ):
-    from backend.db.repository.team import delete_team
+    from backend.db.repository.team import (
+        count_team_games,
+        delete_team,
+        delete_team_in_batches,
+        hide_team,
+    )
 
     team = get_team_by_id(team_id, db)
     if not team:
@@ -1343,11 +1279,47 @@ async def delete_team_route(
     if not is_user_admin(user.id, team.id, db):
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    delete_team(team, db)
+    if count_team_games(team.id, db) > settings.TEAM_BACKGROUND_DELETE_MIN_GAMES:
+        # Gone for its members now, deleted batch by batch after the response
+        # (or by backend/db/tools/delete_hidden_teams.py if that fails)
+        hide_team(team, db)
+        background_tasks.add_task(delete_team_in_batches, team.id, db.get_bind())
+    else:
+        delete_team(team, db)
 
     return RedirectResponse("/", status_code=303)
 
 
+@router.post("/{team_id}/time_decay", name="team.update_time_decay")
+async def update_time_decay_route(
+    team_id: int,
+    grace_days: str = Form(""),
+    decay_rate: str = Form(""),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user_from_token),
+):
+    from backend.db.repository.team import update_team_time_decay
+
+    team = get_team_by_id(team_id, db)
+    if not team:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    if not is_user_admin(user.id, team.id, db):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    try:
+        update_team_time_decay(
+            team,
+            int(grace_days) if grace_days.strip() else None,
+            float(decay_rate) if decay_rate.strip() else None,
+            db,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return RedirectResponse(f"/team/{team_id}", status_code=303)
+
+
 @router.post("/{team_id}/import")
 async def import_legacy_games(
     request: Request,
@@ -1398,9 +1370,7 @@ async def import_legacy_games(
                 return team_users_map[nick_name]
 
             # Create Guest User
-            normalized_nick = unicodedata.normalize('NFD', nick_name.lower().replace('ł', 'l').replace('Ł', 'L'))
-            ascii_nick = "".join(c for c in normalized_nick if unicodedata.category(c) != 'Mn').replace(' ', '_')
-            new_email = f"{ascii_nick}_{team.search_code.lower()}@over-bet.com"
+            new_email = guest_email(nick_name, team)
 
             player_user = User(
                 email=new_email,
@@ -1512,9 +1482,14 @@ async def import_legacy_games(
                     )
                     db.add(co)
 
+            write_game_results([new_game], db)
             db.commit()
             imported_count += 1
 
+        if imported_count:
+            bump_team_games_version(team.id, db)
+            db.commit()
+
         msg = f"Imported {imported_count} games. Skipped {skipped_count} duplicates."
         return RedirectResponse(f"/team/{team_id}?msg={msg}", status_code=303)
 
@@ -1545,108 +1520,168 @@ async def team_advanced_stats(
 
 
 
+def _team_games_page(team_id, user, db, sort, order, cursor):
+    """Team and one page of its finished games, or None without access."""
+    from backend.db.repository.game import get_past_games_page
+
+    team = get_team_by_id(team_id, db)
+    if not team:
+        return None, None
+
+    # Check permissions (must be member or superuser)
+    if (
+        user.id not in [m.id for m in team.users]
+        and not user.is_superuser
+    ):
+        return None, None
+
+    # All finished games of the team, with the viewing user's balance
+    page = get_past_games_page([team_id], user.id, db, sort, order, cursor)
+    return team, page
+
+
 @router.get("/{team_id}/games", name="team_games_history")
 async def team_games_history(
     request: Request,
     team_id: int,
-    limit: int = 10000,
     sort: str = "date",
     order: str = "desc",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_active_user),
+):
+    team, page = _team_games_page(team_id, user, db, sort, order, None)
+    if team is None:
+        return RedirectResponse(url="/")
+
+    games_count = (
+        db.query(func.count(Game.id))
+        .filter(Game.team_id == team_id, Game.running == False)
+        .scalar()
+    )
+
+    return templates.TemplateResponse(
+        "team/team_games.html",
+        {
+            "request": request,
+            "team": team,
+            "games_data": page.items,
+            "next_cursor": page.next_cursor,
+            "rows_url": f"/team/{team_id}/games/rows",
+            "games_count": games_count,
+            "sort_by": sort,
+            "order": order,
+        },
+    )
+
+
+@router.get("/{team_id}/games/rows", name="team_games_rows")
+async def team_games_rows(
+    request: Request,
+    team_id: int,
+    sort: str = "date",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     user: User = Depends(get_active_user),
 ):
-    from backend.db.repository.game import (
-        get_user_team_games,
-        get_user_past_games_stats_bulk,
+    """Next page of team_games_history, appended by the "load more" row."""
+    team, page = _team_games_page(team_id, user, db, sort, order, cursor)
+    if team is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    return templates.TemplateResponse(
+        "components/past_games_rows.html",
+        {
+            "request": request,
+            "games_data": page.items,
+            "next_cursor": page.next_cursor,
+            "rows_url": f"/team/{team_id}/games/rows",
+            "sort_by": sort,
+            "order": order,
+            "return_url": True,
+        },
     )
 
+
+def _month_range(month: Optional[str]):
+    """First day of a "YYYY-MM" month and of the next one; this month if unset."""
+    try:
+        start = datetime.strptime(month, "%Y-%m").date() if month else None
+    except ValueError:
+        start = None
+    if start is None:
+        start = date.today().replace(day=1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+@router.get("/{team_id}/transfers", name="team_transfers")
+async def team_transfers(
+    request: Request,
+    team_id: int,
+    month: Optional[str] = None,
+    game_id: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_active_user),
+):
+    """
+    Who pays whom to settle several finished games at once: the listed
+    game_ids, or every game of a month, netted per player.
+    """
     team = get_team_by_id(team_id, db)
     if not team:
         return RedirectResponse(url="/")
-
-    # Check permissions (must be member or superuser)
-    if (
-        user.id not in [m.id for m in team.users]
-        and not user.is_superuser
-    ):
+    if user.id not in [m.id for m in team.users] and not user.is_superuser:
         return RedirectResponse(url="/")
 
-    # Get team games (we reuse get_user_team_games but need ALL games for the team)
-    # Actually get_user_team_games gets games user played in.
-    # We want ALL games for the team, regardless of participation?
-    # Requirement: "show the previous games of that team"
-    # Usually "past games" means games relevant to me, but "team games" implies all.
-    # Let's show all finished games for the team.
-    
-    query = db.query(Game).filter(Game.team_id == team_id, Game.running == False).order_by(Game.date.desc())
-    all_team_games = query.all()
-    total_count = len(all_team_games)
-    
-    # We need stats. user_past_games_stats_bulk calculates "my_balance".
-    # For a general team view, "my_balance" is still relevant for the viewing user.
-    # So we can reuse that bulk calculator.
-    
-    game_ids = [g.id for g in all_team_games]
-    bulk_stats = get_user_past_games_stats_bulk(user.id, game_ids, db)
-
-    games_data = []
-    for game in all_team_games:
-        s = bulk_stats.get(
-            game.id, {"total_pot": 0.0, "my_balance": 0.0, "players_count": 0}
-        )
-        games_data.append(
-            {
-                "id": game.id,
-                "date": game.date,
-                "start_time": game.start_time,
-                "players_count": s["players_count"],
-                "total_pot": s["total_pot"],
-                "my_balance": s["my_balance"],
-            }
-        )
-
-    # Sorting
-    reverse = order == "desc"
-    if sort == "date":
-        games_data.sort(
-            key=lambda x: (x["date"], x["start_time"] or datetime.min.time()),
-            reverse=reverse,
+    if game_id:
+        start = end = None
+        transfers = get_settlement_transfers(db, team_id=team_id, game_ids=game_id)
+        games_count = (
+            db.query(func.count(Game.id))
+            .filter(
+                Game.team_id == team_id,
+                Game.id.in_(game_id),
+                Game.running == False,
+            )
+            .scalar()
         )
-    elif sort == "players":
-        games_data.sort(key=lambda x: x["players_count"], reverse=reverse)
-    elif sort == "pot":
-        games_data.sort(key=lambda x: x["total_pot"], reverse=reverse)
-    elif sort == "balance":
-        games_data.sort(key=lambda x: x["my_balance"], reverse=reverse)
     else:
-        games_data.sort(
-            key=lambda x: (x["date"], x["start_time"] or datetime.min.time()),
-            reverse=True,
+        start, end = _month_range(month)
+        transfers = get_settlement_transfers(db, team_id=team_id, start=start, end=end)
+        games_count = (
+            db.query(func.count(Game.id))
+            .filter(
+                Game.team_id == team_id,
+                Game.running == False,
+                Game.date >= start,
+                Game.date < end,
+            )
+            .scalar()
         )
 
-    # Slicing
-    visible_games = games_data[:limit]
-
     return templates.TemplateResponse(
-        "team/team_games.html",
+        "team/transfers.html",
         {
             "request": request,
             "team": team,
-            "games_data": visible_games,
-            "games_count": total_count,
-            "visible_count": len(visible_games),
-            "limit": limit,
-            "sort_by": sort,
-            "order": order,
+            "month": start.strftime("%Y-%m") if start else None,
+            "game_ids": game_id or [],
+            "games_count": games_count,
+            "transfers": transfers,
+            "empty_message": (
+                "Everybody is even." if games_count else "No finished games."
+            ),
         },
     )
 
 
 def _calculate_team_stats(team, year, db):
-    # Filter games
-    query = db.query(Game).filter(Game.team_id == team.id)
+    # Filter games; only finished ones have results
+    query = db.query(Game).filter(Game.team_id == team.id, Game.running == False)
     if year and year != "all":
-        query = query.filter(Game.date.like(f"{year}%"))
+        query = query.filter(game_year_filter(year))
     games = query.all()
 
 
@@ -1669,24 +1704,15 @@ def _calculate_team_stats(team, year, db):
             }
 
     # Frequency
-    sorted_dates = sorted([g.date for g in games])  # Strings YYYY-MM-DD
+    sorted_dates = sorted([g.date for g in games])
     frequency = "N/A"
     if games_count > 1:
-        try:
-            d1 = str(sorted_dates[0])[:10]
-            d2 = str(sorted_dates[-1])[:10]
-            from datetime import datetime
-
-            first = datetime.strptime(d1, "%Y-%m-%d")
-            last = datetime.strptime(d2, "%Y-%m-%d")
-            days = (last - first).days
-            if days > 0:
-                val = days / (games_count - 1)
-                frequency = f"{val:.1f}"
-            else:
-                frequency = "0.0"  # Multiple games same day
-        except:
-            pass
+        days = (sorted_dates[-1] - sorted_dates[0]).days
+        if days > 0:
+            val = days / (games_count - 1)
+            frequency = f"{val:.1f}"
+        else:
+            frequency = "0.0"  # Multiple games same day
 
     # Players & Financials
     total_pot = 0
@@ -1699,10 +1725,6 @@ def _calculate_team_stats(team, year, db):
 
     game_ids = [g.id for g in games]
 
-    from backend.db.models.buy_in import BuyIn
-    from backend.db.models.add_on import AddOn
-    from backend.db.models.cash_out import CashOut
-
     avg_players = 0
     avg_pot = 0
     avg_buyin_all = 0
@@ -1716,27 +1738,12 @@ def _calculate_team_stats(team, year, db):
     the_rocks = []
 
     if game_ids:
-        bis = db.query(BuyIn).filter(BuyIn.game_id.in_(game_ids)).all()
-        aos = (
-            db.query(AddOn)
-            .filter(
-                AddOn.game_id.in_(game_ids),
-                AddOn.status == PlayerRequestStatus.APPROVED,
-            )
-            .all()
-        )
-        cos = db.query(CashOut).filter(CashOut.game_id.in_(game_ids)).all()
-
-        game_data = defaultdict(
-            lambda: defaultdict(lambda: {"buyin": 0.0, "cashout": 0.0})
-        )
-
-        for b in bis:
-            game_data[b.game_id][b.user_id]["buyin"] += b.amount
-        for a in aos:
-            game_data[a.game_id][a.user_id]["buyin"] += a.amount
-        for c in cos:
-            game_data[c.game_id][c.user_id]["cashout"] += c.amount
+        game_data = defaultdict(dict)
+        for r in get_team_results(team.id, db, year):
+            game_data[r.game_id][r.user_id] = {
+                "buyin": r.investment,
+                "cashout": r.cash_out,
+            }
 
         positive_balances = []
         negative_balances = []
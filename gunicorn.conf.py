@@ -0,0 +1,19 @@
+# Loaded automatically by gunicorn from the working directory.
+# Workers write their Prometheus metrics to a shared directory so /metrics
+# reports the whole server, not just the worker that answered the scrape.
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,3 +1,4 @@
+import logging
 import time
 from pathlib import Path
 
@@ -8,10 +9,15 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from backend.apis.base import api_router
 from backend.core.config import STATIC_DIR, settings
+from backend.core.metrics import install_metrics
+from backend.core.profiling import install_profiling_middleware
 from backend.db.base import Base
+from backend.db.invalidation import start_listener
+from backend.db.query_stats import install_query_stats_middleware
 from backend.db.models.player_request_status import PlayerRequestStatusEnum
 from backend.db.models.team_role import TeamRoleEnum
-from backend.db.session import engine
+from backend.db.replica import install_read_your_writes_middleware
+from backend.db.session import ReplicaSessionLocal, engine
 from backend.webapps.base import api_router as web_app_router
 from backend.webapps.guest.route_guest import router as guest_router
 from sqlalchemy.exc import OperationalError
@@ -27,6 +33,13 @@ def configure_static(app):
     app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 
+def configure_logging():
+    logging.basicConfig(
+        level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s %(message)s"
+    )
+    logging.getLogger("backend").setLevel(logging.INFO)
+
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
 
@@ -51,11 +64,20 @@ def wait_for_db(engine, retries=10, delay=2):
 def start_application():
     app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION)
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
+    configure_logging()
+    install_query_stats_middleware(app)
+    install_metrics(app, engine)
+    install_profiling_middleware(app)
+    if ReplicaSessionLocal is not None:
+        install_read_your_writes_middleware(app)
     include_router(app)
     configure_static(app)
     wait_for_db(engine)
     create_enums(engine)
     create_tables()
+    # Each worker imports this module itself (no preload), so this runs in
+    # every worker
+    start_listener(engine)
 
     return app
 